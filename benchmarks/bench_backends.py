@@ -0,0 +1,75 @@
+"""Compare the pandas and polars cleaning backends on a full rebuild.
+
+Run with ``python benchmarks/bench_backends.py``.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from degiro_wrapper.core import preprocess_polars
+from degiro_wrapper.core.preprocess import (
+    clean_cashflows,
+    clean_positions,
+    clean_transactions,
+)
+from degiro_wrapper.core.readers import read_cashflows_raw, read_transactions_raw
+
+from synthetic import write_cashflows, write_positions, write_transactions
+
+
+def measure(func, *args, repeat=3, **kwargs):
+    """Return best wall time (s)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        path_positions = tmp / "positions"
+        path_positions.mkdir()
+        write_positions(path_positions)
+        write_cashflows(tmp / "cashflows.csv")
+        write_transactions(tmp / "transactions.csv")
+
+        cases = [
+            (
+                "positions",
+                lambda: clean_positions(path_positions),
+                lambda: preprocess_polars.clean_positions(path_positions),
+            ),
+            (
+                "cashflows",
+                lambda: clean_cashflows(read_cashflows_raw(tmp / "cashflows.csv")),
+                lambda: preprocess_polars.clean_cashflows(tmp / "cashflows.csv"),
+            ),
+            (
+                "transactions",
+                lambda: clean_transactions(
+                    read_transactions_raw(tmp / "transactions.csv")
+                ),
+                lambda: preprocess_polars.clean_transactions(tmp / "transactions.csv"),
+            ),
+        ]
+
+        print(f"{'report':<14}{'pandas (ms)':>14}{'polars (ms)':>14}{'speedup':>10}")
+        for name, func_pandas, func_polars in cases:
+            elapsed_pandas = measure(func_pandas)
+            try:
+                elapsed_polars = measure(func_polars)
+            except ImportError:
+                elapsed_polars = float("nan")
+            print(
+                f"{name:<14}{elapsed_pandas * 1e3:>14.2f}{elapsed_polars * 1e3:>14.2f}"
+                f"{elapsed_pandas / elapsed_polars:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
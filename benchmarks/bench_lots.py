@@ -0,0 +1,42 @@
+"""Time the lot-matching engine on a synthetic transactions history.
+
+Run with ``python benchmarks/bench_lots.py``.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from degiro_wrapper.core.preprocess import clean_transactions
+from degiro_wrapper.core.readers import read_transactions_raw
+from degiro_wrapper.reporting.lots import METHODS, match_lots
+
+from synthetic import write_transactions
+
+
+def measure(func, *args, repeat=3, **kwargs):
+    """Return best wall time (s)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        file = Path(tmp) / "transactions.csv"
+        write_transactions(file)
+        transactions = clean_transactions(read_transactions_raw(file))
+
+    print(f"{len(transactions)} trades")
+    print(f"{'method':<10}{'time (ms)':>12}")
+    for method in METHODS:
+        elapsed = measure(match_lots, transactions, method=method)
+        print(f"{method:<10}{elapsed * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare default pandas.read_csv against the schema readers.
+
+Run with ``python benchmarks/bench_readers.py``.
+"""
+
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+from degiro_wrapper.core.readers import (
+    read_cashflows_raw,
+    read_positions_raw,
+    read_transactions_raw,
+)
+
+from synthetic import write_cashflows, write_positions, write_transactions
+
+
+def measure(func, *args, repeat=5, **kwargs):
+    """Return best wall time (s) and peak traced memory (MB)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak / 2**20
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        write_positions(tmp, n_days=1, n_products=2_000)
+        write_cashflows(tmp / "cashflows.csv")
+        write_transactions(tmp / "transactions.csv")
+
+        cases = [
+            ("positions", next(tmp.glob("pos*.csv")), read_positions_raw),
+            ("cashflows", tmp / "cashflows.csv", read_cashflows_raw),
+            ("transactions", tmp / "transactions.csv", read_transactions_raw),
+        ]
+
+        print(f"{'report':<14}{'reader':<18}{'time (ms)':>12}{'peak (MB)':>12}")
+        for name, file, reader in cases:
+            runs = [
+                ("read_csv", pd.read_csv, {}),
+                ("schema[c]", reader, {"engine": "c"}),
+                ("schema[pyarrow]", reader, {"engine": "pyarrow"}),
+            ]
+            for label, func, kwargs in runs:
+                try:
+                    elapsed, peak = measure(func, file, **kwargs)
+                except ImportError:
+                    continue
+                print(f"{name:<14}{label:<18}{elapsed * 1e3:>12.2f}{peak:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
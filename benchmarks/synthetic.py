@@ -0,0 +1,165 @@
+"""Synthetic raw Degiro reports (ES locale) for benchmarking."""
+
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import FILENAME_POSITIONS
+
+PRODUCTS = [
+    ("AIRBUS GROUP", "NL0000235190"),
+    ("ISHARES MSCI EUR A", "IE00B4K48X80"),
+    ("ISHARES MSCI WOR A", "IE00B4L5Y983"),
+    ("SP 500 EH", "IE00B3ZW0K18"),
+    ("XTRACKERS II EUROZONE GOVERNMEN...", "LU0290355717"),
+]
+
+DESCRIPTIONS = [
+    "Compra {shares} {product}@{price} EUR ({isin})",
+    "Venta {shares} {product}@{price} EUR ({isin})",
+    "Dividendo",
+    "Retención del dividendo",
+    "Ingreso",
+    "Retirada",
+    "Ingreso Cambio de Divisa",
+    "Retirada Cambio de Divisa",
+    "Costes de transacción",
+    "Comisión de conectividad con el mercado 2020",
+    "Interés",
+]
+
+HEADER_CASHFLOWS = [
+    "Fecha",
+    "Hora",
+    "Fecha valor",
+    "Producto",
+    "ISIN",
+    "Descripción",
+    "Tipo",
+    "Variación",
+    "",
+    "Saldo",
+    "",
+    "ID Orden",
+]
+
+HEADER_TRANSACTIONS = [
+    "Fecha",
+    "Hora",
+    "Producto",
+    "ISIN",
+    "Bolsa de",
+    "Centro de ejecución",
+    "Número",
+    "Precio",
+    "",
+    "Valor local",
+    "",
+    "Valor",
+    "",
+    "Tipo de cambio",
+    "Costes de transacción",
+    "",
+    "Total",
+    "",
+    "ID Orden",
+]
+
+
+def _comma(values):
+    return [f"{x:.2f}".replace(".", ",") for x in values]
+
+
+def write_positions(path, n_days=250, n_products=50, seed=0):
+    """Write one raw positions file per business day."""
+    rng = np.random.default_rng(seed)
+    calendar = pd.date_range("2020-01-01", periods=n_days, freq="B")
+    names = [f"PRODUCT {i}" for i in range(n_products)]
+    isins = [f"IE{i:010d}" for i in range(n_products)]
+
+    for date in calendar:
+        shares = rng.integers(1, 100, n_products).astype(float)
+        price = rng.uniform(10, 500, n_products)
+        value = shares * price
+        frame = pd.DataFrame(
+            {
+                "Producto": ["CASH & CASH FUND & FTX CASH (EUR)"] + names,
+                "Symbol/ISIN": [np.nan] + isins,
+                "Cantidad": [np.nan] + list(shares),
+                "Precio de": [np.nan] + _comma(price),
+                "Valor local": ["EUR 0.17"] + [f"EUR {x:.2f}" for x in value],
+                "Valor en EUR": ["0,17"] + _comma(value),
+            }
+        )
+        file = path / (date.strftime(FILENAME_POSITIONS) + ".csv")
+        frame.to_csv(file, index=False)
+
+
+def write_cashflows(file, n_rows=100_000, seed=0):
+    """Write a raw cash account file."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2015-01-01", periods=n_rows // 20 + 1, freq="B")
+    dates = dates[rng.integers(0, len(dates), n_rows)].sort_values()
+    products = [PRODUCTS[i] for i in rng.integers(0, len(PRODUCTS), n_rows)]
+    templates = rng.integers(0, len(DESCRIPTIONS), n_rows)
+
+    descriptions = [
+        DESCRIPTIONS[t].format(
+            shares=rng.integers(1, 10),
+            product=product,
+            price="100,98",
+            isin=isin,
+        )
+        for t, (product, isin) in zip(templates, products)
+    ]
+    dates = dates.strftime("%d-%m-%Y")
+    rows = zip(
+        dates,
+        ["09:05"] * n_rows,
+        dates,
+        [p for p, _ in products],
+        [i for _, i in products],
+        descriptions,
+        [""] * n_rows,
+        ["EUR"] * n_rows,
+        _comma(rng.normal(0, 500, n_rows)),
+        ["EUR"] * n_rows,
+        _comma(rng.uniform(0, 1e4, n_rows)),
+        [""] * n_rows,
+    )
+    frame = pd.DataFrame(rows, columns=range(len(HEADER_CASHFLOWS)))
+    frame.to_csv(file, index=False, header=HEADER_CASHFLOWS)
+
+
+def write_transactions(file, n_rows=20_000, seed=0):
+    """Write a raw transactions file."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2015-01-01", periods=n_rows // 5 + 1, freq="B")
+    dates = dates[rng.integers(0, len(dates), n_rows)].sort_values()
+    products = [PRODUCTS[i] for i in rng.integers(0, len(PRODUCTS), n_rows)]
+
+    shares = rng.integers(1, 20, n_rows) * rng.choice([-1, 1], n_rows)
+    price = rng.uniform(10, 500, n_rows).round(2)
+    value = (-shares * price).round(2)
+    costs = np.full(n_rows, -2.0)
+    rows = zip(
+        dates.strftime("%d-%m-%Y"),
+        ["09:05"] * n_rows,
+        [p for p, _ in products],
+        [i for _, i in products],
+        ["EAM"] * n_rows,
+        ["XAMS"] * n_rows,
+        shares,
+        price,
+        ["EUR"] * n_rows,
+        value,
+        ["EUR"] * n_rows,
+        value,
+        ["EUR"] * n_rows,
+        [""] * n_rows,
+        costs,
+        ["EUR"] * n_rows,
+        value + costs,
+        ["EUR"] * n_rows,
+        [""] * n_rows,
+    )
+    frame = pd.DataFrame(rows, columns=range(len(HEADER_TRANSACTIONS)))
+    frame.to_csv(file, index=False, header=HEADER_TRANSACTIONS)
@@ -9,12 +9,15 @@ setup(
         "click",
         "matplotlib",
         "numpy",
-        "openpyxl",
         "pandas",
         "requests",
         "tqdm",
         # "QuantStats",
     ],
+    extras_require={
+        "pyarrow": ["pyarrow"],
+        "polars": ["polars>=1.0,<2"],
+    },
     packages=find_packages("src"),
     package_dir={"": "src"},
     entry_points={
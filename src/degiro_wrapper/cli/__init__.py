@@ -1,4 +1,6 @@
 from .analysis import describe
+from .drift import drift
 from .report import report
+from .tax import tax_report
 
-__all__ = ["describe", "report"]
+__all__ = ["describe", "drift", "report", "tax_report"]
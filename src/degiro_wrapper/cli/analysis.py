@@ -1,8 +1,8 @@
 from pathlib import Path
 
 import click
-import pandas as pd
 from degiro_wrapper.conventions import Positions
+from degiro_wrapper.core.interchange import read_db
 
 from .cli import cli
 
@@ -30,7 +30,7 @@ def describe(path_db, path_products):
     path_db = Path(path_db)
     path_products = Path(path_products)
 
-    database = pd.read_csv(path_db, index_col=0)
+    database = read_db(path_db, index_col=0, columns=[Positions.NAME, Positions.ISIN])
 
     products = database[[Positions.NAME, Positions.ISIN]]
     products = products.drop_duplicates()
@@ -3,18 +3,41 @@ from pprint import pprint
 
 import click
 import pandas as pd
+from degiro_wrapper.conventions import Positions
+from degiro_wrapper.core import preprocess_polars
 from degiro_wrapper.core.api_methods import (
     download_cashflows_raw,
     download_positions_raw,
     download_transactions_raw,
     get_login_data,
 )
+from degiro_wrapper.core.cache import ParsedFileCache
+from degiro_wrapper.core.interchange import FORMATS, SUFFIXES, read_db, write_db
+from degiro_wrapper.core.locales import CASHFLOWS, LOCALES, TRANSACTIONS, detect_locale
+from degiro_wrapper.core.panel import build_panel
 from degiro_wrapper.core.preprocess import (
+    BACKENDS,
+    PARSER_VERSION,
+    cache_keys_positions,
     clean_cashflows,
+    clean_cashflows_chunked,
     clean_positions,
     clean_transactions,
 )
+from degiro_wrapper.core.readers import (
+    ENGINES,
+    read_cashflows_raw,
+    read_header,
+    read_transactions_raw,
+)
+from degiro_wrapper.core.store import PanelStore
 from degiro_wrapper.core.utils import create_ytd_calendar
+from degiro_wrapper.core.validate import (
+    SPEC_CASHFLOWS,
+    SPEC_TRANSACTIONS,
+    validate_files,
+    validate_positions,
+)
 
 
 @click.group
@@ -22,6 +45,51 @@ def cli():
     click.echo("Welcome to the degiro-wrapper CLI!")
 
 
+def check_report(report):
+    """Stop if the validation report of raw files has errors."""
+    if report.empty:
+        return
+
+    click.echo(report.to_string(index=False))
+    n_files = report["file"].nunique()
+    raise SystemExit(f"{n_files} invalid raw files, nothing done.")
+
+
+option_validate = click.option(
+    "--validate/--no-validate",
+    "validate",
+    default=True,
+    help="Check raw files before cleaning them.",
+    show_default=True,
+)
+
+option_locale = click.option(
+    "--locale",
+    "locale",
+    type=click.Choice(list(LOCALES)),
+    default=None,
+    help="Language of the raw headers. By default it is detected.",
+)
+
+option_backend = click.option(
+    "--backend",
+    "backend",
+    type=click.Choice(BACKENDS),
+    default="pandas",
+    help="Cleaning backend, polars ignores --engine.",
+    show_default=True,
+)
+
+option_format = click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(FORMATS),
+    default="csv",
+    help="Database format, arrow files are read back without parsing.",
+    show_default=True,
+)
+
+
 @cli.command
 @click.option(
     "--start",
@@ -257,21 +325,60 @@ def check_dates(path):
     default=None,
     help="Path to dump database. By default the parent of --path is used.",
 )
-def create_db_positions(path, path_to):
+@click.option(
+    "--engine",
+    "engine",
+    type=click.Choice(ENGINES),
+    default="c",
+    help="CSV parser engine, pyarrow is multithreaded.",
+    show_default=True,
+)
+@click.option(
+    "--cache",
+    "path_cache",
+    type=str,
+    required=False,
+    default=None,
+    help="Path to cache cleaned files between runs.",
+)
+@option_validate
+@option_locale
+@option_backend
+@option_format
+def create_db_positions(
+    path, path_to, engine, path_cache, validate, locale, backend, fmt
+):
     """Create positions database from raw positions folder."""
 
     path = Path(path)
 
+    cache = None
+    keys = {}
+    if path_cache is not None:
+        if backend != "pandas":
+            raise click.UsageError("--cache needs the 'pandas' backend.")
+        cache = ParsedFileCache(path_cache, version=PARSER_VERSION)
+        keys = cache_keys_positions(path, cache, engine=engine, locale=locale)
+
     if path_to is None:
         path_to = path.parent
-    path_to = Path(path_to) / "db_positions.csv"
+    path_to = Path(path_to) / f"db_positions{SUFFIXES[fmt]}"
 
     click.echo("Cleaning raw positions ...")
     click.echo(f"From : {path.absolute()}")
     click.echo(f"To   : {path_to.absolute()}")
 
-    long = clean_positions(path)
-    long.to_csv(path_to)
+    if validate:
+        cached = [file for file, key in keys.items() if key in cache]
+        check_report(validate_positions(path, locale=locale, skip=cached))
+
+    if backend == "polars":
+        long = preprocess_polars.clean_positions(path, locale=locale)
+    else:
+        long = clean_positions(
+            path, engine=engine, cache=cache, locale=locale, keys=keys
+        )
+    write_db(long, path_to, index=True)
 
     click.echo("Done!")
 
@@ -294,19 +401,59 @@ def create_db_positions(path, path_to):
     default=".",
     help="Path to dump database. By default the parent of --path is used.",
 )
-def create_db_cashflows(path, path_to):
+@click.option(
+    "--engine",
+    "engine",
+    type=click.Choice(ENGINES),
+    default="c",
+    help="CSV parser engine, pyarrow is multithreaded.",
+    show_default=True,
+)
+@click.option(
+    "--chunksize",
+    "chunksize",
+    type=int,
+    required=False,
+    default=None,
+    help="Clean the file by chunks of this number of rows (c engine).",
+)
+@option_validate
+@option_locale
+@option_backend
+@option_format
+def create_db_cashflows(
+    path, path_to, engine, chunksize, validate, locale, backend, fmt
+):
     """Create DB-cashflows from raw cashflows file."""
 
     path = Path(path)
-    path_to = Path(path_to) / "db_cashflows.csv"
+    path_to = Path(path_to) / f"db_cashflows{SUFFIXES[fmt]}"
 
     click.echo("Cleaning raw cashflows ...")
     click.echo(f"From : {path.absolute()}")
     click.echo(f"To   : {path_to.absolute()}")
 
-    raw = pd.read_csv(path)
-    cfs = clean_cashflows(raw)
-    cfs.to_csv(path_to, index=False)
+    if validate:
+        check_report(validate_files([path], dict(SPEC_CASHFLOWS, locale=locale)))
+
+    if locale is None:
+        locale = detect_locale(read_header(path), CASHFLOWS)
+
+    if backend == "polars":
+        if chunksize is not None:
+            raise click.UsageError("--chunksize needs the 'pandas' backend.")
+        cfs = preprocess_polars.clean_cashflows(path, locale=locale)
+        write_db(cfs, path_to)
+    elif chunksize is None:
+        raw = read_cashflows_raw(path, engine=engine, locale=locale)
+        cfs = clean_cashflows(raw, locale=locale)
+        write_db(cfs, path_to)
+    else:
+        if engine != "c":
+            raise click.UsageError("--chunksize needs the 'c' engine.")
+        if fmt != "csv":
+            raise click.UsageError("--chunksize needs the 'csv' format.")
+        clean_cashflows_chunked(path, path_to, chunksize=chunksize, locale=locale)
 
     click.echo("Done!")
 
@@ -329,19 +476,88 @@ def create_db_cashflows(path, path_to):
     default=".",
     help="Path to dump database. By default the parent of --path is used.",
 )
-def create_db_transactions(path, path_to):
+@click.option(
+    "--engine",
+    "engine",
+    type=click.Choice(ENGINES),
+    default="c",
+    help="CSV parser engine, pyarrow is multithreaded.",
+    show_default=True,
+)
+@option_validate
+@option_locale
+@option_backend
+@option_format
+def create_db_transactions(path, path_to, engine, validate, locale, backend, fmt):
     """Create DB-transactions from raw transactions file."""
 
     path = Path(path)
-    path_to = Path(path_to) / "db_transactions.csv"
+    path_to = Path(path_to) / f"db_transactions{SUFFIXES[fmt]}"
 
     click.echo("Cleaning raw transactions")
     click.echo(f"From : {path.absolute()}")
     click.echo(f"To   : {path_to.absolute()}")
 
-    raw = pd.read_csv(path)
-    # breakpoint()
-    transactions = clean_transactions(raw)
-    transactions.to_csv(path_to, index=False)
+    if validate:
+        check_report(validate_files([path], dict(SPEC_TRANSACTIONS, locale=locale)))
+
+    if locale is None:
+        locale = detect_locale(read_header(path), TRANSACTIONS)
+
+    if backend == "polars":
+        transactions = preprocess_polars.clean_transactions(path, locale=locale)
+    else:
+        raw = read_transactions_raw(path, engine=engine, locale=locale)
+        transactions = clean_transactions(raw, locale=locale)
+    write_db(transactions, path_to)
+
+    click.echo("Done!")
+
+
+@cli.command
+@click.option(
+    "--db",
+    "path_db",
+    type=str,
+    required=True,
+    help="Path positions database.",
+)
+@click.option(
+    "--to",
+    "-t",
+    "path_to",
+    type=str,
+    required=False,
+    default=None,
+    help="Path to the panel store. By default the parent of --db is used.",
+)
+def create_db_panel(path_db, path_to):
+    """Create or extend memory-mapped panel store from positions database."""
+
+    path_db = Path(path_db)
+
+    if path_to is None:
+        path_to = path_db.parent
+    path_to = Path(path_to) / "db_panel"
+
+    click.echo("Storing positions panel ...")
+    click.echo(f"From : {path_db.absolute()}")
+    click.echo(f"To   : {path_to.absolute()}")
+
+    positions = read_db(path_db, dates=[Positions.DATE], index_col=0)
+    panel = build_panel(
+        positions,
+        index=Positions.DATE,
+        columns=Positions.ISIN,
+        values=[
+            Positions.VALUE_PORTFOLIO,
+            Positions.VALUE_LOCAL,
+            Positions.PRICE,
+            Positions.SHARES,
+        ],
+    )
+
+    n_new = PanelStore(path_to).append(panel)
+    click.echo(f"New dates : {n_new}")
 
     click.echo("Done!")
@@ -0,0 +1,131 @@
+from pathlib import Path
+
+import click
+import pandas as pd
+from degiro_wrapper.conventions import Drift, Positions
+from degiro_wrapper.core.interchange import read_db
+from degiro_wrapper.reporting.attribution import compute_amount
+from degiro_wrapper.reporting.drift import THRESHOLD, build_targets, compute_drift
+from degiro_wrapper.reporting.utils import filter_positions
+
+from .cli import cli
+
+
+@cli.command
+@click.option(
+    "--ps",
+    "path_ps",
+    type=str,
+    required=True,
+    default=None,
+    help="Path positions database, CSV or Arrow.",
+)
+@click.option(
+    "--pf",
+    "paths_pf",
+    type=str,
+    required=True,
+    multiple=True,
+    help=f"Path portfolio with a '{Drift.TARGET}' weights column, repeat it "
+    "for each portfolio.",
+)
+@click.option(
+    "--start",
+    "-s",
+    "start",
+    type=str,
+    required=False,
+    default=None,
+    help="Start date.",
+)
+@click.option(
+    "--end",
+    "-e",
+    "end",
+    type=str,
+    required=False,
+    default=None,
+    help="End date.",
+)
+@click.option(
+    "--threshold",
+    "threshold",
+    type=float,
+    required=False,
+    default=THRESHOLD,
+    help="Largest absolute drift of a weight.",
+    show_default=True,
+)
+@click.option(
+    "--pr",
+    "path_rp",
+    type=str,
+    required=False,
+    default=".",
+    help="Path to dump the report.",
+)
+def drift(path_ps, paths_pf, start, end, threshold, path_rp):
+    """Create weights drift and rebalancing report of many portfolios."""
+
+    click.echo("Creating drift report ...")
+
+    path_ps = Path(path_ps)
+    paths_pf = [Path(path_pf) for path_pf in paths_pf]
+    path_rp = Path(path_rp)
+
+    # -------------------------------------------------------------------------
+    # Read data
+    positions = read_db(path_ps, dates=[Positions.DATE], index_col=0)
+
+    portfolios = {}
+    for path_pf in paths_pf:
+        portfolio = pd.read_csv(
+            path_pf, skipinitialspace=True, index_col=Positions.ISIN
+        )
+        if Drift.TARGET not in portfolio:
+            raise click.BadParameter(
+                f"{path_pf} has no '{Drift.TARGET}' column.", param_hint="--pf"
+            )
+        portfolios[path_pf.stem] = portfolio[Drift.TARGET]
+
+    try:
+        targets = build_targets(portfolios)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--pf") from error
+
+    # -------------------------------------------------------------------------
+    # Parse period
+    if start:
+        start = pd.to_datetime(start)
+    if end:
+        end = pd.to_datetime(end)
+
+    positions = filter_positions(positions, isins=targets.index, start=start, end=end)
+
+    # -------------------------------------------------------------------------
+    # All the portfolios and dates at once
+    table = compute_drift(compute_amount(positions), targets, threshold=threshold)
+
+    last = table.index.get_level_values(Positions.DATE).max()
+    trades = table.loc[last]
+    trades = trades.loc[trades[Drift.TRADE] != 0]
+
+    path_drift = path_rp / "drift.csv"
+    path_trades = path_rp / f"drift-trades_{last:%Y-%m-%d}.csv"
+    table.to_csv(path_drift)
+    trades.to_csv(path_trades)
+
+    summary = table.loc[last].groupby(Drift.PORTFOLIO)
+    summary = pd.DataFrame(
+        {
+            Drift.DRIFT: summary[Drift.DRIFT].apply(lambda x: x.abs().max()),
+            Drift.BREACH: summary[Drift.BREACH].sum(),
+        }
+    )
+    click.echo(f"Date : {last:%Y-%m-%d}")
+    click.echo(summary.to_string())
+    click.echo("Done!")
+
+    click.echo(f"Positions : {path_ps.absolute()}")
+    click.echo(f"Drift     : {path_drift.absolute()}")
+    click.echo(f"Trades    : {path_trades.absolute()}")
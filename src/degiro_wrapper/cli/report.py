@@ -2,22 +2,63 @@ from pathlib import Path
 
 import click
 import pandas as pd
-from degiro_wrapper.conventions import Positions, Transactions
+from degiro_wrapper.conventions import Calculations, Costs, Positions, Transactions
+from degiro_wrapper.core.interchange import read_db
+from degiro_wrapper.core.readers import read_cashflows_db
+from degiro_wrapper.reporting.attribution import (
+    compute_amount,
+    compute_cfs_isin,
+    compute_contributions,
+    link_contributions,
+)
 from degiro_wrapper.reporting.calculations import (
     compute_cfs,
+    compute_cfs_batch,
+    compute_cfs_external,
     compute_return_daily,
     compute_return_total,
+    compute_returns_batch,
     compute_tna,
+    compute_tna_batch,
+)
+from degiro_wrapper.reporting.costs import (
+    compute_cost_drag,
+    compute_costs,
+    compute_costs_daily,
+    summarize_costs,
+)
+from degiro_wrapper.reporting.fx import (
+    compute_currencies,
+    compute_fx_pnl,
+    compute_fx_returns,
+    compute_fx_returns_currency,
 )
-from degiro_wrapper.reporting.plot import create_report_plots
+from degiro_wrapper.reporting.incremental import IncrementalReturns
+from degiro_wrapper.reporting.lots import METHODS, compute_pnl, match_lots
+from degiro_wrapper.reporting.mwr import compute_mwr_batch, compute_window_mwr
+from degiro_wrapper.reporting.plot import create_report_plots, create_window_plots
+from degiro_wrapper.reporting.risk import compute_rolling_risk
+from degiro_wrapper.reporting.twr import TWRIndex
 from degiro_wrapper.reporting.utils import (
+    build_membership,
     filter_positions,
     filter_transactions,
 )
+from degiro_wrapper.reporting.windows import compute_window_returns, window_boundary
 
 from .cli import cli
 
 
+def check_windows(ctx, param, windows):
+    """Reject unknown windows before loading any data."""
+    for window in windows:
+        try:
+            window_boundary(window, pd.Timestamp.today())
+        except ValueError as error:
+            raise click.BadParameter(str(error)) from error
+    return windows
+
+
 @cli.command
 @click.option(
     "--ps",
@@ -25,7 +66,7 @@ from .cli import cli
     type=str,
     required=True,
     default=None,
-    help="Path positions.",
+    help="Path positions database, CSV or Arrow.",
 )
 @click.option(
     "--tr",
@@ -33,7 +74,7 @@ from .cli import cli
     type=str,
     required=True,
     default=None,
-    help="Path transactions.",
+    help="Path transactions database, CSV or Arrow.",
 )
 @click.option(
     "--pf",
@@ -69,7 +110,91 @@ from .cli import cli
     default=".",
     help="Path to dump the report.",
 )
-def report(path_ps, path_tr, path_pf, start, end, path_rp):
+@click.option(
+    "--state",
+    "path_state",
+    type=str,
+    required=False,
+    default=None,
+    help="Path to the persisted state, only new days are computed.",
+)
+@click.option(
+    "--window",
+    "windows",
+    type=str,
+    multiple=True,
+    callback=check_windows,
+    help="Also report a window: MTD, QTD, YTD, ITD or <n>Y. Repeat it for many.",
+)
+@click.option(
+    "--cf",
+    "path_cf",
+    type=str,
+    required=False,
+    default=None,
+    help="Path cashflows database, also report the windows of the whole account.",
+)
+@click.option(
+    "--tables/--no-tables",
+    "tables",
+    default=False,
+    help="Also write monthly, quarterly and yearly return tables.",
+    show_default=True,
+)
+@click.option(
+    "--risk",
+    "risk_window",
+    type=int,
+    required=False,
+    default=None,
+    help="Also write rolling risk metrics over a window of this many days.",
+)
+@click.option(
+    "--attribution/--no-attribution",
+    "attribution",
+    default=False,
+    help="Also write the contribution of each ISIN to the return.",
+    show_default=True,
+)
+@click.option(
+    "--lots",
+    "lots",
+    type=click.Choice(METHODS),
+    required=False,
+    default=None,
+    help="Also write the realized and unrealized PnL, matching lots this way.",
+)
+@click.option(
+    "--fx/--no-fx",
+    "fx",
+    default=False,
+    help="Also write the returns split into local and currency parts.",
+    show_default=True,
+)
+@click.option(
+    "--costs/--no-costs",
+    "costs",
+    default=True,
+    help="Write the transaction costs and their drag on the return.",
+    show_default=True,
+)
+def report(
+    path_ps,
+    path_tr,
+    path_pf,
+    start,
+    end,
+    path_rp,
+    path_state,
+    windows,
+    path_cf,
+    tables,
+    risk_window,
+    attribution,
+    lots,
+    fx,
+    costs,
+):
     """Create general report."""
 
     click.echo("Creating report ...")
@@ -81,15 +206,8 @@ def report(path_ps, path_tr, path_pf, start, end, path_rp):
 
     # -------------------------------------------------------------------------
     # Read data
-    positions = pd.read_csv(
-        path_ps,
-        index_col=0,
-        skipinitialspace=True,
-        parse_dates=[Positions.DATE],
-    )
-    transactions = pd.read_csv(
-        path_tr, skipinitialspace=True, parse_dates=[Transactions.DATE]
-    )
+    positions = read_db(path_ps, dates=[Positions.DATE], index_col=0)
+    transactions = read_db(path_tr, dates=[Transactions.DATE])
     portfolio = pd.read_csv(
         path_pf, skipinitialspace=True, index_col=Positions.ISIN
     )
@@ -102,8 +220,22 @@ def report(path_ps, path_tr, path_pf, start, end, path_rp):
         end = pd.to_datetime(end)
 
     # -------------------------------------------------------------------------
-    # Trim data to reporting period
+    # Extend the persisted series with the new days of all the history,
+    # the reporting period is only read from it
     isins = portfolio.index
+    if path_state is not None:
+        state = IncrementalReturns(path_state, isins=isins)
+        series_new = state.update(
+            filter_positions(positions=positions, isins=isins),
+            filter_transactions(transactions=transactions, isins=isins),
+        )
+        click.echo(f"New days : {len(series_new)}")
+
+    # -------------------------------------------------------------------------
+    # Trim data to reporting period, the account keeps all the positions
+    if path_cf is not None:
+        account = filter_positions(positions=positions, start=start, end=end)
+
     positions = filter_positions(
         positions=positions,
         isins=isins,
@@ -116,28 +248,54 @@ def report(path_ps, path_tr, path_pf, start, end, path_rp):
     click.echo(f"Start : {_start}")
     click.echo(f"End   : {_end}")
 
+    # Lots are matched on all the history, also before the start
+    if lots:
+        history = filter_transactions(transactions=transactions, isins=isins, end=end)
+    if fx:
+        currencies = compute_currencies(transactions)
+
+    keep = [Transactions.EXCHANGE, Transactions.EXECUTION]
+    if fx:
+        keep.append(Transactions.RATE)
+
     transactions = filter_transactions(
         transactions=transactions,
         isins=isins,
         start=start,
         end=end,
+        keep=keep,
     )
 
-    # -------------------------------------------------------------------------
-    # Compute TnA
-    tna = compute_tna(positions)
+    if path_state is None:
+        # ---------------------------------------------------------------------
+        # Compute TnA
+        tna = compute_tna(positions)
 
-    # -------------------------------------------------------------------------
-    # Compute CFs
-    cfs = compute_cfs(transactions)
+        # ---------------------------------------------------------------------
+        # Compute CFs
+        cfs = compute_cfs(transactions)
 
-    # -------------------------------------------------------------------------
-    # Compute daily returns
-    return_daily = compute_return_daily(tna=tna, cfs=cfs)
+        # ---------------------------------------------------------------------
+        # Compute daily returns
+        return_daily = compute_return_daily(tna=tna, cfs=cfs)
 
-    # -------------------------------------------------------------------------
-    # Compute total return
-    return_total = compute_return_total(return_daily)
+        # ---------------------------------------------------------------------
+        # Compute total return
+        return_total = compute_return_total(return_daily)
+    else:
+        # ---------------------------------------------------------------------
+        # Only the reporting period of all the persisted days
+        series = state.read(start=start, end=end)
+        if series.empty:
+            raise SystemExit("No days in the state for the reporting period.")
+
+        tna = series[Calculations.TNA]
+        cfs = series[Calculations.CFS]
+        return_daily = series[Calculations.RETURN_DAILY]
+        return_total = series[Calculations.RETURN_TOTAL]
+
+        _start = tna.index[0].strftime("%Y-%m-%d")
+        _end = tna.index[-1].strftime("%Y-%m-%d")
 
     # -------------------------------------------------------------------------
     # Create report
@@ -146,9 +304,247 @@ def report(path_ps, path_tr, path_pf, start, end, path_rp):
 
     create_report_plots(path_rp, tna=tna, cfs=cfs, return_total=return_total)
 
+    # -------------------------------------------------------------------------
+    # Windows from the same series
+    if windows:
+        summary = compute_window_returns(return_daily, windows=windows)
+        summary = compute_window_mwr(tna, cfs, summary)
+        summary.to_csv(path_rp / "windows.csv")
+        click.echo(summary.to_string())
+
+        create_window_plots(
+            path_rp,
+            tna=tna,
+            cfs=cfs,
+            return_total=return_total,
+            summary=summary,
+        )
+
+        # Whole account, cash included, with its deposits and withdrawals
+        if path_cf is not None:
+            tna_account = compute_tna(account)
+            cfs_account = compute_cfs_external(read_cashflows_db(path_cf))
+            return_account = compute_return_daily(tna=tna_account, cfs=cfs_account)
+
+            summary = compute_window_returns(return_account, windows=windows)
+            summary = compute_window_mwr(tna_account, cfs_account, summary)
+            summary.to_csv(path_rp / "windows-account.csv")
+            click.echo(summary.to_string())
+
+    # -------------------------------------------------------------------------
+    # Calendar period returns
+    if tables:
+        index = TWRIndex(return_daily)
+        index.monthly_table().to_csv(path_rp / "returns-monthly.csv")
+        for name in ["quarterly", "yearly"]:
+            index.period_returns(name).to_csv(path_rp / f"returns-{name}.csv")
+
+    # -------------------------------------------------------------------------
+    # Rolling risk metrics
+    if risk_window:
+        risk = compute_rolling_risk(return_daily, window=risk_window)
+        risk.to_csv(path_rp / "risk.csv")
+        click.echo(risk.iloc[-1].to_string())
+
+    # -------------------------------------------------------------------------
+    # Return attribution by ISIN
+    if attribution:
+        contributions = compute_contributions(
+            compute_amount(positions), compute_cfs_isin(transactions)
+        )
+        linked = link_contributions(contributions).rename(Calculations.RETURN_TOTAL)
+        linked.to_csv(path_rp / "attribution.csv")
+        link_contributions(contributions, freq="M").to_csv(
+            path_rp / "attribution-monthly.csv"
+        )
+
+    # -------------------------------------------------------------------------
+    # Realized and unrealized PnL of the lots
+    if lots:
+        trades, _ = match_lots(history, method=lots)
+        realized, unrealized = compute_pnl(trades, compute_amount(positions))
+
+        first = positions[Positions.DATE].min()
+        realized.loc[first:].to_csv(path_rp / "pnl-realized.csv")
+        unrealized.loc[first:].to_csv(path_rp / "pnl-unrealized.csv")
+
+    # -------------------------------------------------------------------------
+    # Local and currency returns
+    if fx:
+        capital, pnl_local, pnl_currency = compute_fx_pnl(positions, transactions)
+        compute_fx_returns(capital, pnl_local, pnl_currency).to_csv(
+            path_rp / "fx-returns.csv"
+        )
+        compute_fx_returns_currency(
+            capital, pnl_local, pnl_currency, currencies
+        ).to_csv(path_rp / "fx-currencies.csv")
+
+    # -------------------------------------------------------------------------
+    # Transaction costs and their drag
+    if costs:
+        table = compute_costs(transactions)
+        table.to_csv(path_rp / "costs.csv")
+        for key, name in [
+            (Transactions.ISIN, "isin"),
+            (Transactions.EXCHANGE, "exchange"),
+            (Transactions.EXECUTION, "execution"),
+            (Costs.PERIOD, "period"),
+        ]:
+            summarize_costs(table, by=key).to_csv(path_rp / f"costs-{name}.csv")
+
+        drag = compute_cost_drag(tna, cfs, compute_costs_daily(transactions))
+        drag.to_csv(path_rp / "cost-drag.csv")
+        return_net = (1 + drag[Costs.RETURN_NET]).prod() - 1
+        click.echo(f"Costs        : {table[Costs.COSTS].sum():.2f}")
+        click.echo(f"Return net   : {return_net:.4%}")
+
     click.echo("Done!")
 
     click.echo(f"Positions    : {path_ps.absolute()}")
     click.echo(f"Transactions : {path_tr.absolute()}")
     click.echo(f"Portfolio    : {path_pf.absolute()}")
     click.echo(f"Report       : {path_rp.absolute()}")
+
+
+@cli.command
+@click.option(
+    "--ps",
+    "path_ps",
+    type=str,
+    required=True,
+    default=None,
+    help="Path positions database, CSV or Arrow.",
+)
+@click.option(
+    "--tr",
+    "path_tr",
+    type=str,
+    required=True,
+    default=None,
+    help="Path transactions database, CSV or Arrow.",
+)
+@click.option(
+    "--pf",
+    "paths_pf",
+    type=str,
+    required=True,
+    multiple=True,
+    help="Path portfolio, repeat it for each portfolio.",
+)
+@click.option(
+    "--start",
+    "-s",
+    "start",
+    type=str,
+    required=False,
+    default=None,
+    help="Start date.",
+)
+@click.option(
+    "--end",
+    "-e",
+    "end",
+    type=str,
+    required=False,
+    default=None,
+    help="End date.",
+)
+@click.option(
+    "--pr",
+    "path_rp",
+    type=str,
+    required=False,
+    default=".",
+    help="Path to dump the reports.",
+)
+def report_batch(path_ps, path_tr, paths_pf, start, end, path_rp):
+    """Create general report of many portfolios from a single data load."""
+
+    click.echo("Creating reports ...")
+
+    path_ps = Path(path_ps)
+    path_tr = Path(path_tr)
+    paths_pf = [Path(path_pf) for path_pf in paths_pf]
+    path_rp = Path(path_rp)
+
+    # -------------------------------------------------------------------------
+    # Read data, once for all the portfolios
+    positions = read_db(path_ps, dates=[Positions.DATE], index_col=0)
+    transactions = read_db(path_tr, dates=[Transactions.DATE])
+
+    portfolios = {
+        path_pf.stem: pd.read_csv(
+            path_pf, skipinitialspace=True, index_col=Positions.ISIN
+        ).index
+        for path_pf in paths_pf
+    }
+    membership = build_membership(portfolios)
+
+    # -------------------------------------------------------------------------
+    # Parse period
+    if start:
+        start = pd.to_datetime(start)
+    if end:
+        end = pd.to_datetime(end)
+
+    # -------------------------------------------------------------------------
+    # Trim data to reporting period and to the ISINs of any portfolio
+    isins = membership.index
+    positions = filter_positions(positions, isins=isins, start=start, end=end)
+    transactions = filter_transactions(transactions, isins=isins, start=start, end=end)
+
+    # -------------------------------------------------------------------------
+    # Compute TnA, CFs and returns of all the portfolios at once
+    tna = compute_tna_batch(positions, membership)
+    cfs = compute_cfs_batch(transactions, membership)
+    _, return_total = compute_returns_batch(tna=tna, cfs=cfs)
+    mwr = compute_mwr_batch(tna=tna, cfs=cfs)
+
+    # -------------------------------------------------------------------------
+    # Create reports
+    summary = []
+    for name in membership.columns:
+        _tna = tna[name].dropna()
+        if _tna.empty:
+            click.echo(f"{name} : no positions, skipped.")
+            continue
+
+        _start = _tna.index[0].strftime("%Y-%m-%d")
+        _end = _tna.index[-1].strftime("%Y-%m-%d")
+
+        _cfs = cfs[name].loc[lambda x: x != 0].rename(Calculations.CFS)
+        _return_total = return_total[name].dropna()
+
+        path_report = path_rp / f"report_{name}_{_end}_{_start}"
+        path_report.mkdir(exist_ok=True)
+        create_report_plots(
+            path_report,
+            tna=_tna.rename(Calculations.TNA),
+            cfs=_cfs,
+            return_total=_return_total.rename(Calculations.RETURN_TOTAL),
+        )
+
+        summary.append(
+            {
+                "portfolio": name,
+                "start": _start,
+                "end": _end,
+                Calculations.TNA: _tna.iloc[-1],
+                Calculations.RETURN_TOTAL: _return_total.iloc[-1],
+                Calculations.XIRR: mwr.loc[name, Calculations.XIRR],
+                Calculations.RETURN_MONEY_WEIGHTED: mwr.loc[
+                    name, Calculations.RETURN_MONEY_WEIGHTED
+                ],
+            }
+        )
+
+    summary = pd.DataFrame(summary)
+    path_summary = path_rp / "summary.csv"
+    summary.to_csv(path_summary, index=False)
+
+    click.echo(summary.to_string(index=False))
+    click.echo("Done!")
+
+    click.echo(f"Positions    : {path_ps.absolute()}")
+    click.echo(f"Transactions : {path_tr.absolute()}")
+    click.echo(f"Summary      : {path_summary.absolute()}")
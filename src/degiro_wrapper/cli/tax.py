@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import click
+from degiro_wrapper.conventions import Taxes, Transactions
+from degiro_wrapper.core.interchange import read_db
+from degiro_wrapper.reporting.tax import compute_capital_gains, compute_tax_years
+
+from .cli import cli
+
+
+@cli.command
+@click.option(
+    "--tr",
+    "path_tr",
+    type=str,
+    required=True,
+    default=None,
+    help="Path transactions database, CSV or Arrow.",
+)
+@click.option(
+    "--year",
+    "year",
+    type=int,
+    required=False,
+    default=None,
+    help="Tax year of the sales, by default all.",
+)
+@click.option(
+    "--pr",
+    "path_rp",
+    type=str,
+    required=False,
+    default=".",
+    help="Path to dump the report.",
+)
+def tax_report(path_tr, year, path_rp):
+    """Create Spanish capital gains report by tax year."""
+
+    click.echo("Creating tax report ...")
+
+    path_tr = Path(path_tr)
+    path_rp = Path(path_rp)
+
+    transactions = read_db(path_tr, dates=[Transactions.DATE])
+
+    # -------------------------------------------------------------------------
+    # All the years at once, deferred losses cross years
+    sales = compute_capital_gains(transactions)
+    years = compute_tax_years(sales)
+
+    if year is not None:
+        sales = sales.loc[sales[Taxes.YEAR] == year]
+        years = years.loc[years.index == year]
+
+    suffix = "" if year is None else f"_{year}"
+    path_sales = path_rp / f"tax_sales{suffix}.csv"
+    path_years = path_rp / f"tax_years{suffix}.csv"
+    sales.to_csv(path_sales, index=False)
+    years.to_csv(path_years)
+
+    click.echo(years.to_string())
+    click.echo("Done!")
+
+    click.echo(f"Transactions : {path_tr.absolute()}")
+    click.echo(f"Sales        : {path_sales.absolute()}")
+    click.echo(f"Years        : {path_years.absolute()}")
@@ -34,6 +34,8 @@ class PositionsRaw:
     VALUE_LOCAL = "Valor local"
     VALUE_EUR = "Valor en EUR"
 
+    DATE_FORMAT = FILENAME_POSITIONS.split("_")[-1]
+
 
 class CashflowsRaw:
 
@@ -48,10 +50,14 @@ class CashflowsRaw:
     PRODUCT = "Producto"
     TYPE = "Tipo"
     ID = "ID Orden"
+    ISIN = "ISIN"
+
+    DATE_FORMAT = "%d-%m-%Y"
 
 
 class Cashflows:
 
+    ISIN = Positions.ISIN
     DELTA = "delta"
     DELTA_CCY = "deltaCcy"
     AMOUNT = "amount"
@@ -68,8 +74,24 @@ class CashflowType:
 
     BUY = "BUY"
     SELL = "SELL"
+    DIVIDEND = "DIVIDEND"
+    DIVIDEND_TAX = "DIVIDEND_TAX"
+    FEE = "FEE"
+    FX = "FX"
+    DEPOSIT = "DEPOSIT"
+    WITHDRAWAL = "WITHDRAWAL"
+    INTEREST = "INTEREST"
+
     RAW_COMPRA = "Compra"
     RAW_VENTA = "Venta"
+    RAW_DIVIDENDO = "Dividendo"
+    RAW_RETENCION = "Retención del dividendo"
+    RAW_COMISION = "Comisión"
+    RAW_COSTES = "Costes de transacción"
+    RAW_CAMBIO_DIVISA = "Cambio de Divisa"
+    RAW_INGRESO = "Ingreso"
+    RAW_RETIRADA = "Retirada"
+    RAW_INTERES = "Interés"
 
 
 class TransactionsRaw:
@@ -100,6 +122,9 @@ class TransactionsRaw:
     TYPE = "Tipo"
     ID = "ID Orden"
 
+    DATE_FORMAT = "%d-%m-%Y"
+    TIME_FORMAT = "%H:%M"
+
 
 class Transactions:
 
@@ -128,6 +153,7 @@ class Transactions:
     DATE = "date"
     DATE_VALUE = "dateValue"
     TIME = "time"
+    TIMESTAMP = "timestamp"
     TYPE = "type"
     ID = "id"
 
@@ -138,3 +164,73 @@ class Calculations:
     CFS = "cfs"
     RETURN_DAILY = "returnDaily"
     RETURN_TOTAL = "returnTotal"
+    XIRR = "xirr"
+    RETURN_MONEY_WEIGHTED = "returnMoneyWeighted"
+    RETURN_LOCAL = "returnLocal"
+    RETURN_CURRENCY = "returnCurrency"
+
+
+class Risk:
+
+    VOLATILITY = "volatility"
+    SHARPE = "sharpe"
+    SORTINO = "sortino"
+    DRAWDOWN = "drawdown"
+    DRAWDOWN_DURATION = "drawdownDuration"
+    MAX_DRAWDOWN = "maxDrawdown"
+
+
+class Lots:
+
+    DATE = Transactions.DATE
+    ISIN = Transactions.ISIN
+    SHARES = Transactions.SHARES
+    VALUE_SHARE = "valueShare"
+    REALIZED = "pnlRealized"
+    SHARES_OPEN = "sharesOpen"
+    COST_OPEN = "costOpen"
+
+    TRADE = "trade"
+    TRADE_OPEN = "tradeOpen"
+    DATE_OPEN = "dateOpen"
+    DATE_CLOSE = "dateClose"
+    COST = "cost"
+    PROCEEDS = "proceeds"
+
+    FIFO = "fifo"
+    LIFO = "lifo"
+    AVERAGE = "average"
+
+
+class Taxes:
+
+    YEAR = "year"
+    DATE_SALE = "dateSale"
+    DATE_BUY = "dateBuy"
+    GAIN = "gain"
+    GAINS = "gains"
+    LOSSES = "losses"
+    DEFERRED = "deferred"
+    RELEASED = "released"
+    COMPUTABLE = "computable"
+
+
+class Costs:
+
+    PERIOD = "period"
+    TRADES = "trades"
+    TRADED = "traded"
+    COSTS = "costs"
+    COSTS_BPS = "costsBps"
+    COST_DRAG = "costDrag"
+    RETURN_NET = "returnNet"
+
+
+class Drift:
+
+    PORTFOLIO = "portfolio"
+    TARGET = "target"
+    WEIGHT = "weight"
+    DRIFT = "drift"
+    BREACH = "breach"
+    TRADE = "trade"
@@ -0,0 +1,117 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_SIZE = 512 * 2**20
+SUFFIX = ".pkl"
+
+
+class ParsedFileCache:
+    """Cache of cleaned frames keyed by raw file content and parser options.
+
+    Frames are stored as pickles, which are fast to read back and need no
+    extra dependency. Entries are evicted least recently used first when
+    the cache grows over ``max_size`` bytes.
+
+    Parameters
+    ----------
+    path : Path-like
+        Cache folder, created if needed.
+    version : str
+        Parser version, entries of other versions are never hit.
+    max_size : int, optional
+        Maximum size of the cache in bytes, by default 512 MB.
+    """
+
+    def __init__(self, path, version, max_size=CACHE_SIZE):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.version = str(version)
+        self.max_size = max_size
+
+        self._size = sum(file.stat().st_size for file in self._entries())
+
+    def _entries(self):
+        return self.path.glob("*" + SUFFIX)
+
+    def key(self, file, **options):
+        """Hash of the parser version, the parser options and the file content.
+
+        Parameters
+        ----------
+        file : Path-like
+        **options
+            Parser options that change the cleaned frame,
+            e.g. engine and locale.
+
+        Returns
+        -------
+        key : str
+        """
+        digest = hashlib.sha256(self.version.encode())
+        for name, value in sorted(options.items()):
+            digest.update(f"\0{name}={value}".encode())
+        digest.update(b"\0")
+        digest.update(Path(file).read_bytes())
+        return digest.hexdigest()
+
+    def __contains__(self, key):
+        return (self.path / (key + SUFFIX)).exists()
+
+    def get(self, key):
+        """Get cached frame.
+
+        Parameters
+        ----------
+        key : str
+
+        Returns
+        -------
+        frame : pandas.DataFrame or None
+            None if the key is not cached.
+        """
+        entry = self.path / (key + SUFFIX)
+        try:
+            frame = pd.read_pickle(entry)
+        except FileNotFoundError:
+            return None
+
+        # Mark as recently used
+        os.utime(entry)
+
+        return frame
+
+    def set(self, key, frame):
+        """Cache frame and evict old entries if needed.
+
+        Parameters
+        ----------
+        key : str
+        frame : pandas.DataFrame
+        """
+        entry = self.path / (key + SUFFIX)
+        frame.to_pickle(entry)
+        self._size += entry.stat().st_size
+
+        if self._size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until under the size limit."""
+        entries = [(file.stat(), file) for file in self._entries()]
+        entries.sort(key=lambda entry: entry[0].st_mtime)
+
+        self._size = sum(stat.st_size for stat, _ in entries)
+        for stat, file in entries:
+            if self._size <= self.max_size:
+                break
+            file.unlink(missing_ok=True)
+            self._size -= stat.st_size
+
+    def clear(self):
+        """Remove all entries."""
+        for file in self._entries():
+            file.unlink(missing_ok=True)
+        self._size = 0
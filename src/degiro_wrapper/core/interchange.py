@@ -0,0 +1,154 @@
+from pathlib import Path
+
+import pandas as pd
+
+# Database formats of the create-db-* commands
+FORMATS = ["csv", "arrow"]
+SUFFIXES = {"csv": ".csv", "arrow": ".arrow"}
+
+SUFFIXES_ARROW = (".arrow", ".feather")
+
+
+def import_pyarrow():
+    """Import pyarrow, an optional dependency of the Arrow formats."""
+    try:
+        import pyarrow as pa
+    except ImportError as error:
+        raise ImportError(
+            "Arrow files and the pyarrow engine need pyarrow installed, "
+            "e.g. pip install degiro-wrapper[pyarrow]."
+        ) from error
+
+    return pa
+
+
+def to_arrow(frame):
+    """Convert DataFrame to Arrow table, numeric columns are not copied.
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame
+
+    Returns
+    -------
+    table : pyarrow.Table
+    """
+    pa = import_pyarrow()
+
+    return pa.Table.from_pandas(frame, preserve_index=False)
+
+
+def from_arrow(table):
+    """Convert Arrow table to DataFrame.
+
+    Columns are not consolidated into blocks, so numeric columns without
+    missing values are views over the Arrow buffers.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+
+    Returns
+    -------
+    frame : pandas.DataFrame
+    """
+    return table.to_pandas(split_blocks=True)
+
+
+def write_db(frame, path, index=False):
+    """Write database in the format given by the file suffix.
+
+    Arrow IPC files (".arrow", ".feather") are written uncompressed,
+    so that they can be memory-mapped when read back.
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame or pyarrow.Table
+    path : Path-like
+        CSV, Parquet (".parquet") or Arrow IPC (".arrow", ".feather") file.
+    index : bool, optional
+        Write the index, only for CSV files.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix in SUFFIXES_ARROW:
+        import_pyarrow()
+        from pyarrow import feather
+
+        table = frame if not isinstance(frame, pd.DataFrame) else to_arrow(frame)
+        feather.write_feather(table, path, compression="uncompressed")
+        return
+
+    if not isinstance(frame, pd.DataFrame):
+        frame = from_arrow(frame)
+
+    if suffix == ".parquet":
+        frame.to_parquet(path, index=False)
+        return
+
+    frame.to_csv(path, index=index)
+
+
+def read_arrow(path, columns=None):
+    """Memory-map an Arrow IPC file, no data is read until used.
+
+    Parameters
+    ----------
+    path : Path-like
+    columns : list of str, optional
+        Columns to read, by default all.
+
+    Returns
+    -------
+    table : pyarrow.Table
+    """
+    pa = import_pyarrow()
+
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    if columns is not None:
+        table = table.select(columns)
+
+    return table
+
+
+def read_db(path, dates=(), index_col=None, columns=None):
+    """Read database in the format given by the file suffix.
+
+    Arrow and Parquet files keep their types, CSV files are parsed.
+
+    Parameters
+    ----------
+    path : Path-like
+        CSV, Parquet (".parquet") or Arrow IPC (".arrow", ".feather") file.
+    dates : list of str, optional
+        Date columns, only parsed in CSV files.
+    index_col : int, optional
+        Index column, only in CSV files, e.g. 0 for positions.
+    columns : list of str, optional
+        Columns to read, by default all.
+
+    Returns
+    -------
+    frame : pandas.DataFrame
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix in SUFFIXES_ARROW:
+        return from_arrow(read_arrow(path, columns=columns))
+    if suffix == ".parquet":
+        return pd.read_parquet(path, columns=columns)
+
+    frame = pd.read_csv(
+        path,
+        index_col=index_col,
+        skipinitialspace=True,
+        parse_dates=list(dates),
+    )
+    if columns is not None:
+        frame = frame[columns]
+
+    return frame
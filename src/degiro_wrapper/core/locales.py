@@ -0,0 +1,438 @@
+import re
+from functools import lru_cache
+
+from degiro_wrapper.conventions import (
+    CashflowType,
+    Cashflows,
+    CashflowsRaw,
+    Positions,
+    PositionsRaw,
+    Transactions,
+    TransactionsRaw,
+)
+
+POSITIONS = "positions"
+CASHFLOWS = "cashflows"
+TRANSACTIONS = "transactions"
+DESCRIPTIONS = "descriptions"
+
+REPORTS = [POSITIONS, CASHFLOWS, TRANSACTIONS]
+
+# Columns of the clean reports and their dtype when read from raw CSV files.
+# Decimal commas and currency prefixes are kept as strings, they are cleaned
+# in degiro_wrapper.core.preprocess. Dates are kept as strings too.
+DTYPES = {
+    POSITIONS: {
+        Positions.NAME: "object",
+        Positions.ISIN: "object",
+        Positions.SHARES: "float64",
+        Positions.PRICE: "object",
+        Positions.VALUE_LOCAL: "object",
+        Positions.VALUE_PORTFOLIO: "object",
+    },
+    CASHFLOWS: {
+        Cashflows.DATE: "object",
+        Cashflows.TIME: "object",
+        Cashflows.DATE_VALUE: "object",
+        Positions.NAME: "object",
+        Cashflows.ISIN: "object",
+        Cashflows.DESCRIPTION: "object",
+        Cashflows.TYPE: "object",
+        Cashflows.DELTA_CCY: "object",
+        Cashflows.DELTA: "object",
+        Cashflows.AMOUNT_CCY: "object",
+        Cashflows.AMOUNT: "object",
+        Cashflows.ID: "object",
+    },
+    TRANSACTIONS: {
+        Transactions.DATE: "object",
+        Transactions.TIME: "object",
+        Positions.NAME: "object",
+        Transactions.ISIN: "object",
+        Transactions.EXCHANGE: "object",
+        Transactions.EXECUTION: "object",
+        Transactions.SHARES: "float64",
+        Transactions.PRICE: "float64",
+        Transactions.PRICE_CCY: "object",
+        Transactions.VALUE_LOCAL: "float64",
+        Transactions.VALUE_LOCAL_CCY: "object",
+        Transactions.VALUE_PORTFOLIO: "float64",
+        Transactions.VALUE_CCY: "object",
+        Transactions.RATE: "float64",
+        Transactions.TRANSACTION_COSTS: "float64",
+        Transactions.TRANSACTION_COSTS_CCY: "object",
+        Transactions.TOTAL: "float64",
+        Transactions.TOTAL_CCY: "object",
+        Transactions.ID: "object",
+    },
+}
+
+# Columns without header are named by position and do not depend on the locale.
+UNNAMED = {
+    POSITIONS: {},
+    CASHFLOWS: {
+        CashflowsRaw.UNNAMED_DELTA: Cashflows.DELTA,
+        CashflowsRaw.UNNAMED_AMOUNT: Cashflows.AMOUNT,
+    },
+    TRANSACTIONS: {
+        TransactionsRaw.UNNAMED_PRICE: Transactions.PRICE_CCY,
+        TransactionsRaw.UNNAMED_VALUE_LOCAL: Transactions.VALUE_LOCAL_CCY,
+        TransactionsRaw.UNNAMED_VALUE: Transactions.VALUE_CCY,
+        TransactionsRaw.UNNAMED_COSTS: Transactions.TRANSACTION_COSTS_CCY,
+        TransactionsRaw.UNNAMED_TOTAL: Transactions.TOTAL_CCY,
+    },
+}
+
+
+def _named(report, raw):
+    """Map raw headers, in the order of DTYPES, skipping unnamed columns."""
+    named = [col for col in DTYPES[report] if col not in UNNAMED[report].values()]
+    return dict(zip(raw, named))
+
+
+# Raw header to clean column, and cashflow description patterns
+# (the first match wins) of each locale.
+LOCALES = {
+    "ES": {
+        POSITIONS: {
+            PositionsRaw.PRODUCT: Positions.NAME,
+            PositionsRaw.ISIN: Positions.ISIN,
+            PositionsRaw.QUANTITY: Positions.SHARES,
+            PositionsRaw.PRICE: Positions.PRICE,
+            PositionsRaw.VALUE_LOCAL: Positions.VALUE_LOCAL,
+            PositionsRaw.VALUE_EUR: Positions.VALUE_PORTFOLIO,
+        },
+        CASHFLOWS: {
+            CashflowsRaw.DATE: Cashflows.DATE,
+            CashflowsRaw.TIME: Cashflows.TIME,
+            CashflowsRaw.DATE_VALUE: Cashflows.DATE_VALUE,
+            CashflowsRaw.PRODUCT: Positions.NAME,
+            CashflowsRaw.ISIN: Cashflows.ISIN,
+            CashflowsRaw.DESCRIPTION: Cashflows.DESCRIPTION,
+            CashflowsRaw.TYPE: Cashflows.TYPE,
+            CashflowsRaw.DELTA: Cashflows.DELTA_CCY,
+            CashflowsRaw.AMOUNT: Cashflows.AMOUNT_CCY,
+            CashflowsRaw.ID: Cashflows.ID,
+        },
+        TRANSACTIONS: {
+            TransactionsRaw.DATE: Transactions.DATE,
+            TransactionsRaw.TIME: Transactions.TIME,
+            TransactionsRaw.PRODUCT: Positions.NAME,
+            TransactionsRaw.ISIN: Transactions.ISIN,
+            TransactionsRaw.EXCHANGE: Transactions.EXCHANGE,
+            TransactionsRaw.EXECUTION: Transactions.EXECUTION,
+            TransactionsRaw.SHARES: Transactions.SHARES,
+            TransactionsRaw.PRICE: Transactions.PRICE,
+            TransactionsRaw.VALUE_LOCAL: Transactions.VALUE_LOCAL,
+            TransactionsRaw.VALUE: Transactions.VALUE_PORTFOLIO,
+            TransactionsRaw.RATE: Transactions.RATE,
+            TransactionsRaw.TRANSACTION_COSTS: Transactions.TRANSACTION_COSTS,
+            TransactionsRaw.TOTAL: Transactions.TOTAL,
+            TransactionsRaw.ID: Transactions.ID,
+        },
+        # A currency exchange also starts with the deposit/withdrawal words
+        DESCRIPTIONS: [
+            (CashflowType.RAW_CAMBIO_DIVISA, CashflowType.FX),
+            (CashflowType.RAW_RETENCION, CashflowType.DIVIDEND_TAX),
+            (CashflowType.RAW_DIVIDENDO, CashflowType.DIVIDEND),
+            (CashflowType.RAW_COMPRA, CashflowType.BUY),
+            (CashflowType.RAW_VENTA, CashflowType.SELL),
+            (CashflowType.RAW_COMISION, CashflowType.FEE),
+            (CashflowType.RAW_COSTES, CashflowType.FEE),
+            (CashflowType.RAW_INTERES, CashflowType.INTEREST),
+            (rf"^{CashflowType.RAW_INGRESO}\b", CashflowType.DEPOSIT),
+            (rf"^{CashflowType.RAW_RETIRADA}\b", CashflowType.WITHDRAWAL),
+        ],
+    },
+    "EN": {
+        POSITIONS: _named(
+            POSITIONS,
+            [
+                "Product",
+                "Symbol/ISIN",
+                "Quantity",
+                "Closing",
+                "Local value",
+                "Value in EUR",
+            ],
+        ),
+        CASHFLOWS: _named(
+            CASHFLOWS,
+            [
+                "Date",
+                "Time",
+                "Value date",
+                "Product",
+                "ISIN",
+                "Description",
+                "FX",
+                "Change",
+                "Balance",
+                "Order Id",
+            ],
+        ),
+        TRANSACTIONS: _named(
+            TRANSACTIONS,
+            [
+                "Date",
+                "Time",
+                "Product",
+                "ISIN",
+                "Reference exchange",
+                "Venue",
+                "Quantity",
+                "Price",
+                "Local value",
+                "Value",
+                "Exchange rate",
+                "Transaction and/or third",
+                "Total",
+                "Order ID",
+            ],
+        ),
+        DESCRIPTIONS: [
+            (r"^FX |Currency", CashflowType.FX),
+            (r"Dividend Tax", CashflowType.DIVIDEND_TAX),
+            (r"Dividend", CashflowType.DIVIDEND),
+            (r"^Buy\b", CashflowType.BUY),
+            (r"^Sell\b", CashflowType.SELL),
+            (r"[Ff]ee", CashflowType.FEE),
+            (r"Interest", CashflowType.INTEREST),
+            (r"Deposit", CashflowType.DEPOSIT),
+            (r"Withdrawal", CashflowType.WITHDRAWAL),
+        ],
+    },
+    "NL": {
+        POSITIONS: _named(
+            POSITIONS,
+            [
+                "Product",
+                "Symbol/ISIN",
+                "Aantal",
+                "Slotkoers",
+                "Lokale waarde",
+                "Waarde in EUR",
+            ],
+        ),
+        CASHFLOWS: _named(
+            CASHFLOWS,
+            [
+                "Datum",
+                "Tijd",
+                "Valutadatum",
+                "Product",
+                "ISIN",
+                "Omschrijving",
+                "FX",
+                "Mutatie",
+                "Saldo",
+                "Order Id",
+            ],
+        ),
+        TRANSACTIONS: _named(
+            TRANSACTIONS,
+            [
+                "Datum",
+                "Tijd",
+                "Product",
+                "ISIN",
+                "Beurs",
+                "Uitvoeringsplaats",
+                "Aantal",
+                "Koers",
+                "Lokale waarde",
+                "Waarde",
+                "Wisselkoers",
+                "Transactiekosten en/of",
+                "Totaal",
+                "Order ID",
+            ],
+        ),
+        DESCRIPTIONS: [
+            (r"^Valuta", CashflowType.FX),
+            (r"Dividendbelasting", CashflowType.DIVIDEND_TAX),
+            (r"Dividend", CashflowType.DIVIDEND),
+            (r"^Verkoop\b", CashflowType.SELL),
+            (r"^Koop\b", CashflowType.BUY),
+            (r"[Kk]osten", CashflowType.FEE),
+            (r"Rente", CashflowType.INTEREST),
+            (r"Terugstorting", CashflowType.WITHDRAWAL),
+            (r"[Ss]torting", CashflowType.DEPOSIT),
+        ],
+    },
+    "DE": {
+        POSITIONS: _named(
+            POSITIONS,
+            [
+                "Produkt",
+                "Symbol/ISIN",
+                "Anzahl",
+                "Schlusskurs",
+                "Wert in Lokalwährung",
+                "Wert in EUR",
+            ],
+        ),
+        CASHFLOWS: _named(
+            CASHFLOWS,
+            [
+                "Datum",
+                "Uhrzeit",
+                "Valutadatum",
+                "Produkt",
+                "ISIN",
+                "Beschreibung",
+                "FX",
+                "Änderung",
+                "Saldo",
+                "Order-ID",
+            ],
+        ),
+        TRANSACTIONS: _named(
+            TRANSACTIONS,
+            [
+                "Datum",
+                "Uhrzeit",
+                "Produkt",
+                "ISIN",
+                "Referenzbörse",
+                "Ausführungsort",
+                "Anzahl",
+                "Kurs",
+                "Wert in Lokalwährung",
+                "Wert",
+                "Wechselkurs",
+                "Transaktionskosten und/oder Fremdkosten",
+                "Gesamt",
+                "Order-ID",
+            ],
+        ),
+        DESCRIPTIONS: [
+            (r"Währungswechsel", CashflowType.FX),
+            (r"Dividendensteuer", CashflowType.DIVIDEND_TAX),
+            (r"Dividende", CashflowType.DIVIDEND),
+            (r"^Verkauf\b", CashflowType.SELL),
+            (r"^Kauf\b", CashflowType.BUY),
+            (r"Gebühr|[Kk]osten", CashflowType.FEE),
+            (r"Zinsen", CashflowType.INTEREST),
+            (r"Einzahlung", CashflowType.DEPOSIT),
+            (r"Auszahlung", CashflowType.WITHDRAWAL),
+        ],
+    },
+}
+
+LOCALE_DEFAULT = "ES"
+
+
+class RenamePlan:
+    """Compiled rename and dtype plan of a report in a locale.
+
+    Build it with compile_plan, which memoises plans.
+
+    Parameters
+    ----------
+    locale : str
+        Key of LOCALES, e.g. "ES".
+    report : {"positions", "cashflows", "transactions"}
+    """
+
+    def __init__(self, locale, report):
+        mapping = {**LOCALES[locale][report], **UNNAMED[report]}
+        dtypes = DTYPES[report]
+
+        self.locale = locale
+        self.report = report
+
+        # Raw to clean names, in the order of the clean columns
+        order = {col: idx for idx, col in enumerate(dtypes)}
+        self.rename = dict(sorted(mapping.items(), key=lambda x: order[x[1]]))
+        # Clean to raw names
+        self.raw = {clean: raw for raw, clean in self.rename.items()}
+        # Raw names to dtype, see degiro_wrapper.core.readers.read_raw
+        self.schema = {raw: dtypes[clean] for raw, clean in self.rename.items()}
+
+        rules = LOCALES[locale].get(DESCRIPTIONS, [])
+        self.rules = [
+            (re.compile(pattern), type_clean) for pattern, type_clean in rules
+        ]
+
+    def __repr__(self):
+        return f"RenamePlan(locale={self.locale!r}, report={self.report!r})"
+
+    def apply(self, raw):
+        """Rename raw columns to clean names.
+
+        Parameters
+        ----------
+        raw : pandas.DataFrame
+
+        Returns
+        -------
+        clean : pandas.DataFrame
+        """
+        return raw.rename(columns=self.rename)
+
+
+@lru_cache(maxsize=None)
+def compile_plan(locale, report):
+    """Get the memoised rename plan of a report in a locale.
+
+    Parameters
+    ----------
+    locale : str
+    report : {"positions", "cashflows", "transactions"}
+
+    Returns
+    -------
+    plan : RenamePlan
+    """
+    if locale not in LOCALES:
+        raise ValueError(f"Unknown locale {locale!r}, use one of {list(LOCALES)}.")
+
+    return RenamePlan(locale, report)
+
+
+def detect_locale(header, report):
+    """Detect the locale of a report from its header.
+
+    Parameters
+    ----------
+    header : list of str
+        Header with pandas names, see degiro_wrapper.core.readers.read_header.
+    report : {"positions", "cashflows", "transactions"}
+
+    Returns
+    -------
+    locale : str
+
+    Raises
+    ------
+    ValueError
+        If no locale has all its columns in the header.
+    """
+    header = set(header)
+    for locale, spec in LOCALES.items():
+        if header.issuperset(spec[report]):
+            return locale
+
+    raise ValueError(f"Unknown {report} header {sorted(header)}.")
+
+
+def register_locale(locale, positions, cashflows, transactions, descriptions=()):
+    """Add or replace a locale.
+
+    Parameters
+    ----------
+    locale : str
+    positions, cashflows, transactions : dict
+        Raw header to clean column, unnamed columns are added automatically.
+    descriptions : list of (str, str), optional
+        Cashflow description pattern to CashflowType value,
+        the first match wins.
+    """
+    LOCALES[locale] = {
+        POSITIONS: dict(positions),
+        CASHFLOWS: dict(cashflows),
+        TRANSACTIONS: dict(transactions),
+        DESCRIPTIONS: list(descriptions),
+    }
+    compile_plan.cache_clear()
@@ -1,7 +1,15 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
 def compute_weights(amounts, isin_cash=None, regex=None):
     """
     Compute positions weights.
 
+    The amounts are divided as an array, without copying the frame.
+
     Parameters
     ----------
     amounts: pd.DataFrame
@@ -14,15 +22,66 @@ def compute_weights(amounts, isin_cash=None, regex=None):
     -------
     pd.DataFrame
     """
-    _amount_df = amounts.copy()
+    columns = amounts.columns
 
     # Apply filters
     if isin_cash is not None:
-        _amount_df = _amount_df.drop(columns=isin_cash)
+        columns = columns.drop(isin_cash)
     if regex is not None:
-        _amount_df = _amount_df.filter(regex=regex)
+        columns = columns[
+            [re.search(regex, str(column)) is not None for column in columns]
+        ]
+
+    values = amounts.to_numpy(dtype=float)
+    if len(columns) < len(amounts.columns):
+        values = values[:, amounts.columns.get_indexer(columns)]
 
     # Compute weights over the remaining assets
-    weights_df = _amount_df.div(_amount_df.sum(axis=1), axis="index")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = values / np.nansum(values, axis=1, keepdims=True)
+
+    weights_df = pd.DataFrame(weights, index=amounts.index, columns=columns)
 
     return weights_df
+
+
+def compute_weights_batch(amounts, membership):
+    """
+    Compute positions weights of many portfolios at once.
+
+    Each member ISIN is one column, so all the portfolios and dates are
+    computed in a single pass. ISINs not held weigh 0.
+
+    Parameters
+    ----------
+    amounts: pd.DataFrame
+        Date x ISIN.
+    membership: pd.DataFrame
+        ISIN x portfolio matrix, 1 if the ISIN belongs to the portfolio,
+        see degiro_wrapper.reporting.utils.build_membership.
+
+    Returns
+    -------
+    pd.DataFrame
+        Date x (portfolio, ISIN), missing without positions in the portfolio.
+    """
+    matrix = membership.reindex(amounts.columns, fill_value=0).to_numpy()
+    isin_idx, portfolio_idx = np.nonzero(matrix)
+
+    # Members by portfolio, then ISIN
+    order = np.lexsort((isin_idx, portfolio_idx))
+    isin_idx, portfolio_idx = isin_idx[order], portfolio_idx[order]
+
+    values = amounts.to_numpy(dtype=float)
+    tna = np.nan_to_num(values) @ matrix
+
+    members = np.nan_to_num(values[:, isin_idx], copy=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = members / tna[:, portfolio_idx]
+
+    columns = pd.MultiIndex.from_arrays(
+        [membership.columns[portfolio_idx], amounts.columns[isin_idx]],
+        names=["portfolio", amounts.columns.name],
+    )
+
+    return pd.DataFrame(weights, index=amounts.index, columns=columns)
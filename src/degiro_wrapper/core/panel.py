@@ -0,0 +1,245 @@
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+from degiro_wrapper.core.model import compute_weights
+
+
+class Panel:
+    """Wide date x ISIN x field panel backed by one contiguous array.
+
+    Fields are exposed as DataFrame views over the array, no data is copied.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Array of shape (dates, ISINs, fields).
+    dates : pandas.DatetimeIndex
+    isins : pandas.Index
+    fields : list of str
+    """
+
+    def __init__(self, values, dates, isins, fields):
+        self.values = values
+        self.dates = pd.DatetimeIndex(dates)
+        self.isins = pd.Index(isins)
+        self.fields = list(fields)
+
+    def __getitem__(self, field):
+        return self.frame(field)
+
+    def __contains__(self, field):
+        return field in self.fields
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def frame(self, field):
+        """Get field as a date/ISIN DataFrame, a view over the panel array.
+
+        Parameters
+        ----------
+        field : str
+
+        Returns
+        -------
+        frame : pandas.DataFrame
+        """
+        idx = self.fields.index(field)
+        frame = pd.DataFrame(
+            self.values[:, :, idx],
+            index=self.dates,
+            columns=self.isins,
+            copy=False,
+        )
+        frame.index.name = self.dates.name
+        frame.columns.name = self.isins.name
+        return frame
+
+    def reindex(self, dates):
+        """Align panel to a new date index, missing dates are NaN.
+
+        Parameters
+        ----------
+        dates : pandas.DatetimeIndex
+
+        Returns
+        -------
+        panel : Panel
+        """
+        dates = pd.DatetimeIndex(dates, name=self.dates.name)
+        indexer = self.dates.get_indexer(dates)
+        found = indexer >= 0
+
+        values = np.full((len(dates),) + self.shape[1:], np.nan)
+        values[found] = self.values[indexer[found]]
+
+        return Panel(values, dates=dates, isins=self.isins, fields=self.fields)
+
+    def asfreq(self, freq):
+        """Put all fields on a calendar at once, see pandas.DataFrame.asfreq.
+
+        Parameters
+        ----------
+        freq : str
+            E.g. "B" for business days.
+
+        Returns
+        -------
+        panel : Panel
+        """
+        if self.dates.empty:
+            return self
+
+        calendar = pd.date_range(self.dates[0], self.dates[-1], freq=freq)
+
+        return self.reindex(calendar)
+
+
+def _factorize(values):
+    """Sorted factorize, keeping missing values as the first label."""
+    codes, uniques = pd.factorize(values, sort=True)
+
+    missing = codes < 0
+    if missing.any():
+        codes = codes + 1
+        uniques = uniques.insert(0, np.nan)
+
+    return codes, uniques
+
+
+def build_panel(long, index, columns, values):
+    """Build a panel from a long DataFrame in a single pass.
+
+    Equivalent to one pandas.DataFrame.pivot per field,
+    but all fields are scattered into a single array at once.
+
+    Parameters
+    ----------
+    long : pandas.DataFrame
+    index : str
+        Date column, e.g. "date".
+    columns : str
+        Asset column, e.g. "ISIN".
+    values : list of str
+        Fields of the panel.
+
+    Returns
+    -------
+    panel : Panel
+
+    Raises
+    ------
+    ValueError
+        If there are duplicated (index, columns) pairs.
+    """
+    date_codes, dates = _factorize(long[index])
+    isin_codes, isins = _factorize(long[columns])
+
+    n_dates = len(dates)
+    n_isins = len(isins)
+
+    flat = date_codes * n_isins + isin_codes
+    if len(np.unique(flat)) != len(flat):
+        raise ValueError("Index contains duplicate entries, cannot reshape")
+
+    fields = list(values)
+
+    panel = np.full((n_dates, n_isins, len(fields)), np.nan)
+    panel[date_codes, isin_codes] = long[values].to_numpy(dtype=float)
+
+    dates = pd.DatetimeIndex(dates, name=index)
+    isins = pd.Index(isins, name=columns)
+
+    return Panel(panel, dates=dates, isins=isins, fields=fields)
+
+
+class PositionsPanel:
+    """Lazily evaluated position panels.
+
+    Each field is computed on first access and memoised,
+    so callers only pay for the fields they use.
+
+    Parameters
+    ----------
+    raw_positions : pandas.DataFrame
+        Long positions with "date", "ISIN", "amount", "price" and "shares".
+    freq : str, optional
+        Calendar of the panels, by default "B" (business days).
+    isin_cash : str, optional
+        Cash position, excluded from the weights.
+    regex : str, optional
+        Filter of the weights columns, see compute_weights.
+    """
+
+    def __init__(self, raw_positions, freq="B", isin_cash=None, regex=None):
+        self.raw_positions = raw_positions
+        self.freq = freq
+        self.isin_cash = isin_cash
+        self.regex = regex
+
+    @cached_property
+    def _panel(self):
+        """Raw fields on the dates of the positions."""
+        return build_panel(
+            self.raw_positions,
+            index="date",
+            columns="ISIN",
+            values=["amount", "price", "shares"],
+        )
+
+    @cached_property
+    def _panel_calendar(self):
+        """Raw fields on the calendar, aligned at once."""
+        return self._panel.asfreq(self.freq)
+
+    @cached_property
+    def _nav(self):
+        """NAV on the dates of the positions."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nav = self._panel["amount"] / self._panel["shares"]
+        return nav.dropna(axis=1, how="all")
+
+    @property
+    def calendar(self):
+        return self._panel_calendar.dates
+
+    @property
+    def amount(self):
+        """Position size."""
+        return self._panel_calendar["amount"]
+
+    @property
+    def prices(self):
+        """Close price."""
+        return self._panel_calendar["price"]
+
+    @property
+    def shares(self):
+        """Number of participations."""
+        return self._panel_calendar["shares"]
+
+    @cached_property
+    def nav(self):
+        """Net Assets Value, position / shares value."""
+        return self._nav.reindex(self.calendar)
+
+    @cached_property
+    def returns(self):
+        """NAV returns, computed before aligning to the calendar."""
+        return self._nav.pct_change(limit=1).reindex(self.calendar)
+
+    @cached_property
+    def weights(self):
+        """Position weights, see degiro_wrapper.core.model.compute_weights."""
+        return compute_weights(
+            self.amount,
+            isin_cash=self.isin_cash,
+            regex=self.regex,
+        )
+
+    @cached_property
+    def tna(self):
+        """Total net assets, missing on dates without positions."""
+        return self.amount.sum(axis=1, min_count=1)
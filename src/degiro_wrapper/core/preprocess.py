@@ -12,9 +12,34 @@ from degiro_wrapper.conventions import (
     Transactions,
     TransactionsRaw,
 )
+from degiro_wrapper.core.locales import (
+    CASHFLOWS,
+    LOCALE_DEFAULT,
+    POSITIONS,
+    TRANSACTIONS,
+    compile_plan,
+    detect_locale,
+)
+from degiro_wrapper.core.panel import PositionsPanel
+from degiro_wrapper.core.readers import (
+    read_cashflows_db,
+    read_cashflows_raw,
+    read_header,
+    read_raw,
+)
+from degiro_wrapper.core.utils import combine_date_time, parse_dates
 from pandas.errors import EmptyDataError
 from tqdm import tqdm
 
+# Bump when the cleaning of raw files changes, it invalidates cached files.
+PARSER_VERSION = "2"
+
+# Number of rows per chunk when streaming large raw files.
+CHUNKSIZE = 50_000
+
+# Cleaning backends, see degiro_wrapper.core.preprocess_polars.
+BACKENDS = ["pandas", "polars"]
+
 
 def extract_numbers(frame):
     """Extract numbers from string.
@@ -55,101 +80,237 @@ def replace_values(frame, old, new):
     return frame
 
 
-def clean_positions(path):
+def classify_description(description, locale=LOCALE_DEFAULT):
+    """Classify a single cashflow description.
+
+    Parameters
+    ----------
+    description : str
+    locale : str, optional
+        Description patterns, see degiro_wrapper.core.locales.LOCALES.
+
+    Returns
+    -------
+    type : str or None
+        CashflowType value, None if no pattern matches.
+    """
+    for rx, type_clean in compile_plan(locale, CASHFLOWS).rules:
+        if rx.search(description):
+            return type_clean
+    return None
+
+
+def classify_cashflows(descriptions, locale=LOCALE_DEFAULT):
+    """Classify cashflow descriptions into CashflowType values.
+
+    Each unique description is classified once
+    and the result is broadcast to all the rows.
+
+    Parameters
+    ----------
+    descriptions : pandas.Series
+    locale : str, optional
+
+    Returns
+    -------
+    types : pandas.Series
+        Missing where no pattern matches.
+    """
+    codes, uniques = pd.factorize(descriptions)
+
+    types_unique = [classify_description(str(value), locale) for value in uniques]
+    # Last slot for missing descriptions (code -1)
+    types_unique = np.array(types_unique + [None], dtype=object)
+
+    types = pd.Series(
+        types_unique[codes],
+        index=descriptions.index,
+        name=descriptions.name,
+    )
+
+    return types
+
+
+def clean_positions_file(file, engine="c", locale=LOCALE_DEFAULT):
+    """Clean a single raw CSV positions file.
+
+    The valuation date is not added, it only depends on the file name.
+
+    Parameters
+    ----------
+    file : Path-like object
+    engine : {"c", "pyarrow"}, optional
+        CSV parser engine, by default "c".
+    locale : str, optional
+        Header language, see degiro_wrapper.core.locales.LOCALES.
+
+    Returns
+    -------
+    positions_day : pandas.DataFrame or None
+        None if the file is empty.
+    """
+    plan = compile_plan(locale, POSITIONS)
+
+    # -------------------------------------------------------------------------
+    # Read file
+    try:
+        positions_day = read_raw(file, schema=plan.schema, engine=engine)
+    except EmptyDataError:
+        return None
+
+    positions_day = plan.apply(positions_day)
+
+    # -------------------------------------------------------------------------
+    # Replace commas with dots
+    columns_to_clean = [
+        Positions.PRICE,
+        Positions.VALUE_PORTFOLIO,
+        Positions.VALUE_LOCAL,
+    ]
+    positions_day[columns_to_clean] = replace_values(
+        frame=positions_day[columns_to_clean],
+        old=",",
+        new=".",
+    )
+
+    # -------------------------------------------------------------------------
+    # Extract numerical values
+    columns_to_extract = [
+        Positions.VALUE_PORTFOLIO,
+        Positions.VALUE_LOCAL,
+    ]
+    positions_day[columns_to_extract] = extract_numbers(
+        positions_day[columns_to_extract]
+    )
+
+    # -------------------------------------------------------------------------
+    # Convert to float and string
+    columns_to_float = [
+        Positions.SHARES,
+        Positions.PRICE,
+        Positions.VALUE_PORTFOLIO,
+        Positions.VALUE_LOCAL,
+    ]
+    positions_day[columns_to_float] = positions_day[columns_to_float].astype(float)
+
+    columns_to_string = [Positions.ISIN, Positions.NAME]
+    positions_day = positions_day.fillna("-")
+    positions_day[columns_to_string] = positions_day[columns_to_string].astype(str)
+    positions_day = positions_day.replace("-", np.nan)
+
+    return positions_day
+
+
+def _detect_locale_files(files, report):
+    """Detect the locale from the first file with a header."""
+    for file in files:
+        header = read_header(file)
+        if header:
+            return detect_locale(header, report)
+
+    return LOCALE_DEFAULT
+
+
+def cache_keys_positions(path, cache, engine="c", locale=None):
+    """Cache keys of the raw positions files of a folder.
+
+    The keys are computed once and can be shared by validation and cleaning.
+
+    Parameters
+    ----------
+    path : Path-like object
+    cache : degiro_wrapper.core.cache.ParsedFileCache
+    engine : {"c", "pyarrow"}, optional
+    locale : str, optional
+        By default it is detected from the first file, as in clean_positions.
+
+    Returns
+    -------
+    keys : dict
+        Cache key of each file.
+    """
+    files = list(path.glob("pos*.csv"))
+    if locale is None:
+        locale = _detect_locale_files(files, POSITIONS)
+
+    keys = {file: cache.key(file, engine=engine, locale=locale) for file in files}
+
+    return keys
+
+
+def clean_positions(path, engine="c", cache=None, locale=None, keys=None):
     """Create long DataFrame from raw CSV positions.
 
     Parameters
     ----------
     path : Path-like object
+    engine : {"c", "pyarrow"}, optional
+        CSV parser engine, by default "c".
+    cache : degiro_wrapper.core.cache.ParsedFileCache, optional
+        Cache of cleaned files, see PARSER_VERSION.
+    locale : str, optional
+        Header language, see degiro_wrapper.core.locales.LOCALES.
+        By default it is detected from the first file.
+    keys : dict, optional
+        Cache key of each file, see cache_keys_positions.
+        By default computed from the files.
 
     Returns
     -------
     long : pandas.DataFrame
     """
     columnas = [
-        PositionsRaw.PRICE,
-        PositionsRaw.PRODUCT,
-        PositionsRaw.ISIN,
-        PositionsRaw.QUANTITY,
-        PositionsRaw.VALUE_LOCAL,
-        PositionsRaw.VALUE_EUR,
+        Positions.PRICE,
+        Positions.NAME,
+        Positions.ISIN,
+        Positions.SHARES,
+        Positions.VALUE_LOCAL,
+        Positions.VALUE_PORTFOLIO,
     ]
 
-    long = pd.DataFrame(columns=columnas)
+    frames = [pd.DataFrame(columns=columnas)]
 
     files = list(path.glob("pos*.csv"))
-    for file in tqdm(files):
+    if locale is None:
+        locale = _detect_locale_files(files, POSITIONS)
 
-        # ---------------------------------------------------------------------
-        # Read file
-        try:
-            positions_day = pd.read_csv(file)
-        except EmptyDataError:
-            continue
+    if cache is not None and keys is None:
+        keys = cache_keys_positions(path, cache, engine=engine, locale=locale)
 
-        # ---------------------------------------------------------------------
-        # Replace commas with dots
-        columns_to_clean = [
-            PositionsRaw.PRICE,
-            PositionsRaw.VALUE_EUR,
-            PositionsRaw.VALUE_LOCAL,
-        ]
-        positions_day[columns_to_clean] = replace_values(
-            frame=positions_day[columns_to_clean],
-            old=",",
-            new=".",
-        )
-
-        # ---------------------------------------------------------------------
-        # Extract numerical values
-        columns_to_extract = [
-            PositionsRaw.VALUE_EUR,
-            PositionsRaw.VALUE_LOCAL,
-        ]
-        positions_day[columns_to_extract] = extract_numbers(
-            positions_day[columns_to_extract]
-        )
+    for file in tqdm(files):
 
         # ---------------------------------------------------------------------
-        # Convert to float and string
-        columns_to_float = [
-            PositionsRaw.QUANTITY,
-            PositionsRaw.PRICE,
-            PositionsRaw.VALUE_EUR,
-            PositionsRaw.VALUE_LOCAL,
-        ]
-        positions_day[columns_to_float] = positions_day[columns_to_float].astype(float)
-
-        columns_to_string = [PositionsRaw.ISIN, PositionsRaw.PRODUCT]
-        positions_day = positions_day.fillna("-")
-        positions_day[columns_to_string] = positions_day[columns_to_string].astype(str)
-        positions_day = positions_day.replace("-", np.nan)
+        # Clean file, or get it from the cache
+        if cache is None:
+            positions_day = clean_positions_file(file, engine=engine, locale=locale)
+        else:
+            key = keys[file]
+            positions_day = cache.get(key)
+            if positions_day is None:
+                positions_day = clean_positions_file(file, engine=engine, locale=locale)
+                if positions_day is not None:
+                    cache.set(key, positions_day)
+
+        if positions_day is None:
+            continue
 
         # ---------------------------------------------------------------------
         # Add valuation date
         date = file.stem.split("_")[-1]
         positions_day[Positions.DATE] = date
 
-        # ---------------------------------------------------------------------
-        # Append to dataframe
-        long = pd.concat([long, positions_day], axis=0)
+        frames.append(positions_day)
 
     # -------------------------------------------------------------------------
-    # Convert dates to Datetime
-    long[Positions.DATE] = pd.to_datetime(long[Positions.DATE])
+    # Concatenate all days at once
+    long = pd.concat(frames, axis=0)
 
     # -------------------------------------------------------------------------
-    # Rename columns to structured names
-    map_columnas = {
-        PositionsRaw.PRODUCT: Positions.NAME,
-        PositionsRaw.ISIN: Positions.ISIN,
-        PositionsRaw.QUANTITY: Positions.SHARES,
-        PositionsRaw.PRICE: Positions.PRICE,
-        PositionsRaw.VALUE_LOCAL: Positions.VALUE_LOCAL,
-        PositionsRaw.VALUE_EUR: Positions.VALUE_PORTFOLIO,
-    }
-
-    long = long.rename(columns=map_columnas)
+    # Convert dates to Datetime
+    long[Positions.DATE] = parse_dates(
+        long[Positions.DATE],
+        format=PositionsRaw.DATE_FORMAT,
+    )
 
     # -------------------------------------------------------------------------
     # Add position type
@@ -166,33 +327,20 @@ def clean_positions(path):
     return long
 
 
-def clean_cashflows(raw):
+def clean_cashflows(raw, locale=LOCALE_DEFAULT):
     """Clean cashflows file.
 
     Parameters
     ----------
     raw : pandas.DataFrame
+    locale : str, optional
+        Header language, see degiro_wrapper.core.locales.LOCALES.
 
     Returns
     -------
     clean : pandas.DataFrame
     """
-
-    clean = raw.rename(
-        columns={
-            CashflowsRaw.DELTA: Cashflows.DELTA_CCY,
-            CashflowsRaw.UNNAMED_DELTA: Cashflows.DELTA,
-            CashflowsRaw.AMOUNT: Cashflows.AMOUNT_CCY,
-            CashflowsRaw.UNNAMED_AMOUNT: Cashflows.AMOUNT,
-            CashflowsRaw.DATE_VALUE: Cashflows.DATE_VALUE,
-            CashflowsRaw.DATE: Cashflows.DATE,
-            CashflowsRaw.TIME: Cashflows.TIME,
-            CashflowsRaw.PRODUCT: Positions.NAME,
-            CashflowsRaw.TYPE: Cashflows.TYPE,
-            CashflowsRaw.ID: Cashflows.ID,
-            CashflowsRaw.DESCRIPTION: Cashflows.DESCRIPTION,
-        }
-    )
+    clean = compile_plan(locale, CASHFLOWS).apply(raw)
 
     # -------------------------------------------------------------------------
     # Convert to float
@@ -203,71 +351,89 @@ def clean_cashflows(raw):
     # -------------------------------------------------------------------------
     # Convert to date
     columns_date = [Cashflows.DATE, Cashflows.DATE_VALUE]
-    for col in columns_date:
-        clean[col] = pd.to_datetime(
-            clean[col],
-            dayfirst=True,
-            errors="coerce",
-            format="%d-%m-%Y",
-        )
+    clean[columns_date] = parse_dates(
+        clean[columns_date],
+        errors="coerce",
+        format=CashflowsRaw.DATE_FORMAT,
+    )
 
     # -------------------------------------------------------------------------
-    # Find buy and sell CFs
-    type_pairs = [
-        (CashflowType.RAW_COMPRA, CashflowType.BUY),
-        (CashflowType.RAW_VENTA, CashflowType.SELL),
-    ]
-    for type_raw, type_clean in type_pairs:
-        mask = clean[Cashflows.DESCRIPTION].str.contains(type_raw)
-        clean.loc[mask, Cashflows.TYPE] = type_clean
+    # Classify CFs, unknown descriptions keep the original type
+    types = classify_cashflows(clean[Cashflows.DESCRIPTION], locale=locale)
+    mask = types.notna()
+    clean.loc[mask, Cashflows.TYPE] = types[mask]
 
     return clean
 
 
-def clean_transactions(raw):
+def clean_cashflows_chunked(path, path_to, chunksize=CHUNKSIZE, locale=None):
+    """Clean raw cashflows file by chunks, appending them to the output.
+
+    Memory usage is bounded by the chunk size, not by the file size.
+    The explicit schema of the raw file keeps the dtypes equal among chunks.
+
+    Parameters
+    ----------
+    path : Path-like
+        Raw cashflows CSV file.
+    path_to : Path-like
+        Clean cashflows CSV file, overwritten if it exists.
+    chunksize : int, optional
+        Number of rows per chunk.
+    locale : str, optional
+        Header language, by default detected from the header.
+
+    Returns
+    -------
+    path_to : Path-like
+    """
+    if locale is None:
+        locale = _detect_locale_files([path], CASHFLOWS)
+
+    chunks = read_cashflows_raw(path, chunksize=chunksize, locale=locale)
+    for idx, raw in enumerate(chunks):
+        clean = clean_cashflows(raw, locale=locale)
+
+        first = idx == 0
+        clean.to_csv(
+            path_to,
+            mode="w" if first else "a",
+            header=first,
+            index=False,
+        )
+
+    return path_to
+
+
+def clean_transactions(raw, locale=LOCALE_DEFAULT):
     """Clean transactions file.
 
     Parameters
     ----------
     raw : pandas.DataFrame
+    locale : str, optional
+        Header language, see degiro_wrapper.core.locales.LOCALES.
 
     Returns
     -------
     clean : pandas.DataFrame
     """
-
-    clean = raw.rename(
-        columns={
-            TransactionsRaw.EXCHANGE: Transactions.EXCHANGE,
-            TransactionsRaw.EXECUTION: Transactions.EXECUTION,
-            TransactionsRaw.RATE: Transactions.RATE,
-            TransactionsRaw.PRICE: Transactions.PRICE,
-            TransactionsRaw.UNNAMED_PRICE: Transactions.PRICE_CCY,
-            TransactionsRaw.VALUE_LOCAL: Transactions.VALUE_LOCAL,
-            TransactionsRaw.UNNAMED_VALUE_LOCAL: Transactions.VALUE_LOCAL_CCY,
-            TransactionsRaw.VALUE: Transactions.VALUE_PORTFOLIO,
-            TransactionsRaw.UNNAMED_VALUE: Transactions.VALUE_CCY,
-            TransactionsRaw.TRANSACTION_COSTS: Transactions.TRANSACTION_COSTS,
-            TransactionsRaw.UNNAMED_COSTS: Transactions.TRANSACTION_COSTS_CCY,
-            TransactionsRaw.TOTAL: Transactions.TOTAL,
-            TransactionsRaw.UNNAMED_TOTAL: Transactions.TOTAL_CCY,
-            TransactionsRaw.DATE: Transactions.DATE,
-            TransactionsRaw.TIME: Transactions.TIME,
-            TransactionsRaw.PRODUCT: Positions.NAME,
-            TransactionsRaw.TYPE: Transactions.TYPE,
-            TransactionsRaw.ID: Transactions.ID,
-            TransactionsRaw.SHARES: Transactions.SHARES,
-            TransactionsRaw.ISIN: Transactions.ISIN,
-        }
-    )
+    clean = compile_plan(locale, TRANSACTIONS).apply(raw)
 
     # -------------------------------------------------------------------------
     # Convert to date
-    clean[Transactions.DATE] = pd.to_datetime(
+    clean[Transactions.DATE] = parse_dates(
         clean[Transactions.DATE],
-        dayfirst=True,
         errors="coerce",
-        format="%d-%m-%Y",
+        format=TransactionsRaw.DATE_FORMAT,
+    )
+
+    # -------------------------------------------------------------------------
+    # Combine date and time
+    clean[Transactions.TIMESTAMP] = combine_date_time(
+        clean[Transactions.DATE],
+        clean[Transactions.TIME],
+        format=TransactionsRaw.TIME_FORMAT,
     )
 
     return clean
@@ -293,34 +459,28 @@ def positions_raw_to_clean(raw_positions):
     Notes
     -----
     It does not contain the returns of the cash position.
+    Use degiro_wrapper.core.panel.PositionsPanel to compute only some fields.
     """
-    amount_df = raw_positions.pivot(index="date", columns="ISIN", values="amount")
-    prices_df = raw_positions.pivot(index="date", columns="ISIN", values="price")
-    shares_df = raw_positions.pivot(index="date", columns="ISIN", values="shares")
-
-    # Compute share-adjusted values
-    nav_df = (amount_df / shares_df).dropna(axis=1, how="all")
+    panel = PositionsPanel(raw_positions)
 
-    # Compute daily returns
-    returns_df = nav_df.pct_change(limit=1)
-
-    # Put on a business day basis
-    amount_df = amount_df.asfreq("B")
-    prices_df = prices_df.asfreq("B")
-    shares_df = shares_df.asfreq("B")
-    nav_df = nav_df.asfreq("B")
-    returns_df = returns_df.asfreq("B")
+    amount_df = panel.amount
+    prices_df = panel.prices
+    shares_df = panel.shares
+    nav_df = panel.nav
+    returns_df = panel.returns
 
     return amount_df, prices_df, shares_df, nav_df, returns_df
 
 
-def generate_cashflows(path_account, isin_cash):
+def generate_cashflows(cashflows, isin_cash):
     """
     Generate positions and cash flows.
 
     Parameters
     ----------
-    path_account: Path-like to folder
+    cashflows: pandas.DataFrame or Path-like
+        Clean cashflows, or path to the cashflows database
+        created by `degiro create-db-cashflows` (CSV or columnar).
 
     isin_cash: str
 
@@ -329,36 +489,24 @@ def generate_cashflows(path_account, isin_cash):
     tuple
         cashflows_df, cashflows_external_df
     """
-    # Read and parse
-    df_account = pd.read_excel(path_account)
-    df_account = df_account.rename(
-        columns={
-            "Variación": "ccyDelta",
-            "Unnamed: 8": "delta",
-            "Saldo": "ccyAmount",
-            "Unnamed: 10": "amount",
-            "Fecha valor": "date",
-        }
-    )
-
-    df_account["date"] = pd.to_datetime(df_account["date"], dayfirst=True)
-    df_account = df_account.drop(
-        columns=["Fecha", "Hora", "Producto", "Tipo", "ID Orden"]
-    )
+    if not isinstance(cashflows, pd.DataFrame):
+        cashflows = read_cashflows_db(cashflows)
 
-    # Generate changes in position
-    deltas_df = df_account.groupby(["date", "ISIN", "amount"])["delta"].sum()
-    deltas_df = pd.DataFrame(deltas_df).reset_index()
-
-    # Compute cashflows
+    # Compute cashflows, changes in position on their value date
+    deltas_df = cashflows.dropna(subset=[Cashflows.AMOUNT])
     cashflows_df = deltas_df.pivot_table(
-        index="date", columns="ISIN", values="delta", aggfunc="sum"
+        index=Cashflows.DATE_VALUE,
+        columns=Cashflows.ISIN,
+        values=Cashflows.DELTA,
+        aggfunc="sum",
     )
+    cashflows_df.index.name = Cashflows.DATE
 
     # Compute external cashflows
-    cashflows_external_df = df_account.loc[
-        df_account["Descripción"].isin(["Ingreso", "Retirada"])
-    ]
+    mask_external = cashflows[Cashflows.TYPE].isin(
+        [CashflowType.DEPOSIT, CashflowType.WITHDRAWAL]
+    )
+    cashflows_external_df = cashflows.loc[mask_external]
 
     # For some reason DEGIRO has the cashflows mark to market shifted by one.
     # and my guess is that unless there is a position transaction, they dont
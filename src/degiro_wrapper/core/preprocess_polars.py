@@ -0,0 +1,241 @@
+"""Polars backend of degiro_wrapper.core.preprocess.
+
+Raw files are scanned lazily and cleaned with multithreaded Polars queries.
+The outputs have the same columns and dtypes as the pandas backend and are
+returned as pandas DataFrames. Polars is an optional dependency, it is only
+imported when these functions are called.
+"""
+
+from datetime import datetime, time
+
+from degiro_wrapper.conventions import (
+    AssetType,
+    Cashflows,
+    CashflowsRaw,
+    Positions,
+    PositionsRaw,
+    Transactions,
+    TransactionsRaw,
+)
+from degiro_wrapper.core.locales import (
+    CASHFLOWS,
+    LOCALE_DEFAULT,
+    POSITIONS,
+    TRANSACTIONS,
+    compile_plan,
+    detect_locale,
+)
+from degiro_wrapper.core.preprocess import classify_description
+from degiro_wrapper.core.readers import read_header
+
+# First number of a string, see degiro_wrapper.core.preprocess.extract_numbers
+PATTERN_NUMBER = r"([-+]?(?:\d*\.\d+|\d+\.?)(?:[Ee][+-]?\d+)?)"
+
+
+def _import_polars():
+    try:
+        import polars as pl
+    except ImportError as error:
+        raise ImportError(
+            "The polars backend needs polars installed, "
+            "e.g. pip install degiro-wrapper[polars]."
+        ) from error
+
+    return pl
+
+
+def _scan_raw(pl, path, header, plan):
+    """Lazily read the plan columns of a raw file, renamed to clean names."""
+    dtypes = {"float64": pl.Float64, "object": pl.Utf8}
+
+    frame = pl.scan_csv(
+        path,
+        new_columns=header,
+        infer_schema_length=0,
+        quote_char='"',
+    )
+
+    return frame.select(
+        [
+            pl.col(raw).cast(dtypes[plan.schema[raw]]).alias(clean)
+            for raw, clean in plan.rename.items()
+        ]
+    )
+
+
+def _to_float(pl, column, extract=False):
+    """Decimal comma strings to float, "-" is missing."""
+    values = pl.col(column).str.replace_all(",", ".")
+    if extract:
+        values = values.str.extract(PATTERN_NUMBER, 1)
+    values = pl.when(values == "-").then(None).otherwise(values)
+
+    return values.cast(pl.Float64).alias(column)
+
+
+def _to_string(pl, column):
+    """Strings where "-" is missing."""
+    values = pl.col(column)
+    return pl.when(values == "-").then(None).otherwise(values).alias(column)
+
+
+def _to_date(pl, column, format):
+    return pl.col(column).str.strptime(pl.Datetime("ns"), format, strict=False)
+
+
+def _locale(path, report, locale):
+    header = read_header(path)
+    if locale is None:
+        locale = detect_locale(header, report) if header else LOCALE_DEFAULT
+
+    return header, compile_plan(locale, report)
+
+
+def clean_positions(path, locale=None):
+    """Create long DataFrame from raw CSV positions, see preprocess.
+
+    All the files are scanned lazily and cleaned in a single query.
+
+    Parameters
+    ----------
+    path : Path-like object
+    locale : str, optional
+        Header language, by default detected from the first file.
+
+    Returns
+    -------
+    long : pandas.DataFrame
+    """
+    pl = _import_polars()
+
+    columnas = [
+        Positions.PRICE,
+        Positions.NAME,
+        Positions.ISIN,
+        Positions.SHARES,
+        Positions.VALUE_LOCAL,
+        Positions.VALUE_PORTFOLIO,
+    ]
+
+    frames = []
+    for file in path.glob("pos*.csv"):
+        header = read_header(file)
+        if not header:
+            continue
+
+        if locale is None:
+            locale = detect_locale(header, POSITIONS)
+        plan = compile_plan(locale, POSITIONS)
+
+        date = datetime.strptime(file.stem.split("_")[-1], PositionsRaw.DATE_FORMAT)
+
+        frame = _scan_raw(pl, file, header, plan).select(columnas)
+        frame = frame.with_columns(
+            pl.lit(date, dtype=pl.Datetime("ns")).alias(Positions.DATE)
+        )
+        frames.append(frame)
+
+    if not frames:
+        schema = {col: pl.Float64 for col in columnas}
+        schema.update({Positions.NAME: pl.Utf8, Positions.ISIN: pl.Utf8})
+        schema.update({Positions.DATE: pl.Datetime("ns"), Positions.TYPE: pl.Utf8})
+        return pl.DataFrame(schema=schema).to_pandas()
+
+    long = pl.concat(frames, how="vertical")
+
+    long = long.with_columns(
+        _to_float(pl, Positions.PRICE),
+        _to_float(pl, Positions.VALUE_LOCAL, extract=True),
+        _to_float(pl, Positions.VALUE_PORTFOLIO, extract=True),
+        _to_string(pl, Positions.NAME),
+        _to_string(pl, Positions.ISIN),
+    )
+
+    long = long.with_columns(
+        pl.when(pl.col(Positions.ISIN).is_not_null())
+        .then(pl.lit(AssetType.ASSET))
+        .otherwise(pl.lit(AssetType.CASH))
+        .alias(Positions.TYPE)
+    )
+
+    long = long.sort(Positions.DATE, maintain_order=True)
+
+    return long.collect().to_pandas()
+
+
+def clean_cashflows(path, locale=None):
+    """Clean raw cashflows file, see preprocess.clean_cashflows.
+
+    Parameters
+    ----------
+    path : Path-like
+        Raw cashflows CSV file.
+    locale : str, optional
+        Header language, by default detected from the header.
+
+    Returns
+    -------
+    clean : pandas.DataFrame
+    """
+    pl = _import_polars()
+
+    header, plan = _locale(path, CASHFLOWS, locale)
+
+    clean = _scan_raw(pl, path, header, plan).with_columns(
+        _to_float(pl, Cashflows.DELTA),
+        _to_float(pl, Cashflows.AMOUNT),
+        _to_date(pl, Cashflows.DATE, CashflowsRaw.DATE_FORMAT),
+        _to_date(pl, Cashflows.DATE_VALUE, CashflowsRaw.DATE_FORMAT),
+    )
+    clean = clean.collect()
+
+    # -------------------------------------------------------------------------
+    # Classify CFs once per unique description
+    descriptions = clean[Cashflows.DESCRIPTION].drop_nulls().unique().to_list()
+    types = {
+        description: classify_description(description, plan.locale)
+        for description in descriptions
+    }
+    types = {key: value for key, value in types.items() if value is not None}
+
+    clean = clean.with_columns(
+        pl.col(Cashflows.DESCRIPTION)
+        .replace_strict(types, default=pl.col(Cashflows.TYPE), return_dtype=pl.Utf8)
+        .alias(Cashflows.TYPE)
+    )
+
+    return clean.to_pandas()
+
+
+def clean_transactions(path, locale=None):
+    """Clean raw transactions file, see preprocess.clean_transactions.
+
+    Parameters
+    ----------
+    path : Path-like
+        Raw transactions CSV file.
+    locale : str, optional
+        Header language, by default detected from the header.
+
+    Returns
+    -------
+    clean : pandas.DataFrame
+    """
+    pl = _import_polars()
+
+    header, plan = _locale(path, TRANSACTIONS, locale)
+
+    times = pl.col(Transactions.TIME).str.strptime(
+        pl.Time, TransactionsRaw.TIME_FORMAT, strict=False
+    )
+
+    clean = _scan_raw(pl, path, header, plan).with_columns(
+        _to_date(pl, Transactions.DATE, TransactionsRaw.DATE_FORMAT),
+    )
+    clean = clean.with_columns(
+        pl.col(Transactions.DATE)
+        .dt.combine(times.fill_null(time(0)), time_unit="ns")
+        .alias(Transactions.TIMESTAMP)
+    )
+
+    return clean.collect().to_pandas()
@@ -0,0 +1,187 @@
+import csv
+
+import pandas as pd
+from degiro_wrapper.conventions import Cashflows
+from degiro_wrapper.core.interchange import import_pyarrow, read_db
+from degiro_wrapper.core.locales import (
+    CASHFLOWS,
+    LOCALE_DEFAULT,
+    POSITIONS,
+    TRANSACTIONS,
+    compile_plan,
+)
+
+ENGINES = ["c", "pyarrow"]
+
+# Explicit schemas of the raw reports in the default locale: only the listed
+# columns are read and no type inference is run, see
+# degiro_wrapper.core.locales. Dates are kept as strings, their format lives
+# in the conventions (DATE_FORMAT).
+SCHEMA_POSITIONS = compile_plan(LOCALE_DEFAULT, POSITIONS).schema
+SCHEMA_CASHFLOWS = compile_plan(LOCALE_DEFAULT, CASHFLOWS).schema
+SCHEMA_TRANSACTIONS = compile_plan(LOCALE_DEFAULT, TRANSACTIONS).schema
+
+
+def read_header(path):
+    """Read the header of a CSV file with pandas column names.
+
+    Empty names are mangled the way pandas does, e.g. "Unnamed: 8".
+
+    Parameters
+    ----------
+    path : Path-like
+
+    Returns
+    -------
+    header : list of str
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        names = next(csv.reader(file), [])
+
+    header = [name or f"Unnamed: {idx}" for idx, name in enumerate(names)]
+
+    return header
+
+
+def read_raw(path, schema, engine="c", **kwargs):
+    """Read raw Degiro CSV report with an explicit schema.
+
+    Parameters
+    ----------
+    path : Path-like
+    schema : dict
+        Column name to dtype, only these columns are read.
+    engine : {"c", "pyarrow"}, optional
+        Parser engine, by default "c".
+        The "pyarrow" engine is multithreaded but requires pyarrow.
+    **kwargs
+        Passed to pandas.read_csv, only used by the "c" engine.
+
+    Returns
+    -------
+    raw : pandas.DataFrame
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, use one of {ENGINES}.")
+
+    if engine == "pyarrow":
+        if kwargs:
+            raise ValueError(f"Options {list(kwargs)} need the 'c' engine.")
+        return _read_raw_pyarrow(path, schema)
+
+    raw = pd.read_csv(
+        path,
+        usecols=list(schema),
+        dtype=schema,
+        engine=engine,
+        **kwargs,
+    )
+
+    return raw
+
+
+def _read_raw_pyarrow(path, schema):
+    """Read raw CSV report with the multithreaded pyarrow reader.
+
+    pyarrow does not name empty headers as pandas does,
+    so the header is read beforehand and passed explicitly.
+    """
+    pa = import_pyarrow()
+    from pyarrow import csv as pa_csv
+
+    header = read_header(path)
+    if not header:
+        raise pd.errors.EmptyDataError("No columns to parse from file")
+
+    types = {
+        column: pa.float64() if dtype == "float64" else pa.string()
+        for column, dtype in schema.items()
+    }
+
+    table = pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(column_names=header, skip_rows=1),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(schema),
+            column_types=types,
+            strings_can_be_null=True,
+        ),
+    )
+
+    return table.to_pandas()
+
+
+def read_positions_raw(path, engine="c", locale=LOCALE_DEFAULT):
+    """Read raw positions CSV file.
+
+    Parameters
+    ----------
+    path : Path-like
+    engine : {"c", "pyarrow"}, optional
+    locale : str, optional
+        See degiro_wrapper.core.locales.LOCALES.
+
+    Returns
+    -------
+    raw : pandas.DataFrame
+    """
+    schema = compile_plan(locale, POSITIONS).schema
+    return read_raw(path, schema=schema, engine=engine)
+
+
+def read_cashflows_raw(path, engine="c", chunksize=None, locale=LOCALE_DEFAULT):
+    """Read raw cashflows CSV file.
+
+    Parameters
+    ----------
+    path : Path-like
+    engine : {"c", "pyarrow"}, optional
+    chunksize : int, optional
+        Number of rows per chunk, only with the "c" engine.
+    locale : str, optional
+        See degiro_wrapper.core.locales.LOCALES.
+
+    Returns
+    -------
+    raw : pandas.DataFrame or iterator of pandas.DataFrame
+        An iterator of chunks if chunksize is given.
+    """
+    kwargs = {}
+    if chunksize is not None:
+        kwargs["chunksize"] = chunksize
+
+    schema = compile_plan(locale, CASHFLOWS).schema
+    return read_raw(path, schema=schema, engine=engine, **kwargs)
+
+
+def read_transactions_raw(path, engine="c", locale=LOCALE_DEFAULT):
+    """Read raw transactions CSV file.
+
+    Parameters
+    ----------
+    path : Path-like
+    engine : {"c", "pyarrow"}, optional
+    locale : str, optional
+        See degiro_wrapper.core.locales.LOCALES.
+
+    Returns
+    -------
+    raw : pandas.DataFrame
+    """
+    schema = compile_plan(locale, TRANSACTIONS).schema
+    return read_raw(path, schema=schema, engine=engine)
+
+
+def read_cashflows_db(path):
+    """Read clean cashflows database, as written by create-db-cashflows.
+
+    Parameters
+    ----------
+    path : Path-like
+        CSV, Parquet (".parquet") or Arrow IPC (".arrow", ".feather") file.
+
+    Returns
+    -------
+    cashflows : pandas.DataFrame
+    """
+    return read_db(path, dates=[Cashflows.DATE, Cashflows.DATE_VALUE])
@@ -0,0 +1,184 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from degiro_wrapper.core.panel import Panel
+
+FILE_VALUES = "values.dat"
+FILE_DATES = "dates.dat"
+FILE_META = "meta.json"
+
+DTYPE_VALUES = np.float64
+DTYPE_DATES = np.int64
+
+
+class PanelStore:
+    """Persistent panel store backed by memory-mapped arrays.
+
+    The panel array is stored date-major, so new dates are appended at the
+    end of the files without rewriting them. Sidecars keep the dates
+    (nanoseconds since epoch), the ISINs and the fields.
+
+    The meta file is written last and is the only source of the number of
+    stored dates, rows written after it are dropped, as after a crash.
+
+    Parameters
+    ----------
+    path : Path-like
+        Store folder.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    @property
+    def exists(self):
+        return (self.path / FILE_META).exists()
+
+    def _read_meta(self):
+        with open(self.path / FILE_META) as file:
+            return json.load(file)
+
+    def _write_meta(self, dates, isins, fields):
+        meta = {
+            "n_dates": len(dates),
+            "dates_name": dates.name,
+            "isins": [None if pd.isna(isin) else isin for isin in isins],
+            "isins_name": isins.name,
+            "fields": list(fields),
+        }
+        tmp = self.path / (FILE_META + ".tmp")
+        with open(tmp, "w") as file:
+            json.dump(meta, file)
+        tmp.replace(self.path / FILE_META)
+
+    def write(self, panel):
+        """Write panel, replacing the store content.
+
+        Parameters
+        ----------
+        panel : degiro_wrapper.core.panel.Panel
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # A rewrite stopped halfway leaves no store, not a mismatched one
+        (self.path / FILE_META).unlink(missing_ok=True)
+
+        values = np.ascontiguousarray(panel.values, dtype=DTYPE_VALUES)
+        values.tofile(self.path / FILE_VALUES)
+        dates = panel.dates.asi8.astype(DTYPE_DATES)
+        dates.tofile(self.path / FILE_DATES)
+
+        self._write_meta(panel.dates, panel.isins, panel.fields)
+
+    def append(self, panel):
+        """Append the dates of the panel after the last stored date.
+
+        Only dates after the last stored date are appended. If the panel has
+        ISINs not yet stored the store is rewritten, otherwise only the new
+        rows are written at the end of the files.
+
+        Parameters
+        ----------
+        panel : degiro_wrapper.core.panel.Panel
+
+        Returns
+        -------
+        n_new : int
+            Number of appended dates.
+        """
+        if not self.exists:
+            self.write(panel)
+            return len(panel.dates)
+
+        stored = self.read()
+        if panel.fields != stored.fields:
+            raise ValueError(
+                f"Fields {panel.fields} do not match stored {stored.fields}."
+            )
+
+        last = stored.dates[-1] if len(stored.dates) else pd.Timestamp.min
+        new = panel.dates > last
+        n_new = int(new.sum())
+        if n_new == 0:
+            return 0
+
+        isins = stored.isins.append(panel.isins.difference(stored.isins))
+        indexer = panel.isins.get_indexer(isins)
+        found = indexer >= 0
+
+        values = np.full((n_new, len(isins), len(panel.fields)), np.nan)
+        values[:, found] = panel.values[new][:, indexer[found]]
+        dates = panel.dates[new]
+
+        if len(isins) > len(stored.isins):
+            # Columns change, the date-major layout must be rewritten
+            previous = np.full((len(stored.dates),) + values.shape[1:], np.nan)
+            previous[:, : len(stored.isins)] = stored.values
+            values = np.concatenate([previous, values])
+            dates = stored.dates.append(dates)
+            self.write(Panel(values, dates=dates, isins=isins, fields=panel.fields))
+            return n_new
+
+        # Rows after the stored dates were never committed to the meta
+        n_stored = len(stored.dates)
+        size_row = len(stored.isins) * len(stored.fields)
+        os.truncate(
+            self.path / FILE_VALUES,
+            n_stored * size_row * np.dtype(DTYPE_VALUES).itemsize,
+        )
+        os.truncate(self.path / FILE_DATES, n_stored * np.dtype(DTYPE_DATES).itemsize)
+
+        with open(self.path / FILE_VALUES, "ab") as file:
+            values.astype(DTYPE_VALUES).tofile(file)
+        with open(self.path / FILE_DATES, "ab") as file:
+            dates.asi8.astype(DTYPE_DATES).tofile(file)
+
+        dates = stored.dates.append(dates)
+        self._write_meta(dates, stored.isins, stored.fields)
+
+        return n_new
+
+    def read(self, mmap_mode="r"):
+        """Open the stored panel, memory-mapped.
+
+        Parameters
+        ----------
+        mmap_mode : {"r", "r+", "c"}, optional
+            See numpy.memmap, by default "r" (read-only).
+
+        Returns
+        -------
+        panel : degiro_wrapper.core.panel.Panel
+            Slicing its fields does not copy data.
+        """
+        meta = self._read_meta()
+
+        n_dates = meta["n_dates"]
+        isins = [np.nan if isin is None else isin for isin in meta["isins"]]
+        isins = pd.Index(isins, name=meta["isins_name"])
+        fields = meta["fields"]
+        shape = (n_dates, len(isins), len(fields))
+
+        if n_dates == 0:
+            values = np.empty(shape, dtype=DTYPE_VALUES)
+            dates = np.empty(0, dtype=DTYPE_DATES)
+        else:
+            values = np.memmap(
+                self.path / FILE_VALUES,
+                dtype=DTYPE_VALUES,
+                mode=mmap_mode,
+                shape=shape,
+            )
+            dates = np.fromfile(
+                self.path / FILE_DATES,
+                dtype=DTYPE_DATES,
+                count=n_dates,
+            )
+
+        dates = dates.view("datetime64[ns]")
+        dates = pd.DatetimeIndex(dates, name=meta["dates_name"])
+
+        return Panel(values, dates=dates, isins=isins, fields=fields)
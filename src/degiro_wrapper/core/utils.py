@@ -12,3 +12,62 @@ def create_ytd_calendar():
     year_start = pd.to_datetime(f"{today.year}0101")
     calendar = pd.date_range(freq="B", start=year_start, end=today)
     return calendar
+
+
+def parse_dates(values, format=None, errors="raise"):
+    """Parse dates parsing each unique string only once.
+
+    Dates repeat a lot among rows, so the unique strings are parsed
+    and the result is broadcast back to all the rows.
+
+    Parameters
+    ----------
+    values : pandas.Series or pandas.DataFrame
+    format : str, optional
+        strftime format, e.g. "%d-%m-%Y".
+    errors : {"raise", "coerce"}, optional
+        See pandas.to_datetime, by default "raise".
+
+    Returns
+    -------
+    dates : pandas.Series or pandas.DataFrame
+        Same shape and labels as values.
+    """
+    codes, uniques = pd.factorize(values.to_numpy().ravel())
+
+    parsed = pd.to_datetime(uniques, format=format, errors=errors)
+    parsed = parsed.take(codes, allow_fill=True, fill_value=pd.NaT)
+
+    if isinstance(values, pd.DataFrame):
+        parsed = parsed.to_numpy().reshape(values.shape)
+        return pd.DataFrame(parsed, index=values.index, columns=values.columns)
+
+    return pd.Series(parsed, index=values.index, name=values.name)
+
+
+def combine_date_time(dates, times, format="%H:%M"):
+    """Combine parsed dates and time strings into timestamps.
+
+    Parameters
+    ----------
+    dates : pandas.Series
+        Parsed dates, see parse_dates.
+    times : pandas.Series
+        Time strings, missing times are taken as midnight.
+    format : str, optional
+        strftime format of times, by default "%H:%M".
+
+    Returns
+    -------
+    timestamps : pandas.Series
+    """
+    codes, uniques = pd.factorize(times)
+
+    midnight = pd.Timestamp("1900-01-01")
+    offsets = pd.to_datetime(uniques, format=format, errors="coerce") - midnight
+    # Last slot for missing times (code -1)
+    offsets = offsets.append(pd.TimedeltaIndex([0])).fillna(pd.Timedelta(0))
+
+    timestamps = dates + offsets.to_numpy()[codes]
+
+    return timestamps
@@ -0,0 +1,250 @@
+import csv
+from concurrent import futures
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+from degiro_wrapper.conventions import (
+    FILENAME_POSITIONS,
+    Cashflows,
+    Positions,
+    Transactions,
+)
+from degiro_wrapper.core.locales import (
+    CASHFLOWS,
+    DTYPES,
+    POSITIONS,
+    TRANSACTIONS,
+    compile_plan,
+    detect_locale,
+)
+from degiro_wrapper.core.readers import read_header
+
+# Strings containing a number, e.g. "EUR 1,5" or "-302,94"
+PATTERN_NUMBER = r"\d"
+# Strings that are a plain float, e.g. "-302.94"
+PATTERN_FLOAT = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[Ee][-+]?\d+)?"
+
+REPORT_COLUMNS = ["file", "error"]
+
+# Rows checked at once, files are never loaded in full
+CHUNKSIZE = 100_000
+
+
+def _float_columns(report):
+    return {
+        col: PATTERN_FLOAT
+        for col, dtype in DTYPES[report].items()
+        if dtype == "float64"
+    }
+
+
+# Checks of each report, columns use the clean names of any locale
+SPEC_POSITIONS = dict(
+    report=POSITIONS,
+    numeric={
+        **_float_columns(POSITIONS),
+        Positions.PRICE: PATTERN_NUMBER,
+        Positions.VALUE_LOCAL: PATTERN_NUMBER,
+        Positions.VALUE_PORTFOLIO: PATTERN_NUMBER,
+    },
+    required=[Positions.VALUE_LOCAL, Positions.VALUE_PORTFOLIO],
+    filename=FILENAME_POSITIONS,
+    allow_empty=True,
+)
+
+SPEC_CASHFLOWS = dict(
+    report=CASHFLOWS,
+    numeric={
+        Cashflows.DELTA: PATTERN_NUMBER,
+        Cashflows.AMOUNT: PATTERN_NUMBER,
+    },
+    required=[Cashflows.DATE, Cashflows.DESCRIPTION],
+)
+
+SPEC_TRANSACTIONS = dict(
+    report=TRANSACTIONS,
+    numeric=_float_columns(TRANSACTIONS),
+    required=[Transactions.DATE, Transactions.ISIN, Transactions.SHARES],
+)
+
+
+def validate_file(
+    file,
+    report,
+    numeric=None,
+    required=(),
+    filename=None,
+    allow_empty=False,
+    locale=None,
+):
+    """Check a raw CSV report before cleaning it.
+
+    The file is parsed by chunks of rows and the missing values and the
+    numeric patterns are checked with column-wise masks over each chunk.
+    Rows with more columns than the header are rejected by the parser.
+    Rows with fewer columns are padded with missing values, as when
+    cleaning, so the required columns are enforced on them.
+
+    Parameters
+    ----------
+    file : Path-like
+    report : {"positions", "cashflows", "transactions"}
+        Expected columns, see degiro_wrapper.core.locales.
+    numeric : dict, optional
+        Clean column to regex, non-missing values must match it.
+    required : list of str, optional
+        Clean columns that cannot have missing values.
+    filename : str, optional
+        strftime template the file stem must follow, e.g. FILENAME_POSITIONS.
+    allow_empty : bool, optional
+        Whether an empty file is valid, by default False.
+    locale : str, optional
+        Header language, by default detected from the header.
+
+    Returns
+    -------
+    errors : list of str
+        Empty if the file is valid.
+    """
+    file = Path(file)
+    numeric = numeric or {}
+    errors = []
+
+    if filename is not None:
+        try:
+            datetime.strptime(file.stem, filename)
+        except ValueError:
+            errors.append(f"file name does not follow {filename!r}")
+
+    # -------------------------------------------------------------------------
+    # Header
+    try:
+        header = read_header(file)
+    except (OSError, UnicodeDecodeError, csv.Error) as error:
+        return errors + [f"unreadable file: {error}"]
+
+    if not header:
+        return errors if allow_empty else errors + ["empty file"]
+
+    if locale is None:
+        try:
+            locale = detect_locale(header, report)
+        except ValueError:
+            return errors + [f"unknown {report} header {header}"]
+
+    plan = compile_plan(locale, report)
+    missing = [column for column in plan.schema if column not in header]
+    if missing:
+        return errors + [f"missing columns {missing}"]
+
+    # -------------------------------------------------------------------------
+    # Missing values and numeric patterns, chunk by chunk
+    n_missing = dict.fromkeys(required, 0)
+    n_bad = dict.fromkeys(numeric, 0)
+    first_bad = {}
+
+    try:
+        chunks = pd.read_csv(
+            file,
+            dtype=str,
+            keep_default_na=False,
+            na_values=[""],
+            chunksize=CHUNKSIZE,
+            encoding="utf-8",
+        )
+        for chunk in chunks:
+            frame = plan.apply(chunk[list(plan.schema)])
+
+            for column in required:
+                n_missing[column] += frame[column].isna().sum()
+
+            for column, pattern in numeric.items():
+                values = frame[column].dropna()
+                if pattern == PATTERN_FLOAT:
+                    bad = ~values.str.fullmatch(pattern)
+                else:
+                    bad = ~values.str.contains(pattern)
+                if bad.any():
+                    n_bad[column] += bad.sum()
+                    first_bad.setdefault(column, values[bad].iloc[0])
+    except (OSError, UnicodeDecodeError, pd.errors.ParserError) as error:
+        return errors + [f"unreadable file: {str(error).strip()}"]
+
+    for column, count in n_missing.items():
+        if count:
+            errors.append(f"column {column!r} has {count} missing values")
+
+    for column, count in n_bad.items():
+        if count:
+            errors.append(
+                f"column {column!r} has {count} non-numeric values, "
+                f"e.g. {first_bad[column]!r}"
+            )
+
+    return errors
+
+
+def _validate(file, spec):
+    return [(str(file), error) for error in validate_file(file, **spec)]
+
+
+def validate_files(files, spec, max_workers=None, skip=()):
+    """Check raw CSV reports in parallel, reporting all the bad files.
+
+    Parameters
+    ----------
+    files : list of Path-like
+    spec : dict
+        Checks, e.g. SPEC_POSITIONS, see validate_file.
+    max_workers : int, optional
+        Number of processes, by default the number of CPUs.
+        Use 1 to validate in the current process.
+    skip : list of Path-like, optional
+        Files known to be valid, e.g. already cleaned into the cache,
+        see degiro_wrapper.core.preprocess.cache_keys_positions.
+
+    Returns
+    -------
+    report : pandas.DataFrame
+        One row per error with columns "file" and "error",
+        empty if all the files are valid.
+    """
+    if skip:
+        skip = {Path(file) for file in skip}
+        files = [file for file in files if Path(file) not in skip]
+
+    func = partial(_validate, spec=spec)
+
+    if max_workers == 1 or len(files) < 2:
+        results = map(func, files)
+        report = [error for errors in results for error in errors]
+    else:
+        with futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(func, files, chunksize=64)
+            report = [error for errors in results for error in errors]
+
+    return pd.DataFrame(report, columns=REPORT_COLUMNS)
+
+
+def validate_positions(path, max_workers=None, locale=None, skip=()):
+    """Check all raw positions files of a folder.
+
+    Parameters
+    ----------
+    path : Path-like
+        Folder of raw positions, see clean_positions.
+    max_workers : int, optional
+    locale : str, optional
+        Header language, by default detected from each header.
+    skip : list of Path-like, optional
+        See validate_files.
+
+    Returns
+    -------
+    report : pandas.DataFrame
+    """
+    files = sorted(Path(path).glob("pos*.csv"))
+    spec = dict(SPEC_POSITIONS, locale=locale)
+    return validate_files(files, spec, max_workers=max_workers, skip=skip)
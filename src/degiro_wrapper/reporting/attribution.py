@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Positions, Transactions
+from degiro_wrapper.reporting.twr import FREQUENCIES
+
+
+def compute_amount(positions):
+    """Value of each ISIN, the amount panel of the positions.
+
+    Parameters
+    ----------
+    positions : pandas.DataFrame
+
+    Returns
+    -------
+    amount : pandas.DataFrame
+        Date x ISIN, missing when the ISIN is not held.
+    """
+    amount = positions.groupby([Positions.DATE, Positions.ISIN])[
+        Positions.VALUE_PORTFOLIO
+    ].sum()
+
+    return amount.unstack()
+
+
+def compute_cfs_isin(transactions):
+    """Cashflows of each ISIN, see compute_cfs.
+
+    Parameters
+    ----------
+    transactions : pandas.DataFrame
+
+    Returns
+    -------
+    cfs : pandas.DataFrame
+        Date x ISIN, buying is an inflow.
+    """
+    cfs = transactions.groupby([Transactions.DATE, Transactions.ISIN])[
+        Transactions.VALUE_PORTFOLIO
+    ].sum()
+
+    return cfs.unstack(fill_value=0.0).mul(-1)
+
+
+def compute_contributions(amount, cfs):
+    """Compute the contribution of each ISIN to the daily return.
+
+    The PnL of an ISIN is its change of value minus its cashflows, and its
+    contribution the PnL over the capital of the portfolio, the previous
+    TNA plus all the cashflows of the day. Contributions add up to the
+    return of compute_return_daily.
+
+    Parameters
+    ----------
+    amount : pandas.DataFrame
+        Date x ISIN, see compute_amount or
+        degiro_wrapper.core.preprocess.positions_raw_to_clean.
+    cfs : pandas.DataFrame
+        Date x ISIN, see compute_cfs_isin.
+
+    Returns
+    -------
+    contributions : pandas.DataFrame
+        Date x ISIN, the first date there is not return.
+    """
+    isins = amount.columns.union(cfs.columns)
+    _amount = amount.reindex(columns=isins).fillna(0.0).to_numpy()
+    _cfs = cfs.reindex(index=amount.index, columns=isins, fill_value=0.0).to_numpy()
+
+    amount_previous = np.vstack([_amount[:1], _amount[:-1]])
+    pnl = _amount - amount_previous - _cfs
+
+    capital = amount_previous.sum(axis=1) + _cfs.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        contributions = pnl / capital[:, None]
+
+    # The first day there is not return
+    contributions[:1] = 0.0
+
+    contributions = pd.DataFrame(contributions, index=amount.index, columns=isins)
+
+    return contributions
+
+
+def _carino(returns):
+    """Carino factor log(1 + r) / r, 1 when r is 0."""
+    returns = np.asarray(returns, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = np.log1p(returns) / returns
+
+    return np.where(returns == 0, 1.0, factor)
+
+
+def link_contributions(contributions, freq=None):
+    """Link daily contributions over periods with Carino factors.
+
+    Daily contributions do not compound into the period return. Each day
+    is scaled by the ratio of its Carino factor to the one of the period,
+    so that the linked contributions add up to the period return.
+    Slice the contributions to link any other period.
+
+    Parameters
+    ----------
+    contributions : pandas.DataFrame
+        See compute_contributions.
+    freq : {"M", "Q", "Y"} or {"monthly", "quarterly", "yearly"}, optional
+        Calendar periods, by default the whole series.
+
+    Returns
+    -------
+    linked : pandas.Series or pandas.DataFrame
+        ISIN, or period x ISIN with freq.
+    """
+    returns = contributions.sum(axis=1).to_numpy()
+    factors = _carino(returns)
+
+    if freq is None:
+        total = np.prod(1 + returns) - 1
+        weights = factors / _carino(total)
+        return pd.Series(
+            weights @ contributions.to_numpy(), index=contributions.columns
+        )
+
+    freq = FREQUENCIES.get(freq, freq)
+    periods = contributions.index.to_period(freq)
+
+    total = pd.Series(1 + returns).groupby(periods).transform("prod") - 1
+    weights = factors / _carino(total)
+
+    linked = contributions.mul(weights, axis=0).groupby(periods).sum()
+
+    return linked
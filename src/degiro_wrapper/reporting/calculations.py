@@ -1,10 +1,17 @@
-from degiro_wrapper.conventions import Positions, Transactions, Calculations
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import (
+    Calculations,
+    CashflowType,
+    Cashflows,
+    Positions,
+    Transactions,
+)
 
 
 def compute_tna(positions):
 
     tna = positions.groupby(Positions.DATE)[Positions.VALUE_PORTFOLIO].sum()
-    tna = tna.squeeze()
 
     tna.name = Calculations.TNA
 
@@ -14,7 +21,6 @@ def compute_tna(positions):
 def compute_cfs(transactions):
 
     cfs = transactions.groupby(Transactions.DATE)[Transactions.VALUE_PORTFOLIO].sum()
-    cfs = cfs.squeeze()
 
     # In the original file, buying is negative from the cash amount,
     # but it is a inflow to the portfolio.
@@ -25,6 +31,32 @@ def compute_cfs(transactions):
     return cfs
 
 
+def compute_cfs_external(cashflows):
+    """Compute account cashflows, deposits and withdrawals.
+
+    Together with the TNA of all the positions, cash included, they give
+    the returns of the whole account.
+
+    Parameters
+    ----------
+    cashflows : pandas.DataFrame
+        Clean cashflows, see degiro_wrapper.core.preprocess.clean_cashflows.
+
+    Returns
+    -------
+    cfs : pandas.Series
+        Inflows to the account are positive, as in compute_cfs.
+    """
+    mask_external = cashflows[Cashflows.TYPE].isin(
+        [CashflowType.DEPOSIT, CashflowType.WITHDRAWAL]
+    )
+
+    cfs = cashflows.loc[mask_external].groupby(Cashflows.DATE)[Cashflows.DELTA].sum()
+    cfs.name = Calculations.CFS
+
+    return cfs
+
+
 def compute_return_daily(tna, cfs):
     """Compute portfolio daily returns.
 
@@ -66,3 +98,102 @@ def compute_return_total(return_daily):
     return_total.name = Calculations.RETURN_TOTAL
 
     return return_total
+
+
+def compute_tna_batch(positions, membership):
+    """Compute TNA of many portfolios at once.
+
+    Parameters
+    ----------
+    positions : pandas.DataFrame
+    membership : pandas.DataFrame
+        ISIN x portfolio matrix, 1 if the ISIN belongs to the portfolio,
+        see degiro_wrapper.reporting.utils.build_membership.
+
+    Returns
+    -------
+    tna : pandas.DataFrame
+        Date x portfolio, missing on dates without positions in the portfolio.
+    """
+    values = positions.groupby([Positions.DATE, Positions.ISIN])[
+        Positions.VALUE_PORTFOLIO
+    ].sum()
+    values = values.unstack()
+
+    matrix = membership.reindex(values.columns, fill_value=0).to_numpy()
+
+    tna = values.fillna(0.0).to_numpy() @ matrix
+    held = values.notna().to_numpy() @ matrix > 0
+
+    tna = pd.DataFrame(
+        np.where(held, tna, np.nan),
+        index=values.index,
+        columns=membership.columns,
+    )
+
+    return tna
+
+
+def compute_cfs_batch(transactions, membership):
+    """Compute cashflows of many portfolios at once.
+
+    Parameters
+    ----------
+    transactions : pandas.DataFrame
+    membership : pandas.DataFrame
+        ISIN x portfolio matrix, see compute_tna_batch.
+
+    Returns
+    -------
+    cfs : pandas.DataFrame
+        Date x portfolio.
+    """
+    values = transactions.groupby([Transactions.DATE, Transactions.ISIN])[
+        Transactions.VALUE_PORTFOLIO
+    ].sum()
+    values = values.unstack(fill_value=0.0)
+
+    matrix = membership.reindex(values.columns, fill_value=0).to_numpy()
+
+    # Buying is negative from the cash amount, but it is a inflow.
+    cfs = pd.DataFrame(
+        -(values.to_numpy() @ matrix),
+        index=values.index,
+        columns=membership.columns,
+    )
+
+    return cfs
+
+
+def compute_returns_batch(tna, cfs):
+    """Compute daily and total returns of many portfolios at once.
+
+    Equal to compute_return_daily and compute_return_total on each portfolio,
+    each one only on its own dates.
+
+    Parameters
+    ----------
+    tna : pandas.DataFrame
+        See compute_tna_batch.
+    cfs : pandas.DataFrame
+        See compute_cfs_batch.
+
+    Returns
+    -------
+    return_daily : pandas.DataFrame
+    return_total : pandas.DataFrame
+    """
+    _cfs = cfs.reindex(index=tna.index, columns=tna.columns, fill_value=0.0)
+
+    # Previous TNA of each portfolio, skipping its missing dates
+    tna_previous = tna.ffill().shift(1)
+
+    return_daily = tna / (tna_previous + _cfs) - 1
+
+    # The first day there is not return
+    first_day = tna.notna() & tna_previous.isna()
+    return_daily = return_daily.mask(first_day, 0.0)
+
+    return_total = return_daily.add(1).cumprod().sub(1)
+
+    return return_daily, return_total
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Calculations, Costs, Transactions
+from degiro_wrapper.reporting.twr import FREQUENCIES
+
+KEYS = [
+    Transactions.ISIN,
+    Transactions.EXCHANGE,
+    Transactions.EXECUTION,
+    Costs.PERIOD,
+]
+
+COLUMNS = [Costs.TRADES, Costs.TRADED, Costs.COSTS, Costs.COSTS_BPS]
+
+COLUMNS_DRAG = [Calculations.RETURN_DAILY, Costs.COST_DRAG, Costs.RETURN_NET]
+
+
+def _bps(costs):
+    """Costs per traded value in basis points, missing without value traded."""
+    traded = costs[Costs.TRADED]
+    return costs[Costs.COSTS] / traded.where(traded != 0) * 1e4
+
+
+def compute_costs(transactions, freq="M"):
+    """Aggregate the transaction costs, all the trades in one group-by.
+
+    Costs are positive when paid, and the traded value is the absolute
+    value in the portfolio currency. Roll the result up to any key with
+    summarize_costs instead of grouping the transactions again.
+
+    Parameters
+    ----------
+    transactions : pandas.DataFrame
+        With the exchange and execution venue, see
+        degiro_wrapper.reporting.utils.filter_transactions.
+    freq : {"M", "Q", "Y"} or {"monthly", "quarterly", "yearly"}, optional
+        Calendar periods, by default "M".
+
+    Returns
+    -------
+    costs : pandas.DataFrame
+        (ISIN, exchange, exchangeExecution, period) x ["trades", "traded",
+        "costs", "costsBps"], missing keys are kept.
+    """
+    freq = FREQUENCIES.get(freq, freq)
+
+    frame = pd.DataFrame(
+        {
+            Transactions.ISIN: transactions[Transactions.ISIN],
+            Transactions.EXCHANGE: transactions[Transactions.EXCHANGE],
+            Transactions.EXECUTION: transactions[Transactions.EXECUTION],
+            Costs.PERIOD: transactions[Transactions.DATE].dt.to_period(freq),
+            Costs.TRADES: 1,
+            Costs.TRADED: transactions[Transactions.VALUE_PORTFOLIO].abs(),
+            Costs.COSTS: -transactions[Transactions.TRANSACTION_COSTS].fillna(0.0),
+        }
+    )
+
+    costs = frame.groupby(KEYS, dropna=False).sum()
+    costs[Costs.COSTS_BPS] = _bps(costs)
+
+    return costs[COLUMNS]
+
+
+def summarize_costs(costs, by):
+    """Roll up the costs of compute_costs to some of its keys.
+
+    Parameters
+    ----------
+    costs : pandas.DataFrame
+        See compute_costs.
+    by : str or list of str
+        Keys to keep, among "ISIN", "exchange", "exchangeExecution"
+        and "period".
+
+    Returns
+    -------
+    summary : pandas.DataFrame
+        Keys x ["trades", "traded", "costs", "costsBps"].
+    """
+    summary = costs[[Costs.TRADES, Costs.TRADED, Costs.COSTS]]
+    summary = summary.groupby(level=by, dropna=False).sum()
+    summary[Costs.COSTS_BPS] = _bps(summary)
+
+    return summary
+
+
+def compute_costs_daily(transactions):
+    """Transaction costs paid each day, positive.
+
+    Parameters
+    ----------
+    transactions : pandas.DataFrame
+
+    Returns
+    -------
+    costs : pandas.Series
+    """
+    costs = transactions.groupby(Transactions.DATE)[Transactions.TRANSACTION_COSTS]
+    costs = costs.sum().mul(-1)
+    costs.name = Costs.COSTS
+
+    return costs
+
+
+def compute_cost_drag(tna, cfs, costs):
+    """Compute the daily return net of transaction costs and the drag.
+
+    Cashflows exclude the costs, so the return of compute_return_daily is
+    gross of them. The net return adds the costs paid to the capital of the
+    day, and the drag is the gross return minus the net one.
+
+    Parameters
+    ----------
+    tna : pandas.Series
+    cfs : pandas.Series
+    costs : pandas.Series
+        See compute_costs_daily.
+
+    Returns
+    -------
+    drag : pandas.DataFrame
+        Date x ["returnDaily", "costDrag", "returnNet"].
+    """
+    _tna = tna.to_numpy(dtype=float)
+    _cfs = cfs.reindex(tna.index, fill_value=0.0).to_numpy(dtype=float)
+    _costs = costs.reindex(tna.index, fill_value=0.0).to_numpy(dtype=float)
+
+    capital = np.concatenate([_tna[:1], _tna[:-1]]) + _cfs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return_gross = _tna / capital - 1
+        return_net = _tna / (capital + _costs) - 1
+
+    # The first day there is not return
+    return_gross[:1] = 0.0
+    return_net[:1] = 0.0
+
+    drag = pd.DataFrame(
+        {
+            Calculations.RETURN_DAILY: return_gross,
+            Costs.COST_DRAG: return_gross - return_net,
+            Costs.RETURN_NET: return_net,
+        },
+        index=tna.index,
+    )
+
+    return drag[COLUMNS_DRAG]
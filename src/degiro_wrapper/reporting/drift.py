@@ -0,0 +1,157 @@
+"""Drift of the position weights from their targets and rebalancing trades.
+
+Weights drift when their absolute difference to the target is above the
+threshold. A breached portfolio is rebalanced with the smallest trades, in
+total value traded, that bring every weight back within its band, at most
+the threshold away from the target, without external cashflows: weights
+out of band are moved to the nearest edge, and the difference to a full
+portfolio is spread over the other weights, towards their targets first
+and then within their bands.
+"""
+
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Drift, Positions
+from degiro_wrapper.core.model import compute_weights_batch
+from degiro_wrapper.reporting.utils import build_membership
+
+THRESHOLD = 0.05
+
+COLUMNS = [Drift.WEIGHT, Drift.TARGET, Drift.DRIFT, Drift.BREACH, Drift.TRADE]
+
+
+def build_targets(portfolios):
+    """Build the target weights matrix.
+
+    Parameters
+    ----------
+    portfolios : dict
+        Portfolio name to target weights, pandas.Series indexed by ISIN.
+        Missing targets are 0, the rest are scaled to add up to 1.
+
+    Returns
+    -------
+    targets : pandas.DataFrame
+        ISIN x portfolio, missing if the ISIN does not belong to the portfolio.
+
+    Raises
+    ------
+    ValueError
+        If a target is negative or a portfolio has no positive target.
+    """
+    membership = build_membership(
+        {name: weights.index for name, weights in portfolios.items()}
+    )
+
+    targets = pd.DataFrame(
+        {name: weights.fillna(0.0) for name, weights in portfolios.items()}
+    )
+    targets = targets.reindex(index=membership.index, columns=membership.columns)
+
+    if (targets < 0).any(axis=None):
+        raise ValueError("Target weights must not be negative.")
+
+    totals = targets.sum()
+    empty = totals.index[totals <= 0].tolist()
+    if empty:
+        raise ValueError(f"Portfolios without target weights: {empty}.")
+
+    return targets / totals
+
+
+def _sum_portfolios(values, starts):
+    """Sum the member columns of each portfolio, contiguous from starts."""
+    return np.add.reduceat(values, starts, axis=1)
+
+
+def _rebalance(weights, target, threshold, codes, starts):
+    """Weights after the minimal trades, date x member arrays."""
+    lower = np.maximum(target - threshold, 0.0)
+    upper = target + threshold
+
+    rebalanced = np.clip(weights, lower, upper)
+
+    # Any spread of the residual costs the same, towards the targets first
+    for edges in [(target, target), (lower, upper)]:
+        residual = (1.0 - _sum_portfolios(rebalanced, starts))[:, codes]
+        room = np.where(residual > 0, edges[1] - rebalanced, rebalanced - edges[0])
+        room = np.maximum(room, 0.0)
+        room_total = _sum_portfolios(room, starts)[:, codes]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            taken = np.minimum(np.abs(residual) / room_total, 1.0)
+        rebalanced += np.where(room_total > 0, np.sign(residual) * taken * room, 0.0)
+
+    return rebalanced
+
+
+def compute_drift(amounts, targets, threshold=THRESHOLD):
+    """Compute the drift of all the portfolios and dates at once.
+
+    Parameters
+    ----------
+    amounts : pandas.DataFrame
+        Date x ISIN, see degiro_wrapper.reporting.attribution.compute_amount.
+    targets : pandas.DataFrame
+        ISIN x portfolio, see build_targets.
+    threshold : float, optional
+        Largest absolute drift of a weight, by default THRESHOLD.
+
+    Returns
+    -------
+    drift : pandas.DataFrame
+        (date, portfolio, ISIN) x ["weight", "target", "drift", "breach",
+        "trade"]. Trades are in the portfolio currency, buying is positive,
+        and only in portfolios with a breach.
+    """
+    # Targets not held weigh 0
+    amounts = amounts.reindex(columns=amounts.columns.union(targets.index))
+
+    weights = compute_weights_batch(amounts, targets.notna().astype(int))
+    portfolios = weights.columns.get_level_values(0)
+    isins = weights.columns.get_level_values(1)
+
+    # Members are contiguous by portfolio, every portfolio has some
+    codes = targets.columns.get_indexer(portfolios)
+    starts = np.flatnonzero(np.diff(codes, prepend=-1))
+
+    target = targets.to_numpy()[
+        targets.index.get_indexer(isins), targets.columns.get_indexer(portfolios)
+    ]
+
+    # -------------------------------------------------------------------------
+    # All the portfolios and dates at once
+    _weights = weights.to_numpy()
+    members = np.nan_to_num(
+        amounts.to_numpy(dtype=float)[:, amounts.columns.get_indexer(isins)]
+    )
+    tna = _sum_portfolios(members, starts)[:, codes]
+
+    drift = _weights - target
+    breach = np.abs(drift) > threshold
+    breached = _sum_portfolios(breach, starts)[:, codes] > 0
+
+    rebalanced = _rebalance(_weights, target, threshold, codes, starts)
+    trade = np.where(breached, (rebalanced - _weights) * tna, 0.0)
+
+    # -------------------------------------------------------------------------
+    # Long format
+    index = pd.MultiIndex.from_arrays(
+        [
+            np.repeat(amounts.index, len(isins)),
+            np.tile(portfolios, len(amounts)),
+            np.tile(isins, len(amounts)),
+        ],
+        names=[Positions.DATE, Drift.PORTFOLIO, Positions.ISIN],
+    )
+    drift = pd.DataFrame(
+        {
+            Drift.WEIGHT: _weights.ravel(),
+            Drift.TARGET: np.broadcast_to(target, _weights.shape).ravel(),
+            Drift.DRIFT: drift.ravel(),
+            Drift.BREACH: breach.ravel(),
+            Drift.TRADE: trade.ravel(),
+        },
+        index=index,
+    )
+
+    return drift[COLUMNS]
@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Calculations, Positions, Transactions
+
+# Currency of the ISINs without transactions
+CURRENCY_UNKNOWN = "unknown"
+
+COLUMNS = [
+    Calculations.RETURN_LOCAL,
+    Calculations.RETURN_CURRENCY,
+    Calculations.RETURN_DAILY,
+]
+
+
+def compute_currencies(transactions):
+    """Currency of each ISIN, the one of its last transaction price.
+
+    Parameters
+    ----------
+    transactions : pandas.DataFrame
+        See degiro_wrapper.core.preprocess.clean_transactions.
+
+    Returns
+    -------
+    currencies : pandas.Series
+        ISIN -> currency.
+    """
+    currencies = transactions.dropna(subset=[Transactions.PRICE_CCY])
+    currencies = currencies.groupby(Transactions.ISIN)[Transactions.PRICE_CCY].last()
+
+    return currencies
+
+
+def compute_fx_rates(positions):
+    """Implied exchange rate of each ISIN, portfolio value per local value.
+
+    Parameters
+    ----------
+    positions : pandas.DataFrame
+
+    Returns
+    -------
+    rates : pandas.DataFrame
+        Date x ISIN, missing without local value.
+    """
+    values = positions.groupby([Positions.DATE, Positions.ISIN])[
+        [Positions.VALUE_LOCAL, Positions.VALUE_PORTFOLIO]
+    ].sum()
+    values = values.unstack()
+
+    local = values[Positions.VALUE_LOCAL]
+    rates = values[Positions.VALUE_PORTFOLIO] / local.where(local != 0)
+
+    return rates
+
+
+def _panel(frame, keys, column, index, columns):
+    """Date x ISIN sums of a long column, as an array aligned to the panel."""
+    panel = frame.groupby(keys)[column].sum().unstack()
+    panel = panel.reindex(index=index, columns=columns)
+
+    return panel.fillna(0.0).to_numpy()
+
+
+def compute_fx_pnl(positions, transactions):
+    """Split the PnL of each ISIN into local and currency parts.
+
+    The return of an ISIN in the portfolio currency is its PnL over its
+    capital, the previous value plus its cashflows, as in
+    compute_return_daily. The local part is the same return on the local
+    values applied to the capital, and the currency part the rest, cross
+    term included, so that both parts add up to the PnL.
+
+    Parameters
+    ----------
+    positions : pandas.DataFrame
+    transactions : pandas.DataFrame
+        Cashflows without local value are converted with the transaction
+        exchange rate, if available, or else with the rate implied by the
+        positions that day, see compute_fx_rates.
+
+    Returns
+    -------
+    capital : pandas.DataFrame
+    pnl_local : pandas.DataFrame
+    pnl_currency : pandas.DataFrame
+        Date x ISIN, the first date there is not PnL.
+    """
+    keys = [Positions.DATE, Positions.ISIN]
+    dates = pd.DatetimeIndex(positions[Positions.DATE].drop_duplicates().sort_values())
+    isins = pd.Index(positions[Positions.ISIN].dropna().unique()).sort_values()
+
+    value = _panel(positions, keys, Positions.VALUE_PORTFOLIO, dates, isins)
+    local = _panel(positions, keys, Positions.VALUE_LOCAL, dates, isins)
+
+    # -------------------------------------------------------------------------
+    # Cashflows, buying is an inflow
+    transactions = transactions.loc[transactions[Transactions.ISIN].isin(isins)]
+    flows_local = transactions[Transactions.VALUE_LOCAL]
+    if Transactions.RATE in transactions:
+        flows_local = flows_local.fillna(
+            transactions[Transactions.VALUE_PORTFOLIO] * transactions[Transactions.RATE]
+        )
+    if flows_local.isna().any():
+        rates = compute_fx_rates(positions).stack()
+        rates = rates.reindex(
+            pd.MultiIndex.from_frame(
+                transactions[[Transactions.DATE, Transactions.ISIN]]
+            )
+        )
+        flows_local = flows_local.fillna(
+            transactions[Transactions.VALUE_PORTFOLIO] / rates.to_numpy()
+        )
+    transactions = transactions.assign(**{Transactions.VALUE_LOCAL: flows_local})
+
+    keys = [Transactions.DATE, Transactions.ISIN]
+    cfs = -_panel(transactions, keys, Transactions.VALUE_PORTFOLIO, dates, isins)
+    cfs_local = -_panel(transactions, keys, Transactions.VALUE_LOCAL, dates, isins)
+
+    # -------------------------------------------------------------------------
+    # All the ISINs and dates at once
+    value_previous = np.vstack([value[:1], value[:-1]])
+    local_previous = np.vstack([local[:1], local[:-1]])
+
+    capital = value_previous + cfs
+    capital_local = local_previous + cfs_local
+
+    pnl = value - capital
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return_local = np.where(capital_local != 0, local / capital_local - 1, 0.0)
+
+    pnl_local = return_local * capital
+    pnl_currency = pnl - pnl_local
+
+    # The first day there is not return
+    for panel in [capital, pnl_local, pnl_currency]:
+        panel[:1] = 0.0
+
+    frames = [
+        pd.DataFrame(panel, index=dates, columns=isins)
+        for panel in [capital, pnl_local, pnl_currency]
+    ]
+
+    return tuple(frames)
+
+
+def _fx_returns(capital, pnl_local, pnl_currency):
+    """Local, currency and total returns from PnL arrays, 0 without capital."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return [
+            np.where(capital != 0, pnl / capital, 0.0)
+            for pnl in [pnl_local, pnl_currency, pnl_local + pnl_currency]
+        ]
+
+
+def compute_fx_returns(capital, pnl_local, pnl_currency):
+    """Local, currency and total returns of the portfolio.
+
+    The total return is the one of compute_return_daily.
+
+    Parameters
+    ----------
+    capital, pnl_local, pnl_currency : pandas.DataFrame
+        See compute_fx_pnl.
+
+    Returns
+    -------
+    returns : pandas.DataFrame
+        Date x ["returnLocal", "returnCurrency", "returnDaily"].
+    """
+    components = _fx_returns(
+        capital.to_numpy().sum(axis=1),
+        pnl_local.to_numpy().sum(axis=1),
+        pnl_currency.to_numpy().sum(axis=1),
+    )
+
+    return pd.DataFrame(dict(zip(COLUMNS, components)), index=capital.index)
+
+
+def compute_fx_returns_currency(capital, pnl_local, pnl_currency, currencies):
+    """Local, currency and total returns of the ISINs of each currency.
+
+    Parameters
+    ----------
+    capital, pnl_local, pnl_currency : pandas.DataFrame
+        See compute_fx_pnl.
+    currencies : pandas.Series
+        See compute_currencies.
+
+    Returns
+    -------
+    returns : pandas.DataFrame
+        Date x (currency, component), see compute_fx_returns.
+    """
+    currencies = currencies.reindex(capital.columns).fillna(CURRENCY_UNKNOWN)
+    membership = pd.get_dummies(currencies, dtype=float)
+    matrix = membership.to_numpy()
+
+    components = _fx_returns(
+        capital.to_numpy() @ matrix,
+        pnl_local.to_numpy() @ matrix,
+        pnl_currency.to_numpy() @ matrix,
+    )
+
+    returns = pd.concat(
+        {
+            name: pd.DataFrame(
+                component, index=capital.index, columns=membership.columns
+            )
+            for name, component in zip(COLUMNS, components)
+        },
+        axis=1,
+    )
+    returns = returns.swaplevel(axis=1)
+    returns = returns.sort_index(axis=1, level=0, sort_remaining=False)
+
+    return returns
@@ -0,0 +1,189 @@
+import io
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+from degiro_wrapper.conventions import Calculations, Positions, Transactions
+from degiro_wrapper.reporting.calculations import compute_cfs, compute_tna
+
+FILE_STATE = "state.json"
+FILE_SERIES = "series.csv"
+
+COLUMNS = [
+    Calculations.TNA,
+    Calculations.CFS,
+    Calculations.RETURN_DAILY,
+    Calculations.RETURN_TOTAL,
+]
+
+
+class IncrementalReturns:
+    """TNA and returns extended day by day from a persisted state.
+
+    The state keeps the last date, TNA and cumulative return, so new days
+    only need their own positions and cash flows. The processed series is
+    appended to a CSV file next to the state.
+
+    Parameters
+    ----------
+    path : Path-like
+        State folder.
+    isins : list-like
+        ISIN values in the portfolio, the state is only valid for them.
+    """
+
+    def __init__(self, path, isins):
+        self.path = Path(path)
+        self.isins = sorted(isins)
+
+    @property
+    def exists(self):
+        return (self.path / FILE_STATE).exists()
+
+    def _read_state(self):
+        with open(self.path / FILE_STATE) as file:
+            state = json.load(file)
+
+        if state["isins"] != self.isins:
+            raise ValueError(
+                f"State {self.path} was built for other ISINs, remove it to rebuild."
+            )
+
+        state["date"] = pd.Timestamp(state["date"])
+
+        return state
+
+    def _write_state(self, date, tna, return_total, size):
+        state = {
+            "date": date.isoformat(),
+            "tna": tna,
+            "returnTotal": return_total,
+            "size": size,
+            "isins": self.isins,
+        }
+        tmp = self.path / (FILE_STATE + ".tmp")
+        with open(tmp, "w") as file:
+            json.dump(state, file)
+        tmp.replace(self.path / FILE_STATE)
+
+    def update(self, positions, transactions):
+        """Extend the series with the days after the last processed date.
+
+        Parameters
+        ----------
+        positions : pandas.DataFrame
+            Positions of the portfolio, see filter_positions.
+            Only the days after the last processed date are used.
+        transactions : pandas.DataFrame
+            Transactions of the portfolio, see filter_transactions.
+
+        Returns
+        -------
+        series : pandas.DataFrame
+            New days, with TNA, cash flows, daily and total returns.
+        """
+        if self.exists:
+            state = self._read_state()
+            last = state["date"]
+            positions = positions.loc[positions[Positions.DATE] > last]
+            transactions = transactions.loc[transactions[Transactions.DATE] > last]
+        else:
+            state = None
+
+        if positions.empty:
+            series = pd.DataFrame(columns=COLUMNS, dtype=float)
+            series.index.name = Positions.DATE
+            return series
+
+        tna = compute_tna(positions)
+        cfs = compute_cfs(transactions).reindex(tna.index, fill_value=0.0)
+
+        # Previous TNA of each new day, the first one comes from the state
+        tna_previous = tna.shift(1)
+        if state is None:
+            return_previous = 0.0
+        else:
+            tna_previous.iloc[0] = state["tna"]
+            return_previous = state["returnTotal"]
+
+        return_daily = tna / (tna_previous + cfs) - 1
+        if state is None:
+            # The first day there is not return
+            return_daily.iloc[0] = 0.0
+
+        return_total = return_daily.add(1).cumprod().mul(1 + return_previous).sub(1)
+
+        series = pd.DataFrame(
+            {
+                Calculations.TNA: tna,
+                Calculations.CFS: cfs,
+                Calculations.RETURN_DAILY: return_daily,
+                Calculations.RETURN_TOTAL: return_total,
+            },
+            columns=COLUMNS,
+        )
+        series.index.name = Positions.DATE
+
+        # ---------------------------------------------------------------------
+        # Persist, series first so that the state never points past it.
+        # Rows appended after the last saved state are dropped.
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = self.path / FILE_SERIES
+        if state is not None:
+            os.truncate(file, state["size"])
+
+        series.to_csv(file, mode="a" if state else "w", header=state is None)
+
+        self._write_state(
+            date=tna.index[-1],
+            tna=float(tna.iloc[-1]),
+            return_total=float(return_total.iloc[-1]),
+            size=file.stat().st_size,
+        )
+
+        return series
+
+    def read(self, start=None, end=None):
+        """Read the processed days of a period.
+
+        Parameters
+        ----------
+        start : Datetime-like, optional
+            by default the first processed day. Returns are rebased to the
+            first day of the period, as if it were computed without state.
+        end : Datetime-like, optional
+            by default the last processed day.
+
+        Returns
+        -------
+        series : pandas.DataFrame
+            Empty if nothing was processed yet.
+        """
+        if not self.exists:
+            series = pd.DataFrame(columns=COLUMNS, dtype=float)
+            series.index = pd.DatetimeIndex([], name=Positions.DATE)
+            return series
+
+        state = self._read_state()
+
+        # Only the rows covered by the state
+        with open(self.path / FILE_SERIES, "rb") as file:
+            content = io.BytesIO(file.read(state["size"]))
+
+        series = pd.read_csv(
+            content,
+            index_col=Positions.DATE,
+            parse_dates=[Positions.DATE],
+        )
+        series = series.loc[start:end]
+
+        if start is not None and not series.empty:
+            # The first day there is not return
+            base = 1 + series[Calculations.RETURN_TOTAL].iloc[0]
+            series[Calculations.RETURN_TOTAL] = (
+                series[Calculations.RETURN_TOTAL].add(1).div(base).sub(1)
+            )
+            series.iloc[0, series.columns.get_loc(Calculations.RETURN_DAILY)] = 0.0
+
+        return series
@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Lots, Transactions
+
+METHODS = [Lots.FIFO, Lots.LIFO, Lots.AVERAGE]
+
+# Shares below this are closed, fractional shares are rounded in the exports
+TOLERANCE = 1e-9
+
+COLUMNS_MATCHES = [
+    Lots.TRADE,
+    Lots.TRADE_OPEN,
+    Lots.SHARES,
+    Lots.COST,
+    Lots.PROCEEDS,
+]
+
+
+def _match_isin(start, stop, shares, values, method, lots, state, matches):
+    """Match the trades of one ISIN, trades[start:stop] in time order.
+
+    Each trade opens at most one lot, so the lots of the ISIN fit in the
+    slots start:stop of the lot arrays. Open lots are the slots head:tail,
+    all with the sign of the position: FIFO closes from the head, LIFO from
+    the tail, and the average method keeps a single lot.
+    """
+    lot_shares, lot_values, lot_trades = lots
+    realized, shares_open, cost_open = state
+
+    head = tail = start
+    position = 0.0
+    basis = 0.0
+
+    for idx in range(start, stop):
+        quantity = shares[idx]
+        value = values[idx]
+        pnl = 0.0
+
+        # Close lots of the opposite sign
+        while head < tail and quantity * lot_shares[head] < 0:
+            slot = tail - 1 if method == Lots.LIFO else head
+
+            lot = lot_shares[slot]
+            closed = lot if abs(lot) <= abs(quantity) else -quantity
+            cost = closed * lot_values[slot]
+            proceeds = closed * value
+
+            pnl += proceeds - cost
+            basis -= cost
+            matches.append((idx, lot_trades[slot], closed, cost, proceeds))
+
+            lot_shares[slot] = lot - closed
+            quantity += closed
+            if abs(lot_shares[slot]) <= TOLERANCE:
+                if method == Lots.LIFO:
+                    tail -= 1
+                else:
+                    head += 1
+            if abs(quantity) <= TOLERANCE:
+                quantity = 0.0
+                break
+
+        # Open a lot with the rest
+        if quantity:
+            if method == Lots.AVERAGE and head < tail:
+                total = lot_shares[head] + quantity
+                lot_values[head] = (
+                    lot_shares[head] * lot_values[head] + quantity * value
+                ) / total
+                lot_shares[head] = total
+            else:
+                lot_shares[tail] = quantity
+                lot_values[tail] = value
+                lot_trades[tail] = idx
+                tail += 1
+            basis += quantity * value
+
+        position += shares[idx]
+        realized[idx] = pnl
+        shares_open[idx] = position
+        cost_open[idx] = basis if head < tail else 0.0
+
+
+def match_lots(transactions, method=Lots.FIFO):
+    """Match the transactions into lots and compute the realized PnL.
+
+    All the history is processed in a single pass, ISIN by ISIN. Values
+    are in the portfolio currency and include the transaction costs: they
+    are part of the cost of buying and reduce the proceeds of selling.
+    Selling more than the open shares opens a short lot.
+
+    Parameters
+    ----------
+    transactions : pandas.DataFrame
+        See degiro_wrapper.core.preprocess.clean_transactions.
+    method : {"fifo", "lifo", "average"}, optional
+        by default "fifo".
+
+    Returns
+    -------
+    trades : pandas.DataFrame
+        Trades sorted by ISIN and time, with the value per share, the
+        realized PnL, and the open shares and cost after each trade.
+    matches : pandas.DataFrame
+        One row per lot closed by a trade, with the positions of the
+        closing and opening trades in trades, the shares closed, signed as
+        the lot, and their cost and proceeds.
+
+    Raises
+    ------
+    ValueError
+        If the method is unknown.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, use one of {METHODS}.")
+
+    order = [Transactions.ISIN, Transactions.DATE]
+    if Transactions.TIMESTAMP in transactions:
+        order.append(Transactions.TIMESTAMP)
+
+    trades = transactions.loc[transactions[Transactions.ISIN].notna()]
+    trades = trades.sort_values(order, kind="stable")
+
+    # Buying pays value and costs, selling receives value minus costs
+    total = trades[Transactions.VALUE_PORTFOLIO].add(
+        trades[Transactions.TRANSACTION_COSTS].fillna(0.0)
+    )
+    shares = trades[Transactions.SHARES].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(shares != 0, -total.to_numpy(dtype=float) / shares, 0.0)
+
+    trades = trades[[Lots.DATE, Lots.ISIN, Lots.SHARES]].reset_index(drop=True)
+    trades[Lots.VALUE_SHARE] = values
+
+    # -------------------------------------------------------------------------
+    # Lot slots and results, plain lists are faster than arrays item by item
+    size = len(trades)
+    lots = ([0.0] * size, [0.0] * size, [0] * size)
+    state = ([0.0] * size, [0.0] * size, [0.0] * size)
+    matches = []
+
+    _shares = shares.tolist()
+    _values = values.tolist()
+    bounds = np.flatnonzero(trades[Lots.ISIN].ne(trades[Lots.ISIN].shift()))
+    bounds = np.append(bounds, size).tolist()
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        _match_isin(start, stop, _shares, _values, method, lots, state, matches)
+
+    trades[Lots.REALIZED] = state[0]
+    trades[Lots.SHARES_OPEN] = state[1]
+    trades[Lots.COST_OPEN] = state[2]
+
+    matches = pd.DataFrame(matches, columns=COLUMNS_MATCHES)
+
+    return trades, matches
+
+
+def compute_pnl(trades, amount):
+    """Compute the realized and unrealized PnL of each ISIN every day.
+
+    Parameters
+    ----------
+    trades : pandas.DataFrame
+        See match_lots.
+    amount : pandas.DataFrame
+        Value of each ISIN, date x ISIN,
+        see degiro_wrapper.reporting.attribution.compute_amount.
+
+    Returns
+    -------
+    realized : pandas.DataFrame
+        Date x ISIN, PnL realized each day.
+    unrealized : pandas.DataFrame
+        Date x ISIN, value minus the cost of the open lots at the close,
+        missing if there are open lots without value.
+    """
+    daily = trades.groupby([Lots.DATE, Lots.ISIN])
+    realized = daily[Lots.REALIZED].sum().unstack(fill_value=0.0)
+    cost_open = daily[Lots.COST_OPEN].last().unstack()
+
+    dates = amount.index.union(realized.index)
+    isins = amount.columns.union(realized.columns)
+
+    realized = realized.reindex(index=dates, columns=isins, fill_value=0.0)
+    cost_open = cost_open.reindex(index=dates, columns=isins).ffill().fillna(0.0)
+
+    # Not held and without open lots there is not PnL
+    amount = amount.reindex(index=dates, columns=isins)
+    amount = amount.mask(amount.isna() & cost_open.eq(0.0), 0.0)
+    unrealized = amount - cost_open
+
+    return realized, unrealized
@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Calculations
+
+DAYS_YEAR = 365.0
+
+# Annual rates searched by the solver, short windows annualize to extremes
+BOUNDS = (-1 + 1e-12, 1e12)
+
+COLUMNS = ["start", "end", Calculations.XIRR, Calculations.RETURN_MONEY_WEIGHTED]
+
+
+def _npv(rate_log, amounts, times, horizon):
+    """Scaled net present value and its derivative, rate_log = log(1 + rate).
+
+    Flows are discounted to the origin for positive rates and to the horizon
+    for negative ones, so that no discount factor overflows. The scale is
+    positive, the sign and the roots are the ones of the net present value.
+    """
+    origin = np.where(rate_log < 0, horizon, 0.0)
+    times = times - origin[:, None]
+
+    discounted = amounts * np.exp(-rate_log[:, None] * times)
+    npv = discounted.sum(axis=1)
+    derivative = -(discounted * times).sum(axis=1)
+
+    return npv, derivative
+
+
+def solve_xirr(amounts, times, guess=0.1, tol=1e-10, max_iter=100, bounds=BOUNDS):
+    """Solve the annual internal rate of return of many cashflow series.
+
+    All the series are solved at once with a safeguarded Newton method on
+    ``log(1 + rate)``: each series keeps a bracket of its root, and a Newton
+    step that leaves it is replaced by bisection.
+
+    Parameters
+    ----------
+    amounts : array-like
+        Series x flow, paid by the investor negative and received positive.
+        Missing and zero amounts are not flows.
+    times : array-like
+        Years of each flow since any origin, broadcastable to amounts.
+    guess : float, optional
+        Starting annual rate, by default 0.1.
+    tol : float, optional
+        Tolerance of ``log(1 + rate)``, by default 1e-10.
+    max_iter : int, optional
+        by default 100.
+    bounds : tuple of float, optional
+        Annual rates searched, by default BOUNDS.
+
+    Returns
+    -------
+    xirr : numpy.ndarray
+        Annual rate of each series, NaN if there is not root in bounds.
+    """
+    amounts = np.nan_to_num(np.atleast_2d(np.asarray(amounts, dtype=float)))
+    times = np.broadcast_to(np.asarray(times, dtype=float), amounts.shape)
+
+    # Times since the first flow, times without flow are not used
+    flows = amounts != 0
+    first = np.where(flows, times, np.inf).min(axis=1)
+    first = np.where(np.isfinite(first), first, 0.0)
+    times = np.where(flows, times - first[:, None], 0.0)
+    horizon = times.max(axis=1)
+
+    size = amounts.shape[0]
+    lower = np.full(size, np.log1p(bounds[0]))
+    upper = np.full(size, np.log1p(bounds[1]))
+
+    npv_lower, _ = _npv(lower, amounts, times, horizon)
+    npv_upper, _ = _npv(upper, amounts, times, horizon)
+    bracketed = np.sign(npv_lower) * np.sign(npv_upper) < 0
+
+    rate_log = np.clip(np.full(size, np.log1p(guess)), lower, upper)
+    for _ in range(max_iter):
+        npv, derivative = _npv(rate_log, amounts, times, horizon)
+
+        # Shrink the bracket to the side of the root
+        below = np.sign(npv) == np.sign(npv_lower)
+        lower = np.where(below, rate_log, lower)
+        npv_lower = np.where(below, npv, npv_lower)
+        upper = np.where(below, upper, rate_log)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate_new = rate_log - npv / derivative
+
+        outside = ~((rate_new >= lower) & (rate_new <= upper))
+        rate_new = np.where(outside, 0.5 * (lower + upper), rate_new)
+
+        converged = np.abs(rate_new - rate_log) < tol
+        rate_log = rate_new
+
+        if converged[bracketed].all():
+            break
+
+    xirr = np.expm1(rate_log)
+    xirr[~bracketed] = np.nan
+
+    return xirr
+
+
+def _solve_windows(dates, tna, cfs, idx_start, idx_end, columns):
+    """Money-weighted returns of windows over the columns of TNA and cashflows.
+
+    The TNA at the start is invested and the TNA at the end received. The
+    cashflows of a day are invested at the close of the previous date, as in
+    compute_return_daily, so that windows without cashflows give the same
+    return as the time-weighted one.
+    """
+    positions = np.arange(len(dates))
+    days = (dates - dates[0]).days.to_numpy(dtype=float)
+
+    # Cashflows of the next date, window x date
+    cfs_next = np.vstack([cfs[1:], np.zeros((1, cfs.shape[1]))])
+    inside = (positions >= idx_start[:, None]) & (positions < idx_end[:, None])
+    amounts = np.where(inside, -cfs_next[:, columns].T, 0.0)
+
+    windows = np.arange(len(idx_start))
+    amounts[windows, idx_start] -= tna[idx_start, columns]
+    amounts[windows, idx_end] += tna[idx_end, columns]
+
+    times = (days[None, :] - days[idx_start][:, None]) / DAYS_YEAR
+
+    xirr = solve_xirr(amounts, times)
+    years = (days[idx_end] - days[idx_start]) / DAYS_YEAR
+    return_mwr = np.expm1(np.log1p(xirr) * years)
+
+    result = pd.DataFrame(
+        {
+            "start": dates[idx_start],
+            "end": dates[idx_end],
+            Calculations.XIRR: xirr,
+            Calculations.RETURN_MONEY_WEIGHTED: return_mwr,
+        },
+        columns=COLUMNS,
+    )
+
+    return result
+
+
+def compute_mwr(tna, cfs, starts, ends):
+    """Compute the money-weighted return of many windows of one portfolio.
+
+    Dates are taken as-of: a date without TNA maps to the last date before
+    it, starts before the first date are clipped to it.
+
+    Parameters
+    ----------
+    tna : pandas.Series
+        See degiro_wrapper.reporting.calculations.compute_tna.
+    cfs : pandas.Series
+        See degiro_wrapper.reporting.calculations.compute_cfs.
+    starts, ends : list-like of Datetime-like
+        Base and last date of each window.
+
+    Returns
+    -------
+    mwr : pandas.DataFrame
+        Window x ["start", "end", "xirr", "returnMoneyWeighted"], the XIRR is
+        annual and the return over the window. NaN if end is before the
+        first date.
+    """
+    dates = pd.DatetimeIndex(tna.index)
+    _tna = tna.to_numpy(dtype=float)[:, None]
+    _cfs = cfs.reindex(dates, fill_value=0.0).to_numpy(dtype=float)[:, None]
+
+    starts = pd.DatetimeIndex(np.atleast_1d(starts))
+    ends = pd.DatetimeIndex(np.atleast_1d(ends))
+    idx_start = np.maximum(dates.searchsorted(starts, side="right") - 1, 0)
+    idx_end = dates.searchsorted(ends, side="right") - 1
+
+    # Windows ending before the first date have no flows, so no solution
+    before = idx_end < 0
+    idx_end = np.maximum(idx_end, idx_start)
+
+    mwr = _solve_windows(
+        dates,
+        _tna,
+        _cfs,
+        idx_start,
+        idx_end,
+        np.zeros(len(idx_start), dtype=int),
+    )
+    mwr.loc[before, ["start", "end"]] = pd.NaT
+
+    return mwr
+
+
+def compute_window_mwr(tna, cfs, summary):
+    """Add the money-weighted return to the window returns.
+
+    Parameters
+    ----------
+    tna : pandas.Series
+    cfs : pandas.Series
+    summary : pandas.DataFrame
+        See degiro_wrapper.reporting.windows.compute_window_returns.
+
+    Returns
+    -------
+    summary : pandas.DataFrame
+        With "xirr" and "returnMoneyWeighted" columns.
+    """
+    mwr = compute_mwr(tna, cfs, starts=summary["start"], ends=summary["end"])
+    mwr.index = summary.index
+
+    summary = summary.join(mwr[COLUMNS[2:]])
+
+    return summary
+
+
+def compute_mwr_batch(tna, cfs):
+    """Compute the money-weighted return of many portfolios at once.
+
+    Each portfolio from its first to its last date with TNA.
+
+    Parameters
+    ----------
+    tna : pandas.DataFrame
+        See degiro_wrapper.reporting.calculations.compute_tna_batch.
+    cfs : pandas.DataFrame
+        See degiro_wrapper.reporting.calculations.compute_cfs_batch.
+
+    Returns
+    -------
+    mwr : pandas.DataFrame
+        Portfolio x ["start", "end", "xirr", "returnMoneyWeighted"],
+        portfolios without TNA are dropped.
+    """
+    held = tna.notna().to_numpy()
+    columns = np.flatnonzero(held.any(axis=0))
+
+    dates = pd.DatetimeIndex(tna.index)
+    _tna = tna.to_numpy(dtype=float)
+    _cfs = cfs.reindex(index=dates, columns=tna.columns, fill_value=0.0)
+
+    idx_start = held[:, columns].argmax(axis=0)
+    idx_end = len(dates) - 1 - held[::-1, columns].argmax(axis=0)
+
+    mwr = _solve_windows(
+        dates,
+        _tna,
+        _cfs.to_numpy(dtype=float),
+        idx_start,
+        idx_end,
+        columns,
+    )
+    mwr.index = tna.columns[columns]
+
+    return mwr
@@ -1,5 +1,7 @@
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+import pandas as pd
+from degiro_wrapper.reporting.windows import rebase_return_total
 
 FIGKWARGS = dict(bbox_inches="tight", transparent=True, dpi=300)
 
@@ -39,6 +41,8 @@ def plot_return_total(path, return_total):
     file = path / f"total-return_{start}_{end}.png"
     plt.savefig(file, **FIGKWARGS)
 
+    plt.close()
+
 
 def plot_tna_cfs(path, tna, cfs):
     """Plot TnA and Cashflows.
@@ -79,3 +83,30 @@ def plot_tna_cfs(path, tna, cfs):
     plt.savefig(file, **FIGKWARGS)
 
     plt.close()
+
+
+def create_window_plots(path, tna, cfs, return_total, summary):
+    """Create report plots of each window, in one folder per window.
+
+    Parameters
+    ----------
+    path : Path-like
+    tna : pandas.Series
+    cfs : pandas.Series
+    return_total : pandas.Series
+    summary : pandas.DataFrame
+        See degiro_wrapper.reporting.windows.compute_window_returns.
+    """
+    for window, (start, end) in summary[["start", "end"]].iterrows():
+        if pd.isna(start):
+            continue
+
+        path_window = path / f"window_{window}"
+        path_window.mkdir(exist_ok=True)
+
+        create_report_plots(
+            path_window,
+            tna=tna.loc[start:end],
+            cfs=cfs.loc[start:end],
+            return_total=rebase_return_total(return_total, start, end),
+        )
@@ -0,0 +1,275 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Risk
+
+# Trading days in a year
+PERIODS_YEAR = 252
+
+COLUMNS = [
+    Risk.VOLATILITY,
+    Risk.SHARPE,
+    Risk.SORTINO,
+    Risk.DRAWDOWN,
+    Risk.DRAWDOWN_DURATION,
+    Risk.MAX_DRAWDOWN,
+]
+
+
+def _combine(older, newer):
+    """Aggregate (max, min, max drawdown) of two consecutive segments."""
+    # Nothing to lose after levels wiped out
+    drop = newer[1] / older[0] - 1 if older[0] > 0 else 0.0
+    return (
+        max(older[0], newer[0]),
+        min(older[1], newer[1]),
+        min(older[2], newer[2], drop),
+    )
+
+
+class _SlidingDrawdown:
+    """Max drawdown of a sliding window of levels in amortized O(1).
+
+    A queue on two stacks: new levels are aggregated into the back, and
+    the front keeps the aggregate from each level to its end, rebuilt from
+    the back when it runs empty.
+    """
+
+    def __init__(self):
+        self._front = []
+        self._back = []
+        self._back_aggregate = None
+
+    def push(self, level):
+        item = (level, level, 0.0)
+        self._back.append(level)
+        if self._back_aggregate is None:
+            self._back_aggregate = item
+        else:
+            self._back_aggregate = _combine(self._back_aggregate, item)
+
+    def pop(self):
+        if not self._front:
+            aggregate = None
+            while self._back:
+                level = self._back.pop()
+                item = (level, level, 0.0)
+                aggregate = item if aggregate is None else _combine(item, aggregate)
+                self._front.append(aggregate)
+            self._back_aggregate = None
+
+        self._front.pop()
+
+    def max_drawdown(self):
+        if not self._front:
+            return self._back_aggregate[2]
+        if self._back_aggregate is None:
+            return self._front[-1][2]
+
+        return _combine(self._front[-1], self._back_aggregate)[2]
+
+
+class RollingRisk:
+    """Rolling risk metrics updated one day at a time.
+
+    Every new day updates the window mean and sum of squares with Welford's
+    method, adding the new return and removing the oldest one, so a series
+    of n days costs O(n) whatever the window. The drawdown is measured from
+    the running peak since the first day, the max drawdown within the window.
+
+    Missing or infinite daily returns count as 0 and returns of -1 or less
+    lose everything, as in TWRIndex. The level and the peak restart the day
+    after a total loss, so that later days are still defined.
+
+    The state can be saved with to_dict and restored with from_dict, to
+    continue when new days arrive.
+
+    Parameters
+    ----------
+    window : int, optional
+        Days in the window, by default PERIODS_YEAR.
+    periods_year : int, optional
+        Days in a year, to annualize, by default PERIODS_YEAR.
+    rate : float, optional
+        Annual risk-free rate of the Sharpe and Sortino ratios, by default 0.
+    """
+
+    def __init__(self, window=PERIODS_YEAR, periods_year=PERIODS_YEAR, rate=0.0):
+        if window < 2:
+            raise ValueError(f"Window must be at least 2 days, not {window}.")
+
+        self.window = window
+        self.periods_year = periods_year
+        self.rate = rate
+        self._rate_daily = (1 + rate) ** (1 / periods_year) - 1
+
+        self._returns = deque()
+        self._levels = deque()
+        self._drawdowns = _SlidingDrawdown()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside = 0.0
+
+        self.level = 1.0
+        self.peak = 1.0
+        self.duration = 0
+
+    def __len__(self):
+        return len(self._returns)
+
+    def _push(self, value, level):
+        self._returns.append(value)
+        self._levels.append(level)
+        self._drawdowns.push(level)
+
+        delta = value - self._mean
+        self._mean += delta / len(self._returns)
+        self._m2 += delta * (value - self._mean)
+        self._downside += min(value - self._rate_daily, 0.0) ** 2
+
+    def _pop(self):
+        value = self._returns.popleft()
+        self._levels.popleft()
+        self._drawdowns.pop()
+
+        if not self._returns:
+            self._mean = self._m2 = self._downside = 0.0
+            return
+
+        delta = value - self._mean
+        self._mean -= delta / len(self._returns)
+        self._m2 -= delta * (value - self._mean)
+        self._downside -= min(value - self._rate_daily, 0.0) ** 2
+
+    def _metrics(self):
+        size = len(self._returns)
+        drawdown = self.level / self.peak - 1
+
+        if size < self.window:
+            return [math.nan, math.nan, math.nan, drawdown, self.duration, math.nan]
+
+        scale = math.sqrt(self.periods_year)
+        std = math.sqrt(max(self._m2, 0.0) / (size - 1))
+        downside = math.sqrt(max(self._downside, 0.0) / size)
+        excess = self._mean - self._rate_daily
+
+        return [
+            std * scale,
+            excess / std * scale if std > 0 else math.nan,
+            excess / downside * scale if downside > 0 else math.nan,
+            drawdown,
+            self.duration,
+            self._drawdowns.max_drawdown(),
+        ]
+
+    def update(self, return_daily):
+        """Add new days and compute their metrics.
+
+        Parameters
+        ----------
+        return_daily : pandas.Series
+            Days after the last added one,
+            see degiro_wrapper.reporting.calculations.compute_return_daily.
+
+        Returns
+        -------
+        risk : pandas.DataFrame
+            Date x ["volatility", "sharpe", "sortino", "drawdown",
+            "drawdownDuration", "maxDrawdown"], ratios are annual and
+            missing until the window is full. The duration is in days.
+        """
+        returns = np.nan_to_num(
+            return_daily.to_numpy(dtype=float), nan=0.0, posinf=0.0, neginf=-1.0
+        )
+        returns = np.maximum(returns, -1.0)
+
+        rows = []
+        for value in returns.tolist():
+            self.level *= 1 + value
+            if self.level >= self.peak:
+                self.peak = self.level
+                self.duration = 0
+            else:
+                self.duration += 1
+
+            self._push(value, self.level)
+            if len(self._returns) > self.window:
+                self._pop()
+
+            rows.append(self._metrics())
+
+            if value == -1:
+                self.level = self.peak = 1.0
+                self.duration = 0
+
+        risk = pd.DataFrame(rows, index=return_daily.index, columns=COLUMNS)
+        risk[Risk.DRAWDOWN_DURATION] = risk[Risk.DRAWDOWN_DURATION].astype(int)
+
+        return risk
+
+    def to_dict(self):
+        """State to continue later, JSON serializable.
+
+        Returns
+        -------
+        state : dict
+        """
+        return {
+            "window": self.window,
+            "periodsYear": self.periods_year,
+            "rate": self.rate,
+            "returns": list(self._returns),
+            "levels": list(self._levels),
+            "level": self.level,
+            "peak": self.peak,
+            "duration": self.duration,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Restore the state saved with to_dict.
+
+        Parameters
+        ----------
+        state : dict
+
+        Returns
+        -------
+        risk : RollingRisk
+        """
+        risk = cls(
+            window=state["window"],
+            periods_year=state["periodsYear"],
+            rate=state["rate"],
+        )
+        for value, level in zip(state["returns"], state["levels"]):
+            risk._push(value, level)
+
+        risk.level = state["level"]
+        risk.peak = state["peak"]
+        risk.duration = state["duration"]
+
+        return risk
+
+
+def compute_rolling_risk(
+    return_daily, window=PERIODS_YEAR, periods_year=PERIODS_YEAR, rate=0.0
+):
+    """Compute rolling risk metrics of a full series, see RollingRisk.
+
+    Parameters
+    ----------
+    return_daily : pandas.Series
+    window : int, optional
+    periods_year : int, optional
+    rate : float, optional
+
+    Returns
+    -------
+    risk : pandas.DataFrame
+    """
+    return RollingRisk(window, periods_year=periods_year, rate=rate).update(
+        return_daily
+    )
@@ -0,0 +1,230 @@
+"""Spanish capital gains of the transactions, by tax year.
+
+Gains are computed with FIFO lots, the method required for homogeneous
+securities, on values in euros with the transaction costs: they add to the
+acquisition value and reduce the transmission value.
+
+Losses are not computable when homogeneous securities, the same ISIN, are
+bought within the two months before or after the sale (art. 33.5.f LIRPF).
+The loss is deferred to the replacement shares still held and computed as
+they are sold. Replacement shares are taken from the earliest purchase, and
+shares with deferred losses are the first sold of their purchase.
+"""
+
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Lots, Taxes
+from degiro_wrapper.reporting.lots import TOLERANCE, match_lots
+
+MONTHS_WASH_SALE = 2
+
+COLUMNS_SALES = [
+    Taxes.YEAR,
+    Lots.ISIN,
+    Taxes.DATE_SALE,
+    Taxes.DATE_BUY,
+    Lots.SHARES,
+    Lots.COST,
+    Lots.PROCEEDS,
+    Taxes.GAIN,
+    Taxes.DEFERRED,
+    Taxes.RELEASED,
+    Taxes.COMPUTABLE,
+]
+
+COLUMNS_YEARS = [
+    Taxes.GAINS,
+    Taxes.LOSSES,
+    Taxes.DEFERRED,
+    Taxes.RELEASED,
+    Taxes.COMPUTABLE,
+]
+
+
+def _next_available(skip, idx):
+    """First purchase from idx with shares available, compressing the path."""
+    root = idx
+    while skip[root] != root:
+        root = skip[root]
+    while skip[idx] != root:
+        skip[idx], idx = root, skip[idx]
+
+    return root
+
+
+def _defer_losses(sales, buys, months):
+    """Deferred and released losses of the sales of one ISIN, in time order.
+
+    Shares available as replacement never increase, so purchases without
+    them are skipped for good.
+
+    Parameters
+    ----------
+    sales : pandas.DataFrame
+        Matches of the ISIN sorted by sale, with their sale and purchase trades.
+    buys : pandas.DataFrame
+        Purchases of the ISIN sorted by date, with the shares of the lot
+        they opened, indexed by trade.
+    months : int
+
+    Returns
+    -------
+    deferred, released : list of float
+    """
+    position = {trade: idx for idx, trade in enumerate(buys.index)}
+
+    unsold = buys[Lots.SHARES].tolist()
+    sheltered = [0.0] * len(buys)
+    loss_sheltered = [0.0] * len(buys)
+    skip = list(range(len(buys) + 1))
+
+    # Purchases around each sale, all at once
+    dates = pd.DatetimeIndex(sales[Taxes.DATE_SALE])
+    offset = pd.DateOffset(months=months)
+    buy_dates = pd.DatetimeIndex(buys[Lots.DATE])
+    firsts = buy_dates.searchsorted(dates - offset, side="left").tolist()
+    lasts = buy_dates.searchsorted(dates + offset, side="right").tolist()
+
+    # Short lots are not purchases, their gains are always computable
+    lots = [position.get(trade) for trade in sales[Lots.TRADE_OPEN]]
+    shares = sales[Lots.SHARES].tolist()
+    gains = sales[Taxes.GAIN].tolist()
+    trades = sales[Lots.TRADE].to_numpy()
+
+    deferred = [0.0] * len(sales)
+    released = [0.0] * len(sales)
+
+    bounds = np.flatnonzero(np.diff(trades, prepend=-1)).tolist() + [len(sales)]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        rows = [
+            row
+            for row in range(start, stop)
+            if lots[row] is not None and shares[row] > 0
+        ]
+
+        # ---------------------------------------------------------------------
+        # Sell all the lots of the trade, shares with deferred losses first
+        for row in rows:
+            idx = lots[row]
+            if sheltered[idx] > 0:
+                shares_released = min(shares[row], sheltered[idx])
+                release = loss_sheltered[idx] * shares_released / sheltered[idx]
+                loss_sheltered[idx] -= release
+                sheltered[idx] -= shares_released
+                released[row] = release
+            unsold[idx] -= shares[row]
+            if unsold[idx] - sheltered[idx] <= TOLERANCE:
+                skip[idx] = idx + 1
+
+        # ---------------------------------------------------------------------
+        # Defer the losses to shares bought around the sale and still held
+        for row in rows:
+            if gains[row] >= 0:
+                continue
+
+            loss_share = gains[row] / shares[row]
+            pending = shares[row]
+            candidate = _next_available(skip, firsts[start])
+            while candidate < lasts[start] and pending > TOLERANCE:
+                taken = min(pending, unsold[candidate] - sheltered[candidate])
+                sheltered[candidate] += taken
+                loss_sheltered[candidate] += loss_share * taken
+                deferred[row] += loss_share * taken
+                pending -= taken
+
+                if unsold[candidate] - sheltered[candidate] <= TOLERANCE:
+                    skip[candidate] = candidate + 1
+                candidate = _next_available(skip, candidate)
+
+    return deferred, released
+
+
+def compute_capital_gains(transactions, months=MONTHS_WASH_SALE):
+    """Compute the capital gains of each sale, all the years in one pass.
+
+    Parameters
+    ----------
+    transactions : pandas.DataFrame
+        See degiro_wrapper.core.preprocess.clean_transactions.
+    months : int, optional
+        Months around a sale with purchases that defer its loss,
+        by default MONTHS_WASH_SALE.
+
+    Returns
+    -------
+    sales : pandas.DataFrame
+        One row per FIFO lot sold, with the tax year, the gain, the loss
+        deferred to the replacement shares, the deferred losses of earlier
+        sales released, and the computable gain.
+    """
+    trades, matches = match_lots(transactions, method=Lots.FIFO)
+
+    sales = pd.DataFrame(
+        {
+            Lots.TRADE: matches[Lots.TRADE],
+            Lots.TRADE_OPEN: matches[Lots.TRADE_OPEN],
+            Lots.ISIN: trades[Lots.ISIN].to_numpy()[matches[Lots.TRADE]],
+            Taxes.DATE_SALE: trades[Lots.DATE].to_numpy()[matches[Lots.TRADE]],
+            Taxes.DATE_BUY: trades[Lots.DATE].to_numpy()[matches[Lots.TRADE_OPEN]],
+            # Float also without sales
+            Lots.SHARES: matches[Lots.SHARES].astype(float),
+            Lots.COST: matches[Lots.COST].astype(float),
+            Lots.PROCEEDS: matches[Lots.PROCEEDS].astype(float),
+        }
+    )
+    sales[Taxes.GAIN] = sales[Lots.PROCEEDS] - sales[Lots.COST]
+    sales[Taxes.YEAR] = sales[Taxes.DATE_SALE].dt.year
+
+    # -------------------------------------------------------------------------
+    # Purchases and the shares of the lot they opened, the rest closed shorts
+    closed = matches.groupby(Lots.TRADE)[Lots.SHARES].sum()
+    buys = trades.loc[trades[Lots.SHARES] > 0, [Lots.DATE, Lots.ISIN, Lots.SHARES]]
+    buys[Lots.SHARES] += closed.reindex(buys.index, fill_value=0.0)
+    buys = buys.loc[buys[Lots.SHARES] > 0]
+
+    deferred = pd.Series(0.0, index=sales.index)
+    released = pd.Series(0.0, index=sales.index)
+    buys_isin = dict(list(buys.groupby(Lots.ISIN)))
+    for isin, sales_isin in sales.groupby(Lots.ISIN):
+        if isin not in buys_isin:
+            continue
+        _deferred, _released = _defer_losses(sales_isin, buys_isin[isin], months)
+        deferred.loc[sales_isin.index] = _deferred
+        released.loc[sales_isin.index] = _released
+
+    sales[Taxes.DEFERRED] = deferred
+    sales[Taxes.RELEASED] = released
+    sales[Taxes.COMPUTABLE] = sales[Taxes.GAIN] - deferred + released
+
+    sales = sales.sort_values([Taxes.DATE_SALE, Lots.ISIN], kind="stable")
+
+    return sales[COLUMNS_SALES].reset_index(drop=True)
+
+
+def compute_tax_years(sales):
+    """Summarize the capital gains by tax year.
+
+    Parameters
+    ----------
+    sales : pandas.DataFrame
+        See compute_capital_gains.
+
+    Returns
+    -------
+    years : pandas.DataFrame
+        Year x ["gains", "losses", "deferred", "released", "computable"],
+        gains and losses before deferring.
+    """
+    gain = sales[Taxes.GAIN]
+    years = pd.DataFrame(
+        {
+            Taxes.GAINS: gain.clip(lower=0),
+            Taxes.LOSSES: gain.clip(upper=0),
+            Taxes.DEFERRED: sales[Taxes.DEFERRED],
+            Taxes.RELEASED: sales[Taxes.RELEASED],
+            Taxes.COMPUTABLE: sales[Taxes.COMPUTABLE],
+        }
+    )
+    years = years.groupby(sales[Taxes.YEAR]).sum()
+
+    return years[COLUMNS_YEARS]
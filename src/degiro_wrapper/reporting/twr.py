@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Calculations
+
+FREQUENCIES = {"monthly": "M", "quarterly": "Q", "yearly": "Y"}
+
+
+class TWRIndex:
+    """Time-weighted return between any two dates in constant time.
+
+    The cumulative log-return is precomputed once, so the return between
+    two dates is the exponential of the difference of two of its values.
+
+    Dates are taken as-of: a date without return maps to the last date
+    before it. The start date is the base, its own return is not included.
+
+    Missing daily returns count as 0, as in compute_return_total. Days
+    losing everything are counted apart, so that windows after them are
+    still defined.
+
+    Parameters
+    ----------
+    return_daily : pandas.Series
+        See degiro_wrapper.reporting.calculations.compute_return_daily.
+    """
+
+    def __init__(self, return_daily):
+        return_daily = return_daily.sort_index()
+
+        self.dates = pd.DatetimeIndex(return_daily.index)
+
+        returns = np.nan_to_num(return_daily.to_numpy(dtype=float), nan=0.0)
+        wiped = returns <= -1
+        self.log_total = np.cumsum(np.log1p(np.where(wiped, 0.0, returns)))
+        self._wiped_total = np.cumsum(wiped)
+
+        # Exact dates are found by hash, other dates by binary search
+        self._positions = {date: idx for idx, date in enumerate(self.dates)}
+
+    def __len__(self):
+        return len(self.dates)
+
+    def _twr(self, idx_start, idx_end):
+        """Return between positions, -1 if a day in between lost everything."""
+        twr = np.expm1(self.log_total[idx_end] - self.log_total[idx_start])
+        return np.where(
+            self._wiped_total[idx_end] > self._wiped_total[idx_start], -1.0, twr
+        )
+
+    def _locate(self, dates):
+        """Position of the last date on or before each date, -1 if none."""
+        dates = pd.DatetimeIndex(np.atleast_1d(dates))
+
+        positions = self.dates.get_indexer(dates)
+        missing = positions < 0
+        if missing.any():
+            positions[missing] = (
+                self.dates.searchsorted(dates[missing], side="right") - 1
+            )
+
+        return positions
+
+    def query(self, start, end):
+        """Time-weighted return between two dates.
+
+        Parameters
+        ----------
+        start : Datetime-like
+            Base date, clipped to the first date.
+        end : Datetime-like
+
+        Returns
+        -------
+        twr : float
+            NaN if end is before the first date.
+        """
+        idx_start = self._positions.get(pd.Timestamp(start))
+        idx_end = self._positions.get(pd.Timestamp(end))
+
+        if idx_start is None:
+            idx_start = self._locate(start)[0]
+        if idx_end is None:
+            idx_end = self._locate(end)[0]
+
+        if idx_end < 0:
+            return np.nan
+
+        return float(self._twr(max(idx_start, 0), idx_end))
+
+    def query_many(self, starts, ends):
+        """Time-weighted return of many windows at once.
+
+        Parameters
+        ----------
+        starts : list-like of Datetime-like
+            Base dates, clipped to the first date.
+        ends : list-like of Datetime-like
+
+        Returns
+        -------
+        twr : numpy.ndarray
+        """
+        idx_start = np.maximum(self._locate(starts), 0)
+        idx_end = self._locate(ends)
+
+        twr = self._twr(idx_start, idx_end)
+        twr[idx_end < 0] = np.nan
+
+        return twr
+
+    def period_returns(self, freq):
+        """Return of each calendar period.
+
+        Each period starts at the last date of the previous one,
+        the first period at the first date.
+
+        Parameters
+        ----------
+        freq : {"M", "Q", "Y"} or {"monthly", "quarterly", "yearly"}
+
+        Returns
+        -------
+        returns : pandas.Series
+            Indexed by period.
+        """
+        freq = FREQUENCIES.get(freq, freq)
+
+        periods = self.dates.to_period(freq)
+        if periods.empty:
+            return pd.Series(index=periods, dtype=float, name=Calculations.RETURN_TOTAL)
+
+        # Last date of each period
+        last = np.flatnonzero(periods[1:] != periods[:-1])
+        last = np.append(last, len(self.dates) - 1)
+
+        first = np.concatenate([[0], last[:-1]])
+
+        returns = pd.Series(
+            self._twr(first, last),
+            index=periods[last],
+            name=Calculations.RETURN_TOTAL,
+        )
+
+        return returns
+
+    def monthly_table(self):
+        """Monthly returns by year, with the yearly return in the last column.
+
+        Returns
+        -------
+        table : pandas.DataFrame
+            Year x [1, ..., 12, "year"].
+        """
+        monthly = self.period_returns("M")
+        yearly = self.period_returns("Y")
+
+        table = pd.DataFrame(
+            {
+                "year": monthly.index.year,
+                "month": monthly.index.month,
+                "value": monthly.to_numpy(),
+            }
+        )
+        table = table.pivot(index="year", columns="month", values="value")
+        table = table.reindex(columns=range(1, 13))
+        table["year"] = yearly.to_numpy()
+        table.columns.name = None
+
+        return table
@@ -1,14 +1,16 @@
+import pandas as pd
 from degiro_wrapper.conventions import Positions, Transactions
 
 
-def filter_positions(positions, isins, start=None, end=None):
+def filter_positions(positions, isins=None, start=None, end=None):
     """Remove positions out of reporting period.
 
     Parameters
     ----------
     positions : pandas.DataFrame
-    isins : list-like
-        ISIN values in the portfolio.
+    isins : list-like, optional
+        ISIN values in the portfolio, by default all the positions,
+        cash included.
     start : Datetime-like, optional
         by default None
     end : Datetime-like, optional
@@ -21,8 +23,9 @@ def filter_positions(positions, isins, start=None, end=None):
 
     # -------------------------------------------------------------------------
     # Keep positions related to portfolio
-    mask_isins = positions[Positions.ISIN].isin(isins)
-    positions = positions.loc[mask_isins]
+    if isins is not None:
+        mask_isins = positions[Positions.ISIN].isin(isins)
+        positions = positions.loc[mask_isins]
 
     # -------------------------------------------------------------------------
     # Trim in time
@@ -41,7 +44,7 @@ def filter_positions(positions, isins, start=None, end=None):
     return positions
 
 
-def filter_transactions(transactions, isins, start=None, end=None):
+def filter_transactions(transactions, isins, start=None, end=None, keep=()):
     """Remove transactions out of reporting period.
 
     Parameters
@@ -53,6 +56,8 @@ def filter_transactions(transactions, isins, start=None, end=None):
         by default None
     end : Datetime-like, optional
         by default None
+    keep : list-like, optional
+        Columns to keep among the unnecessary ones, by default none.
 
     Returns
     -------
@@ -73,6 +78,7 @@ def filter_transactions(transactions, isins, start=None, end=None):
         Transactions.TRANSACTION_COSTS_CCY,
         Transactions.VALUE_LOCAL_CCY,
     ]
+    drop_columns = [column for column in drop_columns if column not in keep]
     transactions = transactions.drop(drop_columns, axis=1)
 
     # -------------------------------------------------------------------------
@@ -95,3 +101,26 @@ def filter_transactions(transactions, isins, start=None, end=None):
         transactions = transactions.loc[mask]
 
     return transactions
+
+
+def build_membership(portfolios):
+    """Build the portfolio membership matrix.
+
+    Parameters
+    ----------
+    portfolios : dict
+        Portfolio name to ISIN values in the portfolio.
+
+    Returns
+    -------
+    membership : pandas.DataFrame
+        ISIN x portfolio matrix, 1 if the ISIN belongs to the portfolio.
+    """
+    isins = [(isin, name) for name, values in portfolios.items() for isin in values]
+    isins = pd.DataFrame(isins, columns=[Positions.ISIN, "portfolio"])
+
+    membership = pd.crosstab(isins[Positions.ISIN], isins["portfolio"]).clip(upper=1)
+    membership = membership.reindex(columns=list(portfolios), fill_value=0)
+    membership.columns.name = None
+
+    return membership
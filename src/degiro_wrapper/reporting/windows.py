@@ -0,0 +1,129 @@
+import re
+
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Calculations
+from degiro_wrapper.reporting.twr import TWRIndex
+
+MTD = "MTD"
+QTD = "QTD"
+YTD = "YTD"
+ITD = "ITD"
+
+# Default windows, "<n>Y" are trailing windows of n years
+WINDOWS = [MTD, QTD, YTD, "1Y", "3Y", ITD]
+
+PATTERN_YEARS = re.compile(r"^(\d+)Y$")
+
+COLUMNS = ["start", "end", Calculations.RETURN_TOTAL]
+
+
+def window_boundary(window, end):
+    """First calendar date of a window, see compute_window_returns.
+
+    Parameters
+    ----------
+    window : str
+        "MTD", "QTD", "YTD", "ITD" (since inception) or "<n>Y", e.g. "3Y".
+    end : Datetime-like
+        Last date of the window.
+
+    Returns
+    -------
+    boundary : pandas.Timestamp or None
+        None for "ITD".
+    """
+    end = pd.Timestamp(end)
+
+    if window == ITD:
+        return None
+    if window == MTD:
+        return end.to_period("M").start_time
+    if window == QTD:
+        return end.to_period("Q").start_time
+    if window == YTD:
+        return end.to_period("Y").start_time
+
+    match = PATTERN_YEARS.match(window)
+    if match is None:
+        raise ValueError(f"Unknown window {window!r}, use one of {WINDOWS}.")
+
+    years = int(match.group(1))
+    return end - pd.DateOffset(years=years) + pd.Timedelta(days=1)
+
+
+def compute_window_returns(return_daily, windows=WINDOWS, end=None):
+    """Compute the total return of many windows from one return series.
+
+    All the windows are queried at once from a single TWRIndex, so days
+    losing everything or without return are handled as there. A window
+    starts at the close of its base date, the last date before the window
+    boundary, or at inception if there is none.
+
+    Parameters
+    ----------
+    return_daily : pandas.Series
+        See degiro_wrapper.reporting.calculations.compute_return_daily.
+    windows : list of str, optional
+        See window_boundary, by default WINDOWS.
+    end : Datetime-like, optional
+        Last date of the windows, by default the last date of the series.
+
+    Returns
+    -------
+    summary : pandas.DataFrame
+        Window x ["start", "end", "returnTotal"], "start" is the base date.
+    """
+    index = TWRIndex(return_daily)
+    dates = index.dates
+
+    if end is None:
+        idx_end = len(dates) - 1
+    else:
+        idx_end = dates.searchsorted(pd.Timestamp(end), side="right") - 1
+
+    summary = pd.DataFrame(
+        index=pd.Index(windows, name="window"),
+        columns=COLUMNS,
+    )
+    summary["start"] = summary["end"] = pd.NaT
+    summary[Calculations.RETURN_TOTAL] = np.nan
+
+    if idx_end < 0 or not len(windows):
+        return summary
+
+    starts = []
+    for window in windows:
+        boundary = window_boundary(window, dates[idx_end])
+        if boundary is None:
+            idx_start = 0
+        else:
+            idx_start = max(dates.searchsorted(boundary, side="left") - 1, 0)
+        starts.append(dates[idx_start])
+
+    ends = [dates[idx_end]] * len(windows)
+
+    summary["start"] = starts
+    summary["end"] = ends
+    summary[Calculations.RETURN_TOTAL] = index.query_many(starts, ends)
+
+    return summary
+
+
+def rebase_return_total(return_total, start, end):
+    """Total return series of a window, zero at its start.
+
+    Parameters
+    ----------
+    return_total : pandas.Series
+    start, end : Datetime-like
+        Base and last dates, see compute_window_returns.
+
+    Returns
+    -------
+    return_total : pandas.Series
+    """
+    growth = return_total.loc[start:end].add(1)
+    return_total = growth.div(growth.iloc[0]).sub(1)
+
+    return return_total
@@ -0,0 +1,93 @@
+import os
+
+import pandas as pd
+from degiro_wrapper.core import preprocess
+from degiro_wrapper.core.cache import ParsedFileCache
+from degiro_wrapper.core.preprocess import cache_keys_positions, clean_positions
+from pandas.testing import assert_frame_equal
+
+RAW_POSITIONS = (
+    "Producto,Symbol/ISIN,Cantidad,Precio de,Valor local,Valor en EUR\n"
+    'AIRBUS GROUP,NL0000235190,3,"100,98",EUR 302.94,"302,94"\n'
+)
+
+
+def test_cache_key_depends_on_content_and_version(tmp_path):
+
+    file = tmp_path / "positions_2020-01-02.csv"
+    file.write_text("a,b\n1,2\n")
+
+    cache = ParsedFileCache(tmp_path / "cache", version="1")
+    key = cache.key(file)
+
+    assert key != ParsedFileCache(tmp_path / "cache", version="2").key(file)
+
+    file.write_text("a,b\n1,3\n")
+    assert key != cache.key(file)
+
+
+def test_cache_key_depends_on_options(tmp_path):
+
+    file = tmp_path / "positions_2020-01-02.csv"
+    file.write_text("a,b\n1,2\n")
+
+    cache = ParsedFileCache(tmp_path / "cache", version="1")
+    keys = {
+        cache.key(file, engine=engine, locale=locale)
+        for engine in ["c", "pyarrow"]
+        for locale in ["ES", "EN"]
+    }
+
+    assert len(keys) == 4
+    assert cache.key(file, engine="c", locale="ES") == cache.key(
+        file, locale="ES", engine="c"
+    )
+
+
+def test_clean_positions_hashes_files_once(tmp_path, monkeypatch):
+
+    for day in ["2020-01-02", "2020-01-03"]:
+        (tmp_path / f"positions_{day}.csv").write_text(RAW_POSITIONS, encoding="utf-8")
+
+    cache = ParsedFileCache(tmp_path / "cache", version="1")
+    expected = clean_positions(tmp_path)
+
+    hashed = []
+    key = ParsedFileCache.key
+    monkeypatch.setattr(
+        ParsedFileCache,
+        "key",
+        lambda self, file, **options: hashed.append(file) or key(self, file, **options),
+    )
+
+    keys = cache_keys_positions(tmp_path, cache)
+    result = clean_positions(tmp_path, cache=cache, keys=keys)
+    assert len(hashed) == 2
+    assert_frame_equal(expected, result)
+
+    # Second run is read from the cache
+    monkeypatch.setattr(preprocess, "clean_positions_file", None)
+    result = clean_positions(tmp_path, cache=cache)
+    assert len(hashed) == 4
+    assert_frame_equal(expected, result)
+
+
+def test_cache_get_set_and_evict(tmp_path):
+
+    frame = pd.DataFrame({"a": range(100)})
+
+    cache = ParsedFileCache(tmp_path, version="1")
+    assert cache.get("first") is None
+
+    cache.set("first", frame)
+    assert_frame_equal(frame, cache.get("first"))
+
+    # Older than any new entry, whatever the mtime resolution
+    os.utime(tmp_path / "first.pkl", (0, 0))
+
+    # Room for a single entry
+    cache.max_size = (tmp_path / "first.pkl").stat().st_size
+    cache.set("second", frame)
+
+    assert cache.get("first") is None
+    assert_frame_equal(frame, cache.get("second"))
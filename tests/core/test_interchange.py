@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.core.interchange import read_db, write_db
+from pandas.testing import assert_frame_equal
+
+pytest.importorskip("pyarrow")
+
+FRAME = pd.DataFrame(
+    {
+        "date": pd.to_datetime(["2020-01-02", "2020-01-02", "2020-01-03"]),
+        "ISIN": ["NL0000235190", np.nan, "NL0000235190"],
+        "valuePortfolio": [302.94, 0.17, 305.1],
+    }
+)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".arrow"])
+def test_write_read_db(tmp_path, suffix):
+
+    path = tmp_path / f"db{suffix}"
+    write_db(FRAME, path)
+
+    frame = read_db(path, dates=["date"])
+    assert_frame_equal(frame, FRAME)
+
+    frame = read_db(path, dates=["date"], columns=["date", "valuePortfolio"])
+    assert_frame_equal(frame, FRAME[["date", "valuePortfolio"]])
+
+
+def test_read_db_zero_copy(tmp_path):
+
+    path = tmp_path / "db.arrow"
+    write_db(FRAME, path)
+
+    values = read_db(path)["valuePortfolio"].to_numpy()
+
+    # Backed by the memory-mapped file, not by a pandas block
+    assert not values.flags.owndata
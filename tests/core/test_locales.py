@@ -0,0 +1,54 @@
+import pytest
+from degiro_wrapper.conventions import CashflowType, Cashflows
+from degiro_wrapper.core.locales import (
+    CASHFLOWS,
+    POSITIONS,
+    compile_plan,
+    detect_locale,
+)
+from degiro_wrapper.core.preprocess import clean_cashflows
+from degiro_wrapper.core.readers import read_cashflows_raw, read_header
+
+RAW_CASHFLOWS_EN = (
+    "Date,Time,Value date,Product,ISIN,Description,FX,Change,,Balance,,Order Id\n"
+    "02-01-2020,09:05,02-01-2020,AIRBUS GROUP,NL0000235190,"
+    '"Buy 3 AIRBUS GROUP@100,98 EUR (NL0000235190)",,EUR,"-302,94",EUR,"0,17",\n'
+    '03-01-2020,00:00,03-01-2020,,,Deposit,,EUR,"500,00",EUR,"500,17",\n'
+)
+
+
+def test_detect_locale():
+
+    header = ["Producto", "Symbol/ISIN", "Cantidad", "Precio de"]
+    header += ["Valor local", "Valor en EUR"]
+    assert detect_locale(header, POSITIONS) == "ES"
+
+    with pytest.raises(ValueError):
+        detect_locale(["Producto", "Symbol/ISIN"], POSITIONS)
+
+
+def test_compile_plan():
+
+    assert compile_plan("EN", CASHFLOWS) is compile_plan("EN", CASHFLOWS)
+
+    with pytest.raises(ValueError):
+        compile_plan("XX", CASHFLOWS)
+
+
+def test_clean_cashflows_en(tmp_path):
+
+    path = tmp_path / "cashflows.csv"
+    path.write_text(RAW_CASHFLOWS_EN, encoding="utf-8")
+
+    locale = detect_locale(read_header(path), CASHFLOWS)
+    assert locale == "EN"
+
+    raw = read_cashflows_raw(path, locale=locale)
+    clean = clean_cashflows(raw, locale=locale)
+
+    assert list(clean.columns) == list(compile_plan(locale, CASHFLOWS).raw)
+    assert clean[Cashflows.DELTA].tolist() == [-302.94, 500.0]
+    assert clean[Cashflows.TYPE].tolist() == [
+        CashflowType.BUY,
+        CashflowType.DEPOSIT,
+    ]
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.core.model import compute_weights, compute_weights_batch
+from degiro_wrapper.reporting.utils import build_membership
+from pandas.testing import assert_frame_equal
+
+AMOUNTS = pd.DataFrame(
+    {
+        "IE1": [10.0, 20.0, np.nan],
+        "IE2": [30.0, np.nan, np.nan],
+        "LU3": [60.0, 80.0, np.nan],
+        "CASH": [100.0, 100.0, 50.0],
+    },
+    index=pd.bdate_range("2021-01-04", periods=3),
+)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"isin_cash": "CASH"}, {"regex": "^IE"}, {"isin_cash": "CASH", "regex": "3"}],
+)
+def test_compute_weights(kwargs):
+
+    weights = compute_weights(AMOUNTS, **kwargs)
+
+    amounts = AMOUNTS.drop(columns=kwargs.get("isin_cash", []))
+    if "regex" in kwargs:
+        amounts = amounts.filter(regex=kwargs["regex"])
+    expected = amounts.div(amounts.sum(axis=1), axis="index")
+
+    assert_frame_equal(weights, expected)
+
+
+def test_compute_weights_batch():
+
+    membership = build_membership({"a": ["LU3", "IE1"], "b": ["IE2", "CASH", "XX"]})
+
+    weights = compute_weights_batch(AMOUNTS, membership)
+
+    assert weights.columns.tolist() == [
+        ("a", "IE1"),
+        ("a", "LU3"),
+        ("b", "IE2"),
+        ("b", "CASH"),
+    ]
+    assert weights.iloc[0].tolist() == pytest.approx([1 / 7, 6 / 7, 3 / 13, 10 / 13])
+
+    # Not held weighs 0, missing without positions
+    assert weights.iloc[1].tolist() == pytest.approx([0.2, 0.8, 0.0, 1.0])
+    assert weights.loc[:, "a"].iloc[2].isna().all()
+
+    # Each portfolio as compute_weights
+    expected = compute_weights(AMOUNTS[["IE1", "LU3"]].fillna(0.0))
+    assert_frame_equal(weights["a"].iloc[:2], expected.iloc[:2], check_names=False)
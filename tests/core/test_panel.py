@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.core.panel import PositionsPanel, build_panel
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+LONG = pd.DataFrame(
+    {
+        "date": pd.to_datetime(
+            ["2020-01-03", "2020-01-03", "2020-01-06", "2020-01-06", "2020-01-07"]
+        ),
+        "ISIN": [np.nan, "IE00B4L5Y983", "IE00B4L5Y983", "NL0000235190", np.nan],
+        "amount": [10.0, 100.0, 110.0, 50.0, 12.0],
+        "shares": [np.nan, 2.0, 2.0, 1.0, np.nan],
+    }
+)
+
+
+def test_build_panel():
+
+    panel = build_panel(LONG, index="date", columns="ISIN", values=["amount", "shares"])
+
+    assert panel.shape == (3, 3, 2)
+    for field in ["amount", "shares"]:
+        expected = LONG.pivot(index="date", columns="ISIN", values=field)
+        assert_frame_equal(expected, panel[field])
+
+    # Fields are views over the panel array
+    assert np.shares_memory(panel["shares"].to_numpy(), panel.values)
+
+
+def test_build_panel_asfreq():
+
+    panel = build_panel(LONG, index="date", columns="ISIN", values=["amount"])
+    panel = panel.asfreq("B")
+
+    expected = LONG.pivot(index="date", columns="ISIN", values="amount").asfreq("B")
+
+    assert_frame_equal(expected, panel["amount"], check_freq=False)
+
+
+def test_build_panel_duplicates():
+
+    long = pd.concat([LONG, LONG.iloc[[0]]])
+
+    with pytest.raises(ValueError):
+        build_panel(long, index="date", columns="ISIN", values=["amount"])
+
+
+def test_positions_panel_is_lazy():
+
+    long = LONG.assign(price=LONG["amount"] / LONG["shares"])
+    panel = PositionsPanel(long)
+
+    expected = LONG.pivot(index="date", columns="ISIN", values="amount")
+    expected = expected.asfreq("B").sum(axis=1, min_count=1)
+
+    assert_series_equal(expected, panel.tna, check_freq=False)
+    assert "_nav" not in vars(panel)
+
+    amount = long.pivot(index="date", columns="ISIN", values="amount")
+    shares = long.pivot(index="date", columns="ISIN", values="shares")
+    expected = (amount / shares).dropna(axis=1, how="all").asfreq("B")
+
+    assert_frame_equal(expected, panel.nav, check_freq=False)
+    assert "_nav" in vars(panel)
+
+
+def test_positions_panel_tna_missing_dates():
+
+    long = LONG.loc[LONG["date"] != "2020-01-06"]
+    panel = PositionsPanel(long.assign(price=long["amount"] / long["shares"]))
+
+    # A date without positions is not a total loss
+    assert panel.tna.tolist() == pytest.approx([110.0, np.nan, 12.0], nan_ok=True)
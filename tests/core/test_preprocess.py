@@ -1,52 +1,19 @@
 import numpy as np
 import pandas as pd
-from degiro_wrapper.conventions import PositionsRaw
-from degiro_wrapper.core.preprocess import extract_numbers, replace_values
-from pandas.testing import assert_frame_equal
-
-TEMPLATE = {
-    "Producto": {
-        0: "CASH & CASH FUND & FTX CASH (EUR)",
-        1: "AIRBUS GROUP",
-        2: "ISHARES MSCI EUR A",
-        3: "ISHARES MSCI WOR A",
-        4: "SP 500 EH",
-        5: "XTRACKERS II EUROZONE GOVERNMEN...",
-    },
-    "Symbol/ISIN": {
-        0: np.nan,
-        1: "NL0000235190",
-        2: "IE00B4K48X80",
-        3: "IE00B4L5Y983",
-        4: "IE00B3ZW0K18",
-        5: "LU0290355717",
-    },
-    "Cantidad": {0: np.nan, 1: 3.0, 2: 14.0, 3: 7.0, 4: 9.0, 5: 1.0},
-    "Precio de": {
-        0: np.nan,
-        1: "100,98",
-        2: "63,34",
-        3: "74,48",
-        4: "91,50",
-        5: "229,44",
-    },
-    "Valor local": {
-        0: "EUR 0.17",
-        1: "EUR 302.94",
-        2: "EUR 886.69",
-        3: "EUR 521.33",
-        4: "EUR 823.49",
-        5: "EUR 229.44",
-    },
-    "Valor en EUR": {
-        0: "0,17",
-        1: "302,94",
-        2: "886,69",
-        3: "521,32",
-        4: "823,49",
-        5: "229,44",
-    },
-}
+import pytest
+from degiro_wrapper.conventions import CashflowType, Cashflows, PositionsRaw
+from degiro_wrapper.core.preprocess import (
+    classify_cashflows,
+    clean_cashflows,
+    clean_cashflows_chunked,
+    extract_numbers,
+    generate_cashflows,
+    replace_values,
+)
+from degiro_wrapper.core.readers import read_cashflows_raw
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from ..helpers import RAW_CASHFLOWS, TEMPLATE
 
 
 def test_replace_values():
@@ -179,3 +146,152 @@ def test_extract_numbers():
     expected = pd.DataFrame(expected)
 
     assert_frame_equal(expected, raw)
+
+
+def test_classify_cashflows():
+
+    descriptions = pd.Series(
+        [
+            "Compra 3 AIRBUS GROUP@100,98 EUR (NL0000235190)",
+            "Venta 3 AIRBUS GROUP@100,98 EUR (NL0000235190)",
+            "Dividendo",
+            "Retención del dividendo",
+            "Ingreso Cambio de Divisa",
+            "Ingreso",
+            "Retirada",
+            "Costes de transacción",
+            "Interés",
+            "Unknown",
+            np.nan,
+            "Ingreso",
+        ],
+        name="description",
+    )
+
+    types = classify_cashflows(descriptions)
+
+    expected = pd.Series(
+        [
+            CashflowType.BUY,
+            CashflowType.SELL,
+            CashflowType.DIVIDEND,
+            CashflowType.DIVIDEND_TAX,
+            CashflowType.FX,
+            CashflowType.DEPOSIT,
+            CashflowType.WITHDRAWAL,
+            CashflowType.FEE,
+            CashflowType.INTEREST,
+            None,
+            None,
+            CashflowType.DEPOSIT,
+        ],
+        name="description",
+    )
+
+    assert_series_equal(expected, types)
+
+
+def test_generate_cashflows(tmp_path):
+
+    isin_cash = "NL0011280581"
+    cashflows = pd.DataFrame(
+        {
+            Cashflows.DATE: pd.to_datetime(
+                [
+                    "2020-01-02",
+                    "2020-01-03",
+                    "2020-01-03",
+                    "2020-01-06",
+                    "2020-01-07",
+                    "2020-01-07",
+                ]
+            ),
+            # Booked after their value date
+            Cashflows.DATE_VALUE: pd.to_datetime(
+                [
+                    "2020-01-02",
+                    "2020-01-02",
+                    "2020-01-03",
+                    "2020-01-06",
+                    "2020-01-06",
+                    "2020-01-07",
+                ]
+            ),
+            Cashflows.ISIN: [
+                "NL0000235190",
+                isin_cash,
+                np.nan,
+                "NL0000235190",
+                isin_cash,
+                np.nan,
+            ],
+            Cashflows.TYPE: [
+                CashflowType.BUY,
+                None,
+                CashflowType.DEPOSIT,
+                CashflowType.SELL,
+                None,
+                CashflowType.WITHDRAWAL,
+            ],
+            Cashflows.DELTA: [-302.94, 10.0, 500.0, 5.0, -3.0, -100.0],
+            # Rows without amount are not changes in position
+            Cashflows.AMOUNT: [0.17, 10.17, 500.17, np.nan, 7.17, 400.17],
+        }
+    )
+
+    cashflows_df, cashflows_external_df = generate_cashflows(cashflows, isin_cash)
+
+    # Cash is shifted by one day
+    expected = pd.DataFrame(
+        {
+            "NL0000235190": [-302.94, np.nan, np.nan],
+            isin_cash: [np.nan, 10.0, np.nan],
+        },
+        index=pd.to_datetime(["2020-01-02", "2020-01-03", "2020-01-06"]),
+    )
+    expected.index.name = Cashflows.DATE
+    expected.columns.name = Cashflows.ISIN
+
+    assert_frame_equal(expected, cashflows_df, check_freq=False)
+    assert_frame_equal(cashflows.loc[[2, 5]], cashflows_external_df)
+
+    # Same from the cashflows database
+    path = tmp_path / "db_cashflows.csv"
+    cashflows.to_csv(path, index=False)
+
+    cashflows_df_db, cashflows_external_df_db = generate_cashflows(path, isin_cash)
+
+    assert_frame_equal(cashflows_df, cashflows_df_db)
+    assert_frame_equal(
+        cashflows_external_df.reset_index(drop=True),
+        cashflows_external_df_db.reset_index(drop=True),
+    )
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 10])
+def test_clean_cashflows_chunked(tmp_path, chunksize):
+
+    path = tmp_path / "cashflows.csv"
+    path.write_text(RAW_CASHFLOWS, encoding="utf-8")
+
+    path_chunked = tmp_path / "chunked.csv"
+    clean_cashflows_chunked(path, path_chunked, chunksize=chunksize)
+
+    path_full = tmp_path / "full.csv"
+    clean_cashflows(read_cashflows_raw(path)).to_csv(path_full, index=False)
+
+    assert path_chunked.read_bytes() == path_full.read_bytes()
+
+
+def test_clean_cashflows_chunked_header_only(tmp_path):
+
+    path = tmp_path / "cashflows.csv"
+    path.write_text(RAW_CASHFLOWS.splitlines(keepends=True)[0], encoding="utf-8")
+
+    path_chunked = tmp_path / "chunked.csv"
+    clean_cashflows_chunked(path, path_chunked, chunksize=1)
+
+    path_full = tmp_path / "full.csv"
+    clean_cashflows(read_cashflows_raw(path)).to_csv(path_full, index=False)
+
+    assert path_chunked.read_bytes() == path_full.read_bytes()
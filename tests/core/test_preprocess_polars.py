@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.core.preprocess import (
+    clean_cashflows,
+    clean_positions,
+    clean_transactions,
+)
+from degiro_wrapper.core.readers import read_cashflows_raw, read_transactions_raw
+from pandas.testing import assert_frame_equal
+
+from ..helpers import RAW_CASHFLOWS, TEMPLATE
+
+pytest.importorskip("polars")
+
+from degiro_wrapper.core import preprocess_polars  # noqa: E402
+
+RAW_TRANSACTIONS = (
+    "Fecha,Hora,Producto,ISIN,Bolsa de,Centro de ejecución,Número,Precio,,Valor local,,"
+    "Valor,,Tipo de cambio,Costes de transacción,,Total,,ID Orden\n"
+    "02-01-2020,09:05,AIRBUS GROUP,NL0000235190,EAM,XAMS,3,100.98,EUR,"
+    "302.94,EUR,302.94,EUR,,-2.0,EUR,-304.94,EUR,abc\n"
+    "03-01-2020,,SP 500 EH,IE00B3ZW0K18,XET,XETA,-1,91.5,EUR,"
+    "91.5,EUR,91.5,EUR,,,,91.5,EUR,\n"
+)
+
+
+def test_clean_positions(tmp_path):
+
+    raw = pd.DataFrame(TEMPLATE)
+    for date in ["2020-01-02", "2020-01-03"]:
+        raw.to_csv(tmp_path / f"positions_{date}.csv", index=False)
+    (tmp_path / "positions_2020-01-06.csv").write_text("")
+
+    expected = clean_positions(tmp_path)
+    result = preprocess_polars.clean_positions(tmp_path)
+
+    key = ["date", "ISIN", "name"]
+    assert_frame_equal(
+        expected.sort_values(key).reset_index(drop=True),
+        result.sort_values(key).reset_index(drop=True),
+    )
+
+
+def test_clean_cashflows(tmp_path):
+
+    path = tmp_path / "cashflows.csv"
+    path.write_text(RAW_CASHFLOWS, encoding="utf-8")
+
+    expected = clean_cashflows(read_cashflows_raw(path))
+    result = preprocess_polars.clean_cashflows(path)
+
+    assert_frame_equal(expected, result)
+
+
+def test_clean_transactions(tmp_path):
+
+    path = tmp_path / "transactions.csv"
+    path.write_text(RAW_TRANSACTIONS, encoding="utf-8")
+
+    expected = clean_transactions(read_transactions_raw(path))
+    result = preprocess_polars.clean_transactions(path)
+
+    assert_frame_equal(expected, result)
+    assert not np.isnat(result["timestamp"].to_numpy()).any()
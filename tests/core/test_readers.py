@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+from degiro_wrapper.conventions import CashflowsRaw
+from degiro_wrapper.core.readers import read_cashflows_raw, read_header
+from pandas.testing import assert_frame_equal
+
+from ..helpers import RAW_CASHFLOWS
+
+
+@pytest.fixture
+def path_cashflows(tmp_path):
+    path = tmp_path / "cashflows.csv"
+    path.write_text(RAW_CASHFLOWS, encoding="utf-8")
+    return path
+
+
+def test_read_header(path_cashflows):
+
+    header = read_header(path_cashflows)
+
+    assert header[8] == CashflowsRaw.UNNAMED_DELTA
+    assert header[10] == CashflowsRaw.UNNAMED_AMOUNT
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_read_cashflows_raw(path_cashflows, engine):
+
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+
+    raw = read_cashflows_raw(path_cashflows, engine=engine)
+    expected = pd.read_csv(path_cashflows, dtype=str)
+
+    assert_frame_equal(expected[raw.columns], raw)
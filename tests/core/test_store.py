@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from degiro_wrapper.core.panel import build_panel
+from degiro_wrapper.core.store import PanelStore
+from pandas.testing import assert_frame_equal
+
+LONG = pd.DataFrame(
+    {
+        "date": pd.to_datetime(
+            ["2020-01-03", "2020-01-03", "2020-01-06", "2020-01-06", "2020-01-07"]
+        ),
+        "ISIN": [np.nan, "IE00B4L5Y983", "IE00B4L5Y983", np.nan, "NL0000235190"],
+        "amount": [10.0, 100.0, 110.0, 12.0, 50.0],
+    }
+)
+
+
+def test_store_write_read(tmp_path):
+
+    panel = build_panel(LONG, index="date", columns="ISIN", values=["amount"])
+
+    store = PanelStore(tmp_path)
+    store.write(panel)
+    stored = store.read()
+
+    assert isinstance(stored.values, np.memmap)
+    assert_frame_equal(panel["amount"], stored["amount"])
+
+
+def test_store_append(tmp_path):
+
+    store = PanelStore(tmp_path)
+
+    # Same ISINs, rows are appended
+    first = LONG.iloc[:2]
+    store.append(build_panel(first, index="date", columns="ISIN", values=["amount"]))
+    panel = build_panel(LONG.iloc[:4], index="date", columns="ISIN", values=["amount"])
+    assert store.append(panel) == 1
+    assert_frame_equal(panel["amount"], store.read()["amount"])
+
+    # New ISIN, the store is rewritten
+    panel = build_panel(LONG, index="date", columns="ISIN", values=["amount"])
+    assert store.append(panel) == 1
+    assert_frame_equal(panel["amount"], store.read()["amount"])
+
+    assert store.append(panel) == 0
+
+
+def test_store_append_after_crash(tmp_path):
+
+    store = PanelStore(tmp_path)
+    store.append(
+        build_panel(LONG.iloc[:2], index="date", columns="ISIN", values=["amount"])
+    )
+
+    # An append stopped before its meta, trailing rows are not committed
+    with open(tmp_path / "values.dat", "ab") as file:
+        np.full(4, 99.0).tofile(file)
+    with open(tmp_path / "dates.dat", "ab") as file:
+        np.arange(3, dtype=np.int64).tofile(file)
+
+    panel = build_panel(LONG.iloc[:4], index="date", columns="ISIN", values=["amount"])
+    assert store.append(panel) == 1
+    assert_frame_equal(panel["amount"], store.read()["amount"])
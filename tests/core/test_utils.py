@@ -0,0 +1,37 @@
+import pandas as pd
+from degiro_wrapper.core.utils import combine_date_time, parse_dates
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+
+def test_parse_dates():
+
+    values = pd.DataFrame(
+        {
+            "date": ["02-01-2020", "02-01-2020", None, "wrong"],
+            "dateValue": ["03-01-2020", "02-01-2020", "02-01-2020", None],
+        }
+    )
+
+    dates = parse_dates(values, format="%d-%m-%Y", errors="coerce")
+
+    expected = values.apply(pd.to_datetime, format="%d-%m-%Y", errors="coerce")
+
+    assert_frame_equal(expected, dates)
+    assert_series_equal(
+        expected["date"],
+        parse_dates(values["date"], format="%d-%m-%Y", errors="coerce"),
+    )
+
+
+def test_combine_date_time():
+
+    dates = pd.Series(pd.to_datetime(["2020-01-02", "2020-01-02", "2020-01-03"]))
+    times = pd.Series(["09:05", None, "17:30"])
+
+    timestamps = combine_date_time(dates, times)
+
+    expected = pd.Series(
+        pd.to_datetime(["2020-01-02 09:05", "2020-01-02", "2020-01-03 17:30"])
+    )
+
+    assert_series_equal(expected, timestamps)
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pandas as pd
+from degiro_wrapper.core import validate
+from degiro_wrapper.core.cache import ParsedFileCache
+from degiro_wrapper.core.preprocess import cache_keys_positions
+from degiro_wrapper.core.validate import SPEC_POSITIONS, validate_file, validate_files
+
+HEADER = "Producto,Symbol/ISIN,Cantidad,Precio de,Valor local,Valor en EUR\n"
+ROW = 'AIRBUS GROUP,NL0000235190,3,"100,98",EUR 302.94,"302,94"\n'
+
+
+def test_validate_files(tmp_path):
+
+    files = {
+        "positions_2020-01-02.csv": HEADER + ROW,
+        "positions_2020-01-03.csv": "",
+        "positions_2020-01-06.csv": HEADER + ROW.replace("EUR 302.94", "EUR"),
+        "positions_2020-01-07.csv": HEADER + ROW[:30],
+        "positions_2020-01-08.csv": "Producto,Symbol/ISIN\n",
+        "positions_2020-01-09.csv": HEADER + ROW + ROW.replace("\n", ",1\n"),
+        "positions_wrong.csv": HEADER + ROW,
+    }
+    for name, content in files.items():
+        (tmp_path / name).write_text(content, encoding="utf-8")
+
+    paths = sorted(tmp_path.iterdir())
+    report = validate_files(paths, SPEC_POSITIONS, max_workers=1)
+
+    bad = {
+        "positions_2020-01-06.csv",
+        "positions_2020-01-07.csv",
+        "positions_2020-01-08.csv",
+        "positions_2020-01-09.csv",
+        "positions_wrong.csv",
+    }
+    assert set(report["file"].map(lambda x: Path(x).name)) == bad
+    assert len(report) == len(bad)
+
+    # Same report in parallel
+    assert report.equals(validate_files(paths, SPEC_POSITIONS, max_workers=2))
+
+
+def test_validate_file_chunks(tmp_path, monkeypatch):
+
+    rows = [ROW, ROW.replace("EUR 302.94", "EUR"), ROW, ROW.replace('"302,94"', "EUR")]
+    file = tmp_path / "positions_2020-01-02.csv"
+    file.write_text(HEADER + "".join(rows), encoding="utf-8")
+
+    errors = validate_file(file, **SPEC_POSITIONS)
+
+    # Counts add up over the chunks
+    monkeypatch.setattr(validate, "CHUNKSIZE", 1)
+    assert validate_file(file, **SPEC_POSITIONS) == errors
+    assert len(errors) == 2
+    assert all("1 non-numeric values" in error for error in errors)
+
+
+def test_validate_files_skip(tmp_path):
+
+    file = tmp_path / "positions_2020-01-02.csv"
+    file.write_text(HEADER + ROW.replace("EUR 302.94", "EUR"), encoding="utf-8")
+
+    cache = ParsedFileCache(tmp_path / "cache", version="1")
+    keys = cache_keys_positions(tmp_path, cache)
+    assert len(validate_files([file], SPEC_POSITIONS, max_workers=1))
+
+    # Cleaned files are not checked again
+    cache.set(keys[file], pd.DataFrame())
+    cached = [file for file, key in keys.items() if key in cache]
+    report = validate_files([file], SPEC_POSITIONS, max_workers=1, skip=cached)
+    assert report.empty
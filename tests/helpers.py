@@ -0,0 +1,94 @@
+"""Data shared by the tests."""
+
+import numpy as np
+import pandas as pd
+from degiro_wrapper.conventions import Positions, Transactions
+
+# -----------------------------------------------------------------------------
+# Raw reports
+
+TEMPLATE = {
+    "Producto": {
+        0: "CASH & CASH FUND & FTX CASH (EUR)",
+        1: "AIRBUS GROUP",
+        2: "ISHARES MSCI EUR A",
+        3: "ISHARES MSCI WOR A",
+        4: "SP 500 EH",
+        5: "XTRACKERS II EUROZONE GOVERNMEN...",
+    },
+    "Symbol/ISIN": {
+        0: np.nan,
+        1: "NL0000235190",
+        2: "IE00B4K48X80",
+        3: "IE00B4L5Y983",
+        4: "IE00B3ZW0K18",
+        5: "LU0290355717",
+    },
+    "Cantidad": {0: np.nan, 1: 3.0, 2: 14.0, 3: 7.0, 4: 9.0, 5: 1.0},
+    "Precio de": {
+        0: np.nan,
+        1: "100,98",
+        2: "63,34",
+        3: "74,48",
+        4: "91,50",
+        5: "229,44",
+    },
+    "Valor local": {
+        0: "EUR 0.17",
+        1: "EUR 302.94",
+        2: "EUR 886.69",
+        3: "EUR 521.33",
+        4: "EUR 823.49",
+        5: "EUR 229.44",
+    },
+    "Valor en EUR": {
+        0: "0,17",
+        1: "302,94",
+        2: "886,69",
+        3: "521,32",
+        4: "823,49",
+        5: "229,44",
+    },
+}
+
+RAW_CASHFLOWS = (
+    "Fecha,Hora,Fecha valor,Producto,ISIN,Descripción,Tipo,Variación,,Saldo,,ID Orden\n"
+    "02-01-2020,09:05,02-01-2020,AIRBUS GROUP,NL0000235190,"
+    '"Compra 3 AIRBUS GROUP@100,98 EUR (NL0000235190)",,EUR,"-302,94",EUR,"0,17",\n'
+    '03-01-2020,00:00,03-01-2020,,,Ingreso,,EUR,"500,00",EUR,"500,17",\n'
+)
+
+
+# -----------------------------------------------------------------------------
+# Clean positions and transactions
+
+DATES = pd.bdate_range("2020-01-01", periods=30, name=Positions.DATE)
+ISINS = ["IE00B4L5Y983", "NL0000235190"]
+
+
+def make_data(seed=0):
+    rng = np.random.default_rng(seed)
+
+    positions = pd.DataFrame(
+        {
+            Positions.DATE: np.repeat(DATES, len(ISINS)),
+            Positions.ISIN: np.tile(ISINS, len(DATES)),
+            Positions.VALUE_PORTFOLIO: rng.uniform(900, 1100, len(DATES) * 2),
+        }
+    )
+    transactions = pd.DataFrame(
+        {
+            Transactions.DATE: DATES[[3, 10, 10, 25]],
+            Transactions.ISIN: ISINS + ISINS,
+            Transactions.VALUE_PORTFOLIO: [-100.0, 50.0, -20.0, -300.0],
+        }
+    )
+
+    return positions, transactions
+
+
+PORTFOLIOS = {
+    "all": ISINS,
+    "world": ISINS[:1],
+    "airbus": ISINS[1:],
+}
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.conventions import Positions
+from degiro_wrapper.reporting.attribution import (
+    compute_amount,
+    compute_cfs_isin,
+    compute_contributions,
+    link_contributions,
+)
+from degiro_wrapper.reporting.calculations import (
+    compute_cfs,
+    compute_return_daily,
+    compute_return_total,
+    compute_tna,
+)
+from degiro_wrapper.reporting.twr import TWRIndex
+
+from ..helpers import DATES, ISINS, make_data
+
+
+def make_contributions():
+    positions, transactions = make_data()
+    # The second ISIN is only held from the fifth date on
+    late = (positions[Positions.ISIN] == ISINS[1]) & (
+        positions[Positions.DATE] < DATES[5]
+    )
+    positions = positions.loc[~late]
+
+    contributions = compute_contributions(
+        compute_amount(positions), compute_cfs_isin(transactions)
+    )
+    return_daily = compute_return_daily(
+        compute_tna(positions), compute_cfs(transactions)
+    )
+
+    return contributions, return_daily
+
+
+def test_compute_contributions():
+
+    contributions, return_daily = make_contributions()
+
+    assert list(contributions.columns) == ISINS
+    assert (contributions.iloc[0] == 0).all()
+    np.testing.assert_allclose(contributions.sum(axis=1), return_daily, atol=1e-15)
+
+
+def test_link_contributions():
+
+    contributions, return_daily = make_contributions()
+
+    linked = link_contributions(contributions)
+    assert list(linked.index) == ISINS
+    assert linked.sum() == pytest.approx(compute_return_total(return_daily).iloc[-1])
+
+    # Linked by month, they add up to the monthly returns
+    monthly = link_contributions(contributions, freq="monthly")
+    expected = TWRIndex(return_daily).period_returns("M")
+    assert list(monthly.index) == list(expected.index)
+    np.testing.assert_allclose(monthly.sum(axis=1), expected)
+
+    # Any period from a slice
+    window = contributions.loc[DATES[10] : DATES[20]]
+    expected = return_daily.loc[DATES[10] : DATES[20]].add(1).prod() - 1
+    assert link_contributions(window).sum() == pytest.approx(expected)
+
+
+def test_carino_zero_return():
+
+    dates = pd.bdate_range("2021-01-01", periods=3)
+    contributions = pd.DataFrame(
+        {"A": [0.0, 0.01, -0.01], "B": [0.0, -0.01, 0.01]}, index=dates
+    )
+
+    linked = link_contributions(contributions)
+    np.testing.assert_allclose(linked, [0.0, 0.0], atol=1e-15)
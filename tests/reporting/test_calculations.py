@@ -0,0 +1,48 @@
+from degiro_wrapper.conventions import Positions, Transactions
+from degiro_wrapper.reporting.calculations import (
+    compute_cfs,
+    compute_cfs_batch,
+    compute_return_daily,
+    compute_return_total,
+    compute_returns_batch,
+    compute_tna,
+    compute_tna_batch,
+)
+from degiro_wrapper.reporting.utils import (
+    build_membership,
+    filter_positions,
+)
+from pandas.testing import assert_series_equal
+
+from ..helpers import DATES, ISINS, PORTFOLIOS, make_data
+
+
+def test_returns_batch():
+
+    positions, transactions = make_data()
+    # The second ISIN is only held from the fifth date on
+    late = (positions[Positions.ISIN] == ISINS[1]) & (
+        positions[Positions.DATE] < DATES[5]
+    )
+    positions = positions.loc[~late]
+
+    membership = build_membership(PORTFOLIOS)
+    assert membership.to_numpy().sum() == 4
+
+    tna = compute_tna_batch(positions, membership)
+    cfs = compute_cfs_batch(transactions, membership)
+    return_daily, return_total = compute_returns_batch(tna, cfs)
+
+    for name, isins in PORTFOLIOS.items():
+        _positions = filter_positions(positions, isins)
+        _tna = compute_tna(_positions)
+        _cfs = compute_cfs(
+            transactions.loc[transactions[Transactions.ISIN].isin(isins)]
+        )
+        _return_daily = compute_return_daily(_tna, _cfs)
+        _return_total = compute_return_total(_return_daily)
+
+        kwargs = dict(check_names=False, check_freq=False)
+        assert_series_equal(tna[name].dropna(), _tna, **kwargs)
+        assert_series_equal(return_daily[name].dropna(), _return_daily, **kwargs)
+        assert_series_equal(return_total[name].dropna(), _return_total, **kwargs)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.conventions import Calculations, Costs, Transactions
+from degiro_wrapper.reporting.calculations import compute_return_daily
+from degiro_wrapper.reporting.costs import (
+    compute_cost_drag,
+    compute_costs,
+    compute_costs_daily,
+    summarize_costs,
+)
+
+DATES = pd.to_datetime(["2021-01-04", "2021-01-05", "2021-02-01"])
+
+
+def make_transactions():
+    return pd.DataFrame(
+        {
+            Transactions.DATE: DATES[[0, 0, 1, 2]],
+            Transactions.ISIN: ["A", "B", "A", "A"],
+            Transactions.EXCHANGE: ["EAM", "XET", "EAM", "EAM"],
+            Transactions.EXECUTION: ["XAMS", "XETA", "XAMS", None],
+            Transactions.VALUE_PORTFOLIO: [-1000.0, -500.0, 400.0, -2000.0],
+            Transactions.TRANSACTION_COSTS: [-2.0, -1.0, -2.0, np.nan],
+        }
+    )
+
+
+def test_compute_costs():
+
+    costs = compute_costs(make_transactions())
+
+    assert costs.index.names == [
+        Transactions.ISIN,
+        Transactions.EXCHANGE,
+        Transactions.EXECUTION,
+        Costs.PERIOD,
+    ]
+    assert len(costs) == 3
+
+    row = costs.loc[("A", "EAM", "XAMS", pd.Period("2021-01", "M"))]
+    assert row[Costs.TRADES] == 2
+    assert row[Costs.TRADED] == pytest.approx(1400.0)
+    assert row[Costs.COSTS] == pytest.approx(4.0)
+    assert row[Costs.COSTS_BPS] == pytest.approx(4.0 / 1400.0 * 1e4)
+
+    # Missing venues and costs are kept
+    assert costs[Costs.TRADES].sum() == 4
+    assert costs[Costs.COSTS].sum() == pytest.approx(5.0)
+
+
+def test_summarize_costs():
+
+    costs = compute_costs(make_transactions())
+
+    by_isin = summarize_costs(costs, by=Transactions.ISIN)
+    assert by_isin[Costs.COSTS].to_dict() == pytest.approx({"A": 4.0, "B": 1.0})
+    assert by_isin.loc["A", Costs.COSTS_BPS] == pytest.approx(4.0 / 3400.0 * 1e4)
+
+    by_period = summarize_costs(costs, by=Costs.PERIOD)
+    assert by_period[Costs.TRADES].tolist() == [3, 1]
+
+    # Same as grouping the transactions directly
+    by_exchange = summarize_costs(costs, by=Transactions.EXCHANGE)
+    expected = compute_costs(make_transactions(), freq="yearly")
+    expected = summarize_costs(expected, by=Transactions.EXCHANGE)
+    pd.testing.assert_frame_equal(by_exchange, expected)
+
+
+def test_compute_cost_drag():
+
+    transactions = make_transactions()
+    tna = pd.Series([1500.0, 1200.0, 3300.0], index=DATES)
+    cfs = transactions.groupby(Transactions.DATE)[Transactions.VALUE_PORTFOLIO]
+    cfs = cfs.sum().mul(-1)
+
+    drag = compute_cost_drag(tna, cfs, compute_costs_daily(transactions))
+
+    # Gross return is the one of compute_return_daily
+    np.testing.assert_allclose(
+        drag[Calculations.RETURN_DAILY], compute_return_daily(tna, cfs)
+    )
+    assert drag.iloc[0].tolist() == [0.0, 0.0, 0.0]
+
+    # Selling receives 400 minus 2 of costs
+    assert drag.loc[DATES[1], Costs.RETURN_NET] == pytest.approx(1200 / 1102 - 1)
+    np.testing.assert_allclose(
+        drag[Costs.COST_DRAG],
+        drag[Calculations.RETURN_DAILY] - drag[Costs.RETURN_NET],
+    )
+    assert drag.loc[DATES[2], Costs.COST_DRAG] == pytest.approx(0.0)
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.conventions import Drift, Positions
+from degiro_wrapper.reporting.drift import build_targets, compute_drift
+
+DATES = pd.bdate_range("2021-01-04", periods=3, name=Positions.DATE)
+
+
+def make_data():
+    targets = build_targets(
+        {
+            "a": pd.Series({"A": 50.0, "B": 30.0, "C": 20.0}),
+            "b": pd.Series({"B": 1.0, "D": np.nan}),
+        }
+    )
+    amounts = pd.DataFrame(
+        {
+            "A": [50.0, 62.0, np.nan],
+            "B": [30.0, 24.0, 10.0],
+            "C": [20.0, 14.0, 5.0],
+        },
+        index=DATES,
+    )
+    return amounts, targets
+
+
+def test_build_targets():
+
+    _, targets = make_data()
+
+    assert targets["a"].tolist() == pytest.approx([0.5, 0.3, 0.2, np.nan], nan_ok=True)
+    assert targets["b"].tolist() == pytest.approx(
+        [np.nan, 1.0, np.nan, 0.0], nan_ok=True
+    )
+
+    with pytest.raises(ValueError, match="negative"):
+        build_targets({"a": pd.Series({"A": -1.0, "B": 2.0})})
+    with pytest.raises(ValueError, match="without target"):
+        build_targets({"a": pd.Series({"A": np.nan})})
+
+
+def test_compute_drift():
+
+    amounts, targets = make_data()
+
+    drift = compute_drift(amounts, targets, threshold=0.05)
+
+    assert drift.index.names == [Positions.DATE, Drift.PORTFOLIO, Positions.ISIN]
+    assert len(drift) == len(DATES) * 5
+
+    # On target, nothing to trade
+    first = drift.loc[DATES[0]]
+    assert (first[Drift.DRIFT].abs() < 1e-12).all()
+    assert not first[Drift.BREACH].any()
+    assert (first[Drift.TRADE] == 0).all()
+
+    # D is not held
+    assert drift.loc[(DATES[0], "b", "D"), Drift.WEIGHT] == 0.0
+
+    # A breaches its band, B and C are within it
+    second = drift.loc[(DATES[1], "a")]
+    assert second[Drift.WEIGHT].tolist() == pytest.approx([0.62, 0.24, 0.14])
+    assert second[Drift.BREACH].tolist() == [True, True, True]
+
+    third = drift.loc[(DATES[2], "a")]
+    assert third[Drift.BREACH].all()
+
+
+def test_compute_drift_trades():
+
+    amounts, targets = make_data()
+    amounts.loc[DATES[1]] = [58.0, 26.0, 16.0]
+
+    drift = compute_drift(amounts, targets, threshold=0.05)
+
+    # Only A breaches: sold to its band, bought towards the targets
+    second = drift.loc[(DATES[1], "a")]
+    assert second[Drift.BREACH].tolist() == [True, False, False]
+    assert second[Drift.TRADE].tolist() == pytest.approx([-3.0, 1.5, 1.5])
+
+    # All out of band, weights within the bands, self financed
+    tna = amounts.sum(axis=1)
+    for date in DATES[1:]:
+        rows = drift.loc[(date, "a")]
+        rebalanced = rows[Drift.WEIGHT] + rows[Drift.TRADE] / tna[date]
+        assert rows[Drift.TRADE].sum() == pytest.approx(0.0, abs=1e-9)
+        assert ((rebalanced - rows[Drift.TARGET]).abs() <= 0.05 + 1e-12).all()
+
+    # Smallest value traded, moving the weights out of band to the edges
+    third = drift.loc[(DATES[2], "a")]
+    assert third[Drift.TRADE].abs().sum() == pytest.approx(2 * 0.45 * 15)
+    assert third[Drift.TRADE].tolist() == pytest.approx([6.75, -5.125, -1.625])
+
+    # Portfolios without breaches do not trade
+    assert (drift.xs("b", level=Drift.PORTFOLIO)[Drift.TRADE] == 0).all()
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.conventions import Calculations, Positions, Transactions
+from degiro_wrapper.reporting.calculations import (
+    compute_cfs,
+    compute_return_daily,
+    compute_tna,
+)
+from degiro_wrapper.reporting.fx import (
+    compute_currencies,
+    compute_fx_pnl,
+    compute_fx_rates,
+    compute_fx_returns,
+    compute_fx_returns_currency,
+)
+
+DATES = pd.bdate_range("2021-01-04", periods=3, name=Positions.DATE)
+
+
+def make_data(value_local=-10.0, rate=1 / 0.99):
+    # A USD asset, +10% local and +10% currency, and an EUR asset
+    positions = pd.DataFrame(
+        {
+            Positions.DATE: np.repeat(DATES, 2),
+            Positions.ISIN: ["US", "EU"] * 3,
+            Positions.VALUE_LOCAL: [100.0, 100.0, 110.0, 105.0, 120.0, 105.0],
+            Positions.VALUE_PORTFOLIO: [90.0, 100.0, 108.9, 105.0, 118.8, 105.0],
+        }
+    )
+    # Buying 10 USD at the close rate, no return the last day
+    transactions = pd.DataFrame(
+        {
+            Transactions.DATE: DATES[[0, 2]],
+            Transactions.ISIN: ["EU", "US"],
+            Transactions.PRICE_CCY: ["EUR", "USD"],
+            Transactions.VALUE_LOCAL: [-100.0, value_local],
+            Transactions.VALUE_PORTFOLIO: [-100.0, -9.9],
+            Transactions.RATE: [np.nan, rate],
+        }
+    )
+
+    return positions, transactions
+
+
+@pytest.mark.parametrize(
+    "value_local, rate", [(-10.0, 1 / 0.99), (np.nan, 1 / 0.99), (np.nan, np.nan)]
+)
+def test_compute_fx_pnl(value_local, rate):
+
+    # Without local value nor rate, the rate of the positions is used
+    positions, transactions = make_data(value_local, rate)
+
+    capital, pnl_local, pnl_currency = compute_fx_pnl(positions, transactions)
+
+    assert list(capital.columns) == ["EU", "US"]
+    assert pnl_local.loc[DATES[1]].tolist() == pytest.approx([5.0, 9.0])
+    assert pnl_currency.loc[DATES[1]].tolist() == pytest.approx([0.0, 9.9])
+    assert pnl_local.loc[DATES[2]].tolist() == pytest.approx([0.0, 0.0])
+    assert pnl_currency.loc[DATES[2]].tolist() == pytest.approx([0.0, 0.0])
+    assert (capital.loc[DATES[0]] == 0).all()
+
+
+def test_compute_fx_returns():
+
+    positions, transactions = make_data()
+    capital, pnl_local, pnl_currency = compute_fx_pnl(positions, transactions)
+
+    returns = compute_fx_returns(capital, pnl_local, pnl_currency)
+
+    assert returns.loc[DATES[1], Calculations.RETURN_LOCAL] == pytest.approx(14 / 190)
+    assert returns.loc[DATES[1], Calculations.RETURN_CURRENCY] == pytest.approx(
+        9.9 / 190
+    )
+
+    # The total is the portfolio return
+    expected = compute_return_daily(compute_tna(positions), compute_cfs(transactions))
+    np.testing.assert_allclose(returns[Calculations.RETURN_DAILY], expected, atol=1e-15)
+
+    # By currency
+    currencies = compute_currencies(transactions)
+    assert currencies.to_dict() == {"EU": "EUR", "US": "USD"}
+
+    returns = compute_fx_returns_currency(capital, pnl_local, pnl_currency, currencies)
+    assert list(returns.columns.get_level_values(0).unique()) == ["EUR", "USD"]
+    assert returns.loc[DATES[1], ("USD", Calculations.RETURN_LOCAL)] == pytest.approx(
+        0.1
+    )
+    assert returns.loc[
+        DATES[1], ("USD", Calculations.RETURN_CURRENCY)
+    ] == pytest.approx(0.11)
+    assert returns.loc[
+        DATES[1], ("EUR", Calculations.RETURN_CURRENCY)
+    ] == pytest.approx(0.0, abs=1e-15)
+
+
+def test_compute_fx_rates():
+
+    positions, _ = make_data()
+
+    rates = compute_fx_rates(positions)
+
+    assert rates["US"].tolist() == pytest.approx([0.9, 0.99, 0.99])
+    assert rates["EU"].tolist() == pytest.approx([1.0, 1.0, 1.0])
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+from click.testing import CliRunner
+from degiro_wrapper.cli import cli
+from degiro_wrapper.conventions import Calculations, Positions, Transactions
+from degiro_wrapper.reporting.calculations import (
+    compute_cfs,
+    compute_return_daily,
+    compute_return_total,
+    compute_tna,
+)
+from degiro_wrapper.reporting.incremental import IncrementalReturns
+from pandas.testing import assert_series_equal
+
+from ..helpers import DATES, ISINS, make_data
+
+
+def test_incremental_returns(tmp_path):
+
+    positions, transactions = make_data()
+
+    tna = compute_tna(positions)
+    return_daily = compute_return_daily(tna, compute_cfs(transactions))
+    return_total = compute_return_total(return_daily)
+
+    state = IncrementalReturns(tmp_path, isins=ISINS)
+    for end in [DATES[4], DATES[10], DATES[-1], DATES[-1]]:
+        state.update(
+            positions.loc[positions[Positions.DATE] <= end],
+            transactions.loc[transactions[Transactions.DATE] <= end],
+        )
+
+    series = state.read()
+
+    assert_series_equal(
+        series[Calculations.RETURN_DAILY], return_daily, check_freq=False
+    )
+    assert_series_equal(
+        series[Calculations.RETURN_TOTAL], return_total, check_freq=False
+    )
+
+
+def test_incremental_returns_period(tmp_path):
+
+    positions, transactions = make_data()
+
+    state = IncrementalReturns(tmp_path, isins=ISINS)
+    assert state.read().empty
+
+    # Nothing to persist yet
+    state.update(positions.iloc[:0], transactions.iloc[:0])
+    assert state.read().empty
+
+    state.update(positions, transactions)
+
+    # Same as computing the period without state
+    start, end = DATES[5], DATES[20]
+    mask = positions[Positions.DATE].between(start, end)
+    tna = compute_tna(positions.loc[mask])
+    return_daily = compute_return_daily(tna, compute_cfs(transactions))
+    return_total = compute_return_total(return_daily)
+
+    series = state.read(start=start, end=end)
+
+    assert series.index[[0, -1]].tolist() == [start, end]
+    assert_series_equal(
+        series[Calculations.RETURN_DAILY], return_daily, check_freq=False
+    )
+    assert_series_equal(
+        series[Calculations.RETURN_TOTAL], return_total, check_freq=False
+    )
+    assert state.read(end=end).index[-1] == end
+
+
+def test_report_state_gap(tmp_path):
+
+    positions, transactions = make_data()
+    for column in [
+        Transactions.EXCHANGE,
+        Transactions.EXECUTION,
+        Transactions.ID,
+        Transactions.RATE,
+        Transactions.VALUE_CCY,
+        Transactions.PRICE_CCY,
+        Transactions.TOTAL,
+        Transactions.TOTAL_CCY,
+        Transactions.TRANSACTION_COSTS_CCY,
+        Transactions.VALUE_LOCAL_CCY,
+    ]:
+        transactions[column] = np.nan
+
+    positions.to_csv(tmp_path / "db_positions.csv")
+    transactions.to_csv(tmp_path / "db_transactions.csv", index=False)
+    pd.DataFrame({Positions.ISIN: ISINS}).to_csv(tmp_path / "pf.csv", index=False)
+
+    args = [
+        "report",
+        "--ps",
+        str(tmp_path / "db_positions.csv"),
+        "--tr",
+        str(tmp_path / "db_transactions.csv"),
+        "--pf",
+        str(tmp_path / "pf.csv"),
+        "--pr",
+        str(tmp_path),
+        "--state",
+        str(tmp_path / "state"),
+        "--no-costs",
+    ]
+
+    # First run from the middle, second run after a gap of days
+    runner = CliRunner()
+    for period in [
+        ["--start", str(DATES[5].date()), "--end", str(DATES[9].date())],
+        ["--start", str(DATES[20].date())],
+    ]:
+        result = runner.invoke(cli.cli, args + period)
+        assert result.exit_code == 0, result.output
+
+    # The state covers all the history, not only the reported periods
+    tna = compute_tna(positions)
+    return_daily = compute_return_daily(tna, compute_cfs(transactions))
+    return_total = compute_return_total(return_daily)
+
+    series = IncrementalReturns(tmp_path / "state", isins=ISINS).read()
+
+    assert_series_equal(
+        series[Calculations.RETURN_TOTAL], return_total, check_freq=False
+    )
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.conventions import Lots, Transactions
+from degiro_wrapper.reporting.lots import compute_pnl, match_lots
+
+DATES = pd.bdate_range("2021-01-04", periods=4)
+
+
+def make_transactions():
+    return pd.DataFrame(
+        {
+            Transactions.DATE: DATES[[0, 1, 2, 0, 3]],
+            Transactions.ISIN: ["A", "A", "A", "B", "B"],
+            Transactions.SHARES: [10.0, 10.0, -15.0, -5.0, 8.0],
+            Transactions.VALUE_PORTFOLIO: [-100.0, -200.0, 450.0, 50.0, -64.0],
+            Transactions.TRANSACTION_COSTS: [-2.0, -2.0, -3.0, np.nan, np.nan],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "method, realized, cost_open",
+    [
+        (Lots.FIFO, 244.0, 101.0),
+        (Lots.LIFO, 194.0, 51.0),
+        (Lots.AVERAGE, 219.0, 76.0),
+    ],
+)
+def test_match_lots(method, realized, cost_open):
+
+    trades, matches = match_lots(make_transactions(), method=method)
+
+    trades_a = trades.loc[trades[Lots.ISIN] == "A"]
+    assert trades_a[Lots.VALUE_SHARE].tolist() == pytest.approx([10.2, 20.2, 29.8])
+    assert trades_a[Lots.REALIZED].tolist() == pytest.approx([0.0, 0.0, realized])
+    assert trades_a[Lots.SHARES_OPEN].tolist() == [10.0, 20.0, 5.0]
+    assert trades_a[Lots.COST_OPEN].iloc[-1] == pytest.approx(cost_open)
+
+    # Matches add up to the realized PnL
+    pnl = matches[Lots.PROCEEDS] - matches[Lots.COST]
+    by_isin = pnl.groupby(trades.loc[matches[Lots.TRADE], Lots.ISIN].to_numpy()).sum()
+    assert by_isin["A"] == pytest.approx(realized)
+
+
+def test_match_lots_short():
+
+    trades, matches = match_lots(make_transactions())
+
+    # Selling without shares opens a short lot, closed by the next buy
+    trades_b = trades.loc[trades[Lots.ISIN] == "B"]
+    assert trades_b[Lots.SHARES_OPEN].tolist() == [-5.0, 3.0]
+    assert trades_b[Lots.REALIZED].tolist() == pytest.approx([0.0, 10.0])
+    assert trades_b[Lots.COST_OPEN].tolist() == pytest.approx([-50.0, 24.0])
+
+    match = matches.loc[matches[Lots.TRADE] == trades_b.index[1]].iloc[0]
+    assert match[Lots.TRADE_OPEN] == trades_b.index[0]
+    assert match[Lots.SHARES] == -5.0
+
+    with pytest.raises(ValueError):
+        match_lots(make_transactions(), method="hifo")
+
+
+def test_compute_pnl():
+
+    trades, _ = match_lots(make_transactions())
+    amount = pd.DataFrame(
+        {"A": [110.0, 400.0, 120.0, 125.0], "B": [-45.0, -40.0, -60.0, 30.0]},
+        index=DATES,
+    )
+
+    realized, unrealized = compute_pnl(trades, amount)
+
+    assert realized.loc[DATES[2], "A"] == pytest.approx(244.0)
+    assert realized.loc[DATES[3], "B"] == pytest.approx(10.0)
+    assert realized.to_numpy().sum() == pytest.approx(254.0)
+
+    expected = pd.DataFrame(
+        {
+            "A": [110.0 - 102.0, 400.0 - 304.0, 120.0 - 101.0, 125.0 - 101.0],
+            "B": [-45.0 + 50.0, -40.0 + 50.0, -60.0 + 50.0, 30.0 - 24.0],
+        },
+        index=DATES,
+    )
+    pd.testing.assert_frame_equal(unrealized, expected, check_freq=False)
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.conventions import (
+    Calculations,
+    CashflowType,
+    Cashflows,
+    Positions,
+    Transactions,
+)
+from degiro_wrapper.reporting.calculations import (
+    compute_cfs,
+    compute_cfs_batch,
+    compute_cfs_external,
+    compute_return_daily,
+    compute_tna,
+    compute_tna_batch,
+)
+from degiro_wrapper.reporting.mwr import compute_mwr, compute_mwr_batch, solve_xirr
+from degiro_wrapper.reporting.utils import build_membership, filter_positions
+
+from ..helpers import DATES, ISINS, PORTFOLIOS, make_data
+
+
+def npv(rate, amounts, times):
+    return np.sum(np.asarray(amounts) * (1 + rate) ** -np.asarray(times))
+
+
+def test_solve_xirr():
+
+    amounts = [
+        [-100.0, 110.0, 0.0],
+        [-100.0, 50.0, 60.0],
+        [-100.0, 25.0, 0.0],
+        [-100.0, -50.0, 0.0],
+        [0.0, 0.0, 0.0],
+    ]
+    times = [0.0, 0.5, 1.0]
+
+    xirr = solve_xirr(amounts, times)
+
+    assert xirr[0] == pytest.approx(1.1**2 - 1)
+    assert npv(xirr[1], amounts[1], times) == pytest.approx(0.0, abs=1e-8)
+    # Extreme rates of short windows are solved
+    assert xirr[2] == pytest.approx(0.25**2 - 1)
+    # Without a sign change there is not rate
+    assert np.isnan(xirr[3:]).all()
+
+    # The origin of times does not matter
+    np.testing.assert_allclose(solve_xirr(amounts, np.add(times, 10)), xirr)
+
+
+def test_compute_mwr():
+
+    positions, transactions = make_data()
+    tna = compute_tna(positions)
+    cfs = compute_cfs(transactions)
+
+    starts = [DATES[0], DATES[4], DATES[11], "2019-01-01"]
+    ends = [DATES[-1], DATES[9], DATES[20], "2019-06-01"]
+    mwr = compute_mwr(tna, cfs, starts, ends)
+
+    assert list(mwr.columns) == [
+        "start",
+        "end",
+        Calculations.XIRR,
+        Calculations.RETURN_MONEY_WEIGHTED,
+    ]
+
+    # Without cashflows it is the change of TNA
+    expected = tna[DATES[9]] / tna[DATES[4]] - 1
+    assert mwr.loc[1, Calculations.RETURN_MONEY_WEIGHTED] == pytest.approx(expected)
+
+    # With cashflows the NPV of the flows is zero, cashflows of a day are
+    # invested at the previous close
+    days = (DATES - DATES[0]).days.to_numpy() / 365
+    amounts = -cfs.reindex(DATES, fill_value=0.0).shift(-1, fill_value=0.0)
+    amounts.iloc[-1] = 0.0
+    amounts.iloc[0] -= tna.iloc[0]
+    amounts.iloc[-1] += tna.iloc[-1]
+    xirr = mwr.loc[0, Calculations.XIRR]
+    assert npv(xirr, amounts, days) == pytest.approx(0.0, abs=1e-6)
+
+    # Before the first date
+    assert mwr.loc[3, ["start", "end"]].isna().all()
+    assert mwr.loc[3, [Calculations.XIRR]].isna().all()
+
+
+def test_compute_mwr_batch():
+
+    positions, transactions = make_data()
+    positions = positions.loc[
+        (positions[Positions.ISIN] != ISINS[1])
+        | (positions[Positions.DATE] >= DATES[5])
+    ]
+
+    membership = build_membership(PORTFOLIOS)
+    tna = compute_tna_batch(positions, membership)
+    cfs = compute_cfs_batch(transactions, membership)
+
+    mwr = compute_mwr_batch(tna, cfs)
+
+    for name, isins in PORTFOLIOS.items():
+        _tna = compute_tna(filter_positions(positions, isins))
+        _cfs = compute_cfs(
+            transactions.loc[transactions[Transactions.ISIN].isin(isins)]
+        )
+        expected = compute_mwr(_tna, _cfs, [_tna.index[0]], [_tna.index[-1]])
+
+        assert mwr.loc[name, "start"] == _tna.index[0]
+        np.testing.assert_allclose(
+            mwr.loc[name, [Calculations.XIRR]].to_numpy(dtype=float),
+            expected[Calculations.XIRR].to_numpy(),
+        )
+
+
+def test_compute_cfs_external():
+
+    cashflows = pd.DataFrame(
+        {
+            Cashflows.DATE: DATES[[0, 0, 3, 5]],
+            Cashflows.TYPE: [
+                CashflowType.DEPOSIT,
+                CashflowType.BUY,
+                CashflowType.WITHDRAWAL,
+                CashflowType.DIVIDEND,
+            ],
+            Cashflows.DELTA: [1000.0, -500.0, -200.0, 10.0],
+        }
+    )
+
+    cfs = compute_cfs_external(cashflows)
+
+    assert cfs.name == Calculations.CFS
+    assert cfs.to_dict() == {DATES[0]: 1000.0, DATES[3]: -200.0}
+
+
+def test_account_mwr():
+
+    # Cash only account, a deposit and a withdrawal do not earn anything
+    cashflows = pd.DataFrame(
+        {
+            Cashflows.DATE: DATES[[5, 12]],
+            Cashflows.TYPE: [CashflowType.DEPOSIT, CashflowType.WITHDRAWAL],
+            Cashflows.DELTA: [1000.0, -300.0],
+        }
+    )
+    tna = pd.Series(1000.0, index=DATES, name=Calculations.TNA)
+    tna.loc[DATES[5] :] += 1000.0
+    tna.loc[DATES[12] :] -= 300.0
+
+    cfs = compute_cfs_external(cashflows)
+
+    assert (compute_return_daily(tna, cfs) == 0).all()
+
+    mwr = compute_mwr(tna, cfs, [DATES[0], DATES[8]], [DATES[-1], DATES[-1]])
+    np.testing.assert_allclose(mwr[Calculations.XIRR], 0.0, atol=1e-9)
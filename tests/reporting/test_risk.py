@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.conventions import Risk
+from degiro_wrapper.reporting.risk import RollingRisk, compute_rolling_risk
+
+WINDOW = 20
+
+
+@pytest.fixture
+def return_daily():
+    dates = pd.bdate_range("2020-01-01", periods=300, name="date")
+    rng = np.random.default_rng(0)
+    return pd.Series(rng.normal(0.0003, 0.01, len(dates)), index=dates)
+
+
+def max_drawdown(levels):
+    return np.min(levels / np.maximum.accumulate(levels) - 1)
+
+
+def test_compute_rolling_risk(return_daily):
+
+    rate = 0.02
+    risk = compute_rolling_risk(return_daily, window=WINDOW, rate=rate)
+
+    assert list(risk.index) == list(return_daily.index)
+    assert risk[Risk.VOLATILITY].iloc[: WINDOW - 1].isna().all()
+
+    # Same as the full recomputation of each window
+    rate_daily = (1 + rate) ** (1 / 252) - 1
+    rolling = return_daily.rolling(WINDOW)
+    volatility = rolling.std() * np.sqrt(252)
+    sharpe = (rolling.mean() - rate_daily) / rolling.std() * np.sqrt(252)
+    downside = return_daily.sub(rate_daily).clip(upper=0).pow(2).rolling(WINDOW)
+    sortino = (rolling.mean() - rate_daily) / downside.mean().pow(0.5) * np.sqrt(252)
+
+    levels = return_daily.add(1).cumprod()
+    drawdown = levels / levels.cummax().clip(lower=1) - 1
+    drawdown_max = levels.rolling(WINDOW).apply(max_drawdown, raw=True)
+
+    kwargs = dict(check_names=False)
+    pd.testing.assert_series_equal(risk[Risk.VOLATILITY], volatility, **kwargs)
+    pd.testing.assert_series_equal(risk[Risk.SHARPE], sharpe, **kwargs)
+    pd.testing.assert_series_equal(risk[Risk.SORTINO], sortino, **kwargs)
+    pd.testing.assert_series_equal(risk[Risk.DRAWDOWN], drawdown, **kwargs)
+    pd.testing.assert_series_equal(risk[Risk.MAX_DRAWDOWN], drawdown_max, **kwargs)
+
+    # Days since the last peak
+    peak = levels.cummax().clip(lower=1)
+    at_peak = levels >= peak
+    duration = at_peak.groupby(at_peak.cumsum()).cumcount()
+    np.testing.assert_array_equal(risk[Risk.DRAWDOWN_DURATION], duration)
+
+
+def test_rolling_risk_incremental(return_daily):
+
+    expected = compute_rolling_risk(return_daily, window=WINDOW)
+
+    risk = RollingRisk(window=WINDOW)
+    first = risk.update(return_daily.iloc[:100])
+    assert len(risk) == WINDOW
+
+    # Continue from the saved state
+    risk = RollingRisk.from_dict(json.loads(json.dumps(risk.to_dict())))
+    second = risk.update(return_daily.iloc[100:])
+
+    pd.testing.assert_frame_equal(pd.concat([first, second]), expected)
+
+
+def test_rolling_risk_missing_and_total_loss(return_daily):
+
+    # A missing return counts as 0, also after saving the state
+    missing = return_daily.copy()
+    missing.iloc[110] = np.nan
+
+    risk = RollingRisk(window=WINDOW)
+    first = risk.update(missing.iloc[:115])
+    risk = RollingRisk.from_dict(json.loads(json.dumps(risk.to_dict())))
+    second = risk.update(missing.iloc[115:])
+
+    expected = compute_rolling_risk(missing.fillna(0.0), window=WINDOW)
+    pd.testing.assert_frame_equal(pd.concat([first, second]), expected)
+    assert np.isfinite(second.to_numpy()).all()
+
+    # A total loss, later days start again after it leaves the window
+    wiped = return_daily.copy()
+    wiped.iloc[150] = -1.0
+
+    risk = compute_rolling_risk(wiped, window=WINDOW)
+    after = compute_rolling_risk(return_daily.iloc[151:], window=WINDOW)
+
+    assert risk[Risk.DRAWDOWN].iloc[150] == -1.0
+    assert (risk[Risk.MAX_DRAWDOWN].iloc[150 : 149 + WINDOW] == -1.0).all()
+    assert np.isfinite(risk.iloc[WINDOW:].to_numpy()).all()
+    pd.testing.assert_frame_equal(risk.iloc[150 + WINDOW :], after.iloc[WINDOW - 1 :])
+
+
+def test_rolling_risk_window():
+
+    with pytest.raises(ValueError):
+        RollingRisk(window=1)
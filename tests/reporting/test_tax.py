@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.conventions import Taxes, Transactions
+from degiro_wrapper.reporting.tax import compute_capital_gains, compute_tax_years
+
+
+def make_transactions(rows):
+    """Transactions from (date, ISIN, shares, price, costs) rows."""
+    dates, isins, shares, prices, costs = zip(*rows)
+    shares = np.array(shares, dtype=float)
+
+    return pd.DataFrame(
+        {
+            Transactions.DATE: pd.to_datetime(dates),
+            Transactions.ISIN: isins,
+            Transactions.SHARES: shares,
+            Transactions.VALUE_PORTFOLIO: -shares * np.array(prices),
+            Transactions.TRANSACTION_COSTS: costs,
+        }
+    )
+
+
+def test_loss_deferred_to_next_year():
+
+    transactions = make_transactions(
+        [
+            ("2021-01-04", "A", 10, 100.0, -2.0),
+            ("2021-03-01", "A", -10, 80.0, -2.0),
+            ("2021-03-15", "A", 10, 85.0, 0.0),
+            ("2022-01-10", "A", -10, 90.0, 0.0),
+        ]
+    )
+
+    sales = compute_capital_gains(transactions)
+
+    # Costs add to the acquisition value and reduce the transmission value
+    assert sales[Taxes.GAIN].tolist() == pytest.approx([-204.0, 50.0])
+    assert sales[Taxes.DEFERRED].tolist() == pytest.approx([-204.0, 0.0])
+    assert sales[Taxes.RELEASED].tolist() == pytest.approx([0.0, -204.0])
+    assert sales[Taxes.COMPUTABLE].tolist() == pytest.approx([0.0, -154.0])
+
+    years = compute_tax_years(sales)
+    assert list(years.index) == [2021, 2022]
+    assert years.loc[2021, Taxes.LOSSES] == pytest.approx(-204.0)
+    assert years.loc[2021, Taxes.COMPUTABLE] == pytest.approx(0.0)
+    assert years.loc[2022, Taxes.GAINS] == pytest.approx(50.0)
+    assert years.loc[2022, Taxes.COMPUTABLE] == pytest.approx(-154.0)
+
+
+def test_loss_partially_deferred():
+
+    transactions = make_transactions(
+        [
+            ("2021-01-04", "A", 10, 100.0, 0.0),
+            ("2021-02-01", "A", 5, 90.0, 0.0),
+            # FIFO sells the first purchase, the second one is still held
+            ("2021-03-01", "A", -10, 80.0, 0.0),
+            # Out of the window, it does not defer
+            ("2021-06-01", "A", 10, 70.0, 0.0),
+            ("2021-06-02", "B", 10, 10.0, 0.0),
+            ("2021-06-03", "B", -10, 9.0, 0.0),
+        ]
+    )
+
+    sales = compute_capital_gains(transactions)
+    sale = sales.loc[sales[Transactions.ISIN] == "A"].iloc[0]
+
+    assert sale[Taxes.GAIN] == pytest.approx(-200.0)
+    assert sale[Taxes.DEFERRED] == pytest.approx(-100.0)
+    assert sale[Taxes.COMPUTABLE] == pytest.approx(-100.0)
+
+    # The purchase of the loss itself is not a replacement
+    sale = sales.loc[sales[Transactions.ISIN] == "B"].iloc[0]
+    assert sale[Taxes.DEFERRED] == 0.0
+
+
+def test_sale_of_all_lots():
+
+    transactions = make_transactions(
+        [
+            ("2021-01-04", "A", 10, 100.0, 0.0),
+            ("2021-02-01", "A", 10, 100.0, 0.0),
+            ("2021-03-01", "A", -20, 80.0, 0.0),
+        ]
+    )
+
+    sales = compute_capital_gains(transactions)
+
+    # Nothing is held after the sale, the losses are computable
+    assert len(sales) == 2
+    assert sales[Taxes.DEFERRED].tolist() == [0.0, 0.0]
+    assert sales[Taxes.COMPUTABLE].sum() == pytest.approx(-400.0)
+
+
+def test_only_purchases():
+
+    transactions = make_transactions(
+        [
+            ("2021-01-04", "A", 10, 100.0, -2.0),
+            ("2021-02-01", "A", 5, 90.0, -2.0),
+        ]
+    )
+
+    sales = compute_capital_gains(transactions)
+    assert sales.empty
+    assert (sales.dtypes.loc[[Taxes.GAIN, Taxes.COMPUTABLE]] == float).all()
+
+    years = compute_tax_years(sales)
+    assert years.empty
+    assert list(years.columns) == [
+        Taxes.GAINS,
+        Taxes.LOSSES,
+        Taxes.DEFERRED,
+        Taxes.RELEASED,
+        Taxes.COMPUTABLE,
+    ]
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.reporting.calculations import compute_return_total
+from degiro_wrapper.reporting.twr import TWRIndex
+from degiro_wrapper.reporting.windows import compute_window_returns
+
+
+@pytest.fixture
+def return_daily():
+    dates = pd.bdate_range("2019-06-03", "2021-05-14", name="date")
+    rng = np.random.default_rng(1)
+    return_daily = pd.Series(rng.normal(0.0, 0.01, len(dates)), index=dates)
+    return_daily.iloc[0] = 0.0
+    return return_daily
+
+
+def compound(return_daily, start, end):
+    """Reference return, the start date return is not included."""
+    window = return_daily.loc[start:end].iloc[1:]
+    return window.add(1).prod() - 1
+
+
+def test_query(return_daily):
+
+    index = TWRIndex(return_daily)
+
+    assert len(index) == len(return_daily)
+    assert np.isclose(
+        index.query("2020-03-02", "2020-09-30"),
+        compound(return_daily, "2020-03-02", "2020-09-30"),
+    )
+
+    # Weekend dates are taken as-of the previous Friday
+    assert index.query("2020-03-01", "2020-09-30") == pytest.approx(
+        compound(return_daily, "2020-02-28", "2020-09-30")
+    )
+
+    # Start before the first date, end before the first date
+    assert index.query("2000-01-01", "2021-05-14") == pytest.approx(
+        compute_return_total(return_daily).iloc[-1]
+    )
+    assert np.isnan(index.query("2000-01-01", "2019-01-01"))
+
+
+def test_query_many(return_daily):
+
+    index = TWRIndex(return_daily)
+    starts = ["2019-12-31", "2020-06-30", "2021-04-30"]
+    ends = ["2020-12-31", "2021-05-14", "2021-05-14"]
+
+    twr = index.query_many(starts, ends)
+    expected = [compound(return_daily, s, e) for s, e in zip(starts, ends)]
+
+    np.testing.assert_allclose(twr, expected)
+    assert twr[1] == pytest.approx(index.query(starts[1], ends[1]))
+
+    # Same result as the window returns
+    summary = compute_window_returns(return_daily)
+    twr = index.query_many(summary["start"], summary["end"])
+    np.testing.assert_allclose(twr, summary["returnTotal"])
+
+
+def test_period_returns(return_daily):
+
+    index = TWRIndex(return_daily)
+
+    monthly = index.period_returns("monthly")
+    yearly = index.period_returns("Y")
+
+    assert len(monthly) == 24
+    assert monthly.index[0] == pd.Period("2019-06", "M")
+    assert monthly.loc["2020-03"] == pytest.approx(
+        compound(return_daily, "2020-02-28", "2020-03-31")
+    )
+
+    # Months compound to years
+    by_year = monthly.add(1).groupby(monthly.index.year).prod().sub(1)
+    np.testing.assert_allclose(by_year.to_numpy(), yearly.to_numpy())
+
+    table = index.monthly_table()
+    assert list(table.columns) == list(range(1, 13)) + ["year"]
+    assert list(table.index) == [2019, 2020, 2021]
+    assert np.isnan(table.loc[2019, 1])
+    assert table.loc[2020, 3] == pytest.approx(monthly.loc["2020-03"])
+    np.testing.assert_allclose(table["year"], yearly)
+
+
+def test_empty():
+
+    index = TWRIndex(pd.Series([], index=pd.DatetimeIndex([]), dtype=float))
+
+    assert index.period_returns("Q").empty
+    assert np.isnan(index.query("2020-01-01", "2020-12-31"))
+
+
+def test_missing_and_total_loss():
+
+    dates = pd.bdate_range("2021-01-04", periods=7, name="date")
+    return_daily = pd.Series([0.0, 0.01, np.nan, 0.02, -1.0, 0.5, 0.01], index=dates)
+
+    index = TWRIndex(return_daily)
+
+    # Missing days count as 0, as in compute_return_total
+    return_total = compute_return_total(return_daily)
+    assert index.query(dates[0], dates[3]) == pytest.approx(return_total.iloc[3])
+    assert index.query(dates[2], dates[3]) == pytest.approx(0.02)
+
+    # Windows over the total loss lose everything, later ones are defined
+    assert index.query(dates[0], dates[5]) == -1.0
+    assert index.query(dates[4], dates[6]) == pytest.approx(1.5 * 1.01 - 1)
+    np.testing.assert_allclose(
+        index.query_many(dates[[1, 4]], dates[[6, 6]]), [-1.0, 1.5 * 1.01 - 1]
+    )
+    assert index.period_returns("M").iloc[0] == -1.0
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from degiro_wrapper.conventions import Calculations
+from degiro_wrapper.reporting.calculations import compute_return_total
+from degiro_wrapper.reporting.windows import (
+    WINDOWS,
+    compute_window_returns,
+    rebase_return_total,
+    window_boundary,
+)
+
+
+@pytest.fixture
+def return_daily():
+    dates = pd.bdate_range("2018-06-01", "2021-05-14", name="date")
+    rng = np.random.default_rng(0)
+    return_daily = pd.Series(rng.normal(0.0, 0.01, len(dates)), index=dates)
+    return_daily.iloc[0] = 0.0
+    return return_daily
+
+
+def test_window_boundary():
+
+    end = pd.Timestamp("2021-05-14")
+
+    assert window_boundary("MTD", end) == pd.Timestamp("2021-05-01")
+    assert window_boundary("QTD", end) == pd.Timestamp("2021-04-01")
+    assert window_boundary("YTD", end) == pd.Timestamp("2021-01-01")
+    assert window_boundary("1Y", end) == pd.Timestamp("2020-05-15")
+    assert window_boundary("ITD", end) is None
+
+    with pytest.raises(ValueError):
+        window_boundary("1M", end)
+
+
+@pytest.mark.parametrize("end", [None, "2019-03-31"])
+def test_compute_window_returns(return_daily, end):
+
+    return_total = compute_return_total(return_daily)
+    summary = compute_window_returns(return_daily, end=end)
+
+    assert list(summary.index) == WINDOWS
+
+    for window, (start, _end, value) in summary.iterrows():
+        # Compound the daily returns after the base date
+        expected = return_daily.loc[start:_end].iloc[1:].add(1).prod() - 1
+        assert value == pytest.approx(expected)
+
+        rebased = rebase_return_total(return_total, start, _end)
+        assert rebased.iloc[-1] == pytest.approx(value)
+
+    assert summary.loc["ITD", Calculations.RETURN_TOTAL] == pytest.approx(
+        return_total.loc[:end].iloc[-1]
+    )
+
+
+def test_compute_window_returns_total_loss(return_daily):
+
+    # A missing return and a total loss before the last year
+    return_daily.loc["2019-02-01"] = np.nan
+    return_daily.loc["2019-03-01"] = -1.0
+
+    summary = compute_window_returns(return_daily)
+    values = summary[Calculations.RETURN_TOTAL]
+
+    assert np.isfinite(values).all()
+    assert values["ITD"] == -1.0
+    assert values["3Y"] == -1.0
+
+    expected = return_daily.loc[summary.loc["1Y", "start"] :].iloc[1:]
+    assert values["1Y"] == pytest.approx(expected.add(1).prod() - 1)
+
+    # No days before the end
+    summary = compute_window_returns(return_daily, end="2000-01-01")
+    assert summary[Calculations.RETURN_TOTAL].isna().all()
+    assert summary["start"].isna().all()